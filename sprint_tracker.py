@@ -1,10 +1,90 @@
+import time
+
+SCRIPT_STARTED_AT = time.perf_counter()
+
 import streamlit as st
-import pandas as pd
 from datetime import datetime, timedelta
-import gspread
-from google.oauth2.service_account import Credentials
 import json
+import logging
 import os
+import tempfile
+
+# Only light modules here: pandas, gspread and google-auth are imported after
+# the sidebar has been drawn (see "Deferred imports" below)
+from tracker.cache import SheetReadCache
+from tracker.connection import BackgroundConnection
+from tracker.metrics import REGISTRY, InstrumentedSpreadsheet, RerunTimer, serve_metrics
+from tracker.versioning import WriteConflict, parse_version, versioned_row
+
+logger = logging.getLogger("sprint_tracker")
+
+# Phase timings of this rerun (startup, connect, loads, appends, render)
+timer = RerunTimer(started_at=SCRIPT_STARTED_AT)
+
+# Target for server-side time from script start to the sidebar being drawn
+FIRST_PAINT_BUDGET_MS = float(os.environ.get("SPRINT_TRACKER_FIRST_PAINT_BUDGET_MS", "300"))
+
+# Read cache settings (seconds a worksheet read stays fresh, max worksheets held)
+READ_CACHE_TTL_SECONDS = float(os.environ.get("SPRINT_TRACKER_CACHE_TTL", "60"))
+READ_CACHE_MAX_ENTRIES = int(os.environ.get("SPRINT_TRACKER_CACHE_MAX_ENTRIES", "16"))
+
+# Port for a Prometheus-style /metrics endpoint (unset = no endpoint)
+METRICS_PORT = os.environ.get("SPRINT_TRACKER_METRICS_PORT")
+
+# Storage backend: "sheets" (Google Sheets), "sqlite" (local SQLite mirrored to
+# Google Sheets when connected) or "memory" (in-memory Sheets stand-in, offline)
+STORAGE_BACKEND = os.environ.get("SPRINT_TRACKER_BACKEND", "sheets")
+SQLITE_PATH = os.environ.get(
+    "SPRINT_TRACKER_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "sprint_tracker.db"),
+)
+
+# Throwaway copy of the last Sheets snapshot served while Sheets is unreachable;
+# never the SQLite backend's database, which would then look already seeded
+OUTAGE_DB_PATH = os.environ.get(
+    "SPRINT_TRACKER_OUTAGE_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sprint_tracker_outage.db"),
+)
+
+# Daily Updates rows of generated data to fill the in-memory backend with
+# (0 = the sample rows); used by the benchmarks and for demos
+SYNTHETIC_UPDATES = int(os.environ.get("SPRINT_TRACKER_SYNTHETIC_UPDATES", "0"))
+
+# Height in pixels of the scrollable Project Overview / Sprint Goals tables
+TABLE_HEIGHT = 400
+
+# Daily updates shown per page of Recent Updates
+UPDATES_PAGE_SIZE = 20
+
+# Seconds between background polls of the backend for the shared snapshot, and
+# between each session's (API-free) check for a newer snapshot
+SNAPSHOT_POLL_SECONDS = float(os.environ.get("SPRINT_TRACKER_SNAPSHOT_INTERVAL", "30"))
+SNAPSHOT_CHECK_SECONDS = 2
+
+# Columnar (Arrow IPC) copies of the latest snapshot, reloaded on restart
+SNAPSHOT_DIR = os.environ.get(
+    "SPRINT_TRACKER_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sprint_tracker_snapshot"),
+)
+
+# Seconds between runs of the archiver that moves closed months of Daily
+# Updates into per-month archives (0 = never archive). Off by default for the
+# in-memory backend, whose generated data would otherwise be archived at once
+ARCHIVE_INTERVAL_SECONDS = float(
+    os.environ.get("SPRINT_TRACKER_ARCHIVE_INTERVAL", "0" if STORAGE_BACKEND == "memory" else "3600")
+)
+
+# Resume checkpoints of bulk imports that have not finished
+IMPORT_CHECKPOINT_DIR = os.environ.get(
+    "SPRINT_TRACKER_IMPORT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sprint_tracker_imports"),
+)
+
+# Local journal of rows queued for Google Sheets but not yet written
+WRITE_JOURNAL_PATH = os.environ.get(
+    "SPRINT_TRACKER_JOURNAL",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sprint_tracker_pending.jsonl"),
+)
 
 # Page config
 st.set_page_config(
@@ -26,204 +106,486 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Google Sheets configuration
-# Replace the init_google_sheets function in your sprint_tracker.py with this:
+def init_google_sheets(credentials_info, notes):
+    """Open (or create) the tracker spreadsheet; runs on a background thread
 
-@st.cache_resource
-# Replace your init_google_sheets function with this version:
-def init_google_sheets():
-    """Initialize Google Sheets connection"""
+    Status messages are collected in ``notes`` as (level, message) pairs and
+    shown in the sidebar once the connection attempt has finished.
+    """
+    # Deferred: gspread and google-auth are a sizeable share of a cold start
+    import gspread
+    from google.oauth2.service_account import Credentials
+    
     try:
-        # Get credentials from Streamlit secrets
-        if "gcp_service_account" in st.secrets:
-            credentials_info = st.secrets["gcp_service_account"]
-            credentials = Credentials.from_service_account_info(
-                credentials_info,
-                scopes=[
-                    "https://www.googleapis.com/auth/spreadsheets",
-                    "https://www.googleapis.com/auth/drive"
-                ]
-            )
-        else:
-            st.error("Google Cloud credentials not found in Streamlit secrets.")
-            return None
+        credentials = Credentials.from_service_account_info(
+            credentials_info,
+            scopes=[
+                "https://www.googleapis.com/auth/spreadsheets",
+                "https://www.googleapis.com/auth/drive"
+            ]
+        )
         
         gc = gspread.authorize(credentials)
         
         # Try to open existing spreadsheet or create new one
         spreadsheet_name = "Sprint Tracker Data"
         try:
-            spreadsheet = gc.open(spreadsheet_name)
-            st.success(f"✅ Connected to existing spreadsheet")
+            spreadsheet = InstrumentedSpreadsheet(gc.open(spreadsheet_name))
+            notes.append(("success", "✅ Connected to existing spreadsheet"))
+            # Add anything missing and apply pending schema migrations
+            if init_sheets_structure(spreadsheet, with_sample_data=False):
+                notes.append(("info", "🛠️ Updated spreadsheet layout to the current schema"))
         except gspread.SpreadsheetNotFound:
             # Create new spreadsheet in service account's drive
-            spreadsheet = gc.create(spreadsheet_name)
-            st.success(f"✅ Created new spreadsheet in service account drive")
+            spreadsheet = InstrumentedSpreadsheet(gc.create(spreadsheet_name))
+            notes.append(("success", "✅ Created new spreadsheet in service account drive"))
             
             # Share with your personal Google account so you can access it
             try:
                 # Replace this with YOUR email address (the one you use for Google Drive)
                 your_email = "andremikhailserra3@gmail.com"  # ← Change this to your email
                 spreadsheet.share(your_email, perm_type='user', role='writer')
-                st.info(f"📧 Shared spreadsheet with {your_email}")
+                notes.append(("info", f"📧 Shared spreadsheet with {your_email}"))
             except Exception as share_error:
-                st.warning(f"Created spreadsheet but couldn't share: {share_error}")
-                st.info("You can manually access it via the service account or share it yourself")
+                notes.append(("warning", f"Created spreadsheet but couldn't share: {share_error}"))
+                notes.append(("info", "You can manually access it via the service account or share it yourself"))
             
             # Initialize sheets with headers and sample data
             init_sheets_structure(spreadsheet)
         
-        # Show the spreadsheet URL for easy access
-        if hasattr(spreadsheet, 'url'):
-            st.sidebar.success("✅ Connected to Google Sheets")
-            if st.sidebar.button("📊 Open Spreadsheet"):
-                st.sidebar.markdown(f"[View in Google Sheets]({spreadsheet.url})")
-        
         return spreadsheet
     
     except Exception as e:
         error_msg = str(e)
         if "storageQuotaExceeded" in error_msg:
-            st.error("❌ Google Drive storage is full!")
-            st.info("💡 Solutions:")
-            st.info("1. Free up space in your Google Drive")
-            st.info("2. Or use a different Google account")
-            st.info("3. Or let the app create the sheet in service account drive (update code)")
+            notes.append(("error", "❌ Google Drive storage is full!"))
+            notes.append(("info", "💡 Solutions:"))
+            notes.append(("info", "1. Free up space in your Google Drive"))
+            notes.append(("info", "2. Or use a different Google account"))
+            notes.append(("info", "3. Or let the app create the sheet in service account drive (update code)"))
         else:
-            st.error(f"Could not connect to Google Sheets: {error_msg}")
+            notes.append(("error", f"Could not connect to Google Sheets: {error_msg}"))
         return None
-def init_sheets_structure(spreadsheet):
-    """Initialize the Google Sheets with proper structure"""
-    # Project Overview sheet
-    try:
-        project_sheet = spreadsheet.worksheet("Project Overview")
-    except gspread.WorksheetNotFound:
-        project_sheet = spreadsheet.add_worksheet(title="Project Overview", rows=100, cols=8)
-    
-    project_headers = ["Project", "Goal", "Start Date", "Target End Date", "Current Status", "Owner(s)", "Notes", "Created At"]
-    project_sheet.update('A1:H1', [project_headers])
-    
-    # Daily Updates sheet
-    try:
-        daily_sheet = spreadsheet.worksheet("Daily Updates")
-    except gspread.WorksheetNotFound:
-        daily_sheet = spreadsheet.add_worksheet(title="Daily Updates", rows=500, cols=8)
-    
-    daily_headers = ["Date", "Project", "Developer", "Yesterday's Progress", "Today's Focus", "Blockers", "Next Milestone", "Created At"]
-    daily_sheet.update('A1:H1', [daily_headers])
-    
-    # Sprint Goals sheet  
+
+@st.cache_resource
+def get_sheets_connection():
+    """Start connecting to Google Sheets in the background, once per process
+
+    The gspread client (and its OAuth token and HTTP session) is shared by
+    every session for the life of the process.
+    """
     try:
-        sprint_sheet = spreadsheet.worksheet("Sprint Goals")
-    except gspread.WorksheetNotFound:
-        sprint_sheet = spreadsheet.add_worksheet(title="Sprint Goals", rows=100, cols=8)
-    
-    sprint_headers = ["Sprint", "Dates", "Project", "Goal", "Success Criteria", "Owner(s)", "Status", "Created At"]
-    sprint_sheet.update('A1:H1', [sprint_headers])
+        # Get credentials from Streamlit secrets
+        credentials_info = dict(st.secrets["gcp_service_account"])
+    except Exception:
+        credentials_info = None
+    if credentials_info is None:
+        def missing_credentials(notes):
+            notes.append(("error", "Google Cloud credentials not found in Streamlit secrets."))
+            return None
+        return BackgroundConnection(missing_credentials)
+    return BackgroundConnection(init_google_sheets, credentials_info)
+
+def init_sheets_structure(spreadsheet, with_sample_data=True):
+    """Bring the spreadsheet up to the declared schema in a single batch update
+
+    Safe to re-run: only missing tabs, headers and pending migrations are applied.
+    """
+    from tracker.bootstrap import bootstrap_schema
     
-    # Results & Retrospective sheet
+    return bootstrap_schema(spreadsheet, sample_rows=sample_data() if with_sample_data else None)
+
+def sample_data():
+    """Sample rows written into newly created tabs"""
+    created_at = datetime.now().isoformat()
+    rows = {
+        "Project Overview": [
+            ["Beehiiv + TinyEmail Automation", "Automate daily campaign stats to Sheets", "Aug 28", "Sept 6", "In Progress", "Andre, Partner", "Roadmap drafted, API research ongoing", created_at],
+            ["Slack AI Assistant", "AI chatbot with doc parsing", "Sept 7", "Sept 15", "On Hold", "Andre", "Waiting for client feedback", created_at]
+        ],
+        "Daily Updates": [
+            ["2025-08-27", "Beehiiv + TinyEmail", "Andre", "Finished roadmap & doc", "Start API auth setup", "Need API keys from client", "API connector working", created_at],
+            ["2025-08-27", "Beehiiv + TinyEmail", "Partner", "Explored TinyEmail docs", "Build Beehiiv client prototype", "None", "End-to-end test for 1 brand", created_at],
+            ["2025-08-28", "Slack AI Assistant", "Andre", "Setup Flask skeleton", "Write Slackbot listener", "None", "Slackbot responds to `/ask`", created_at]
+        ],
+        "Sprint Goals": [
+            ["Sprint 1", "Aug 27–Sept 6", "Beehiiv + TinyEmail", "Automated ingestion & write to Sheets", "Job runs daily at 8am PH time with alerts", "Andre, Partner", "In Progress", created_at],
+            ["Sprint 2", "Sept 7–Sept 15", "Slack AI Assistant", "Slackbot answers questions from uploaded docs", "Answers accurate within ±10%", "Andre", "Planned", created_at]
+        ],
+        "Results & Retrospective": [
+            ["Sprint 1", "Clear roadmap, strong API division", "Client was slow with credentials", "Automation working daily", created_at]
+        ],
+    }
+    return {sheet_name: [versioned_row(sheet_name, row) for row in sheet_rows] for sheet_name, sheet_rows in rows.items()}
+
+@st.cache_resource
+def get_read_cache():
+    """Process-wide worksheet read cache shared by all sessions"""
+    return SheetReadCache(ttl_seconds=READ_CACHE_TTL_SECONDS, max_entries=READ_CACHE_MAX_ENTRIES)
+
+@st.cache_resource
+def get_sheets_store(spreadsheet_id, _spreadsheet):
+    """Google Sheets backend: cached, incrementally synced reads and write-behind appends"""
+    return GoogleSheetsStore(_spreadsheet, WRITE_JOURNAL_PATH, cache=get_read_cache())
+
+@st.cache_resource
+def get_sqlite_store(path):
+    """Local SQLite backend, one per database file; Google Sheets is attached as a mirror once connected"""
+    return SqliteStore(path)
+
+@st.cache_resource
+def get_outage_store(path):
+    """Stand-in while Google Sheets is unreachable: the last persisted Sheets snapshot
+
+    Rows written to it are only journaled; the Sheets store replays that
+    journal as soon as it connects.
+    """
+    loaded = read_latest_snapshot(SNAPSHOT_DIR, prefix="sheets-")
+    return open_outage_store(path, WRITE_JOURNAL_PATH, loaded[0] if loaded else None)
+
+@st.cache_resource
+def get_memory_store():
+    """Sheets backend over an in-memory stand-in with the sample layout, for offline use"""
+    spreadsheet = InstrumentedSpreadsheet(InMemorySpreadsheet())
+    if SYNTHETIC_UPDATES:
+        from tracker.synthetic import populate, workbook_for_updates
+        
+        populate(spreadsheet, workbook_for_updates(SYNTHETIC_UPDATES))
+    else:
+        init_sheets_structure(spreadsheet)
+    journal_path = os.path.join(tempfile.mkdtemp(prefix="sprint-tracker-"), "pending.jsonl")
+    store = GoogleSheetsStore(spreadsheet, journal_path, cache=get_read_cache())
+    store.label = "in-memory Google Sheets stand-in"
+    return store
+
+@st.cache_resource
+def start_metrics_endpoint(port):
+    """Serve the process-wide metrics on http://<host>:<port>/metrics, once per process"""
     try:
-        retro_sheet = spreadsheet.worksheet("Results & Retrospective")
-    except gspread.WorksheetNotFound:
-        retro_sheet = spreadsheet.add_worksheet(title="Results & Retrospective", rows=100, cols=5)
-    
-    retro_headers = ["Sprint", "What Went Well", "What Could Be Better", "Key Results", "Created At"]
-    retro_sheet.update('A1:E1', [retro_headers])
-    
-    # Add sample data
-    add_sample_data(spreadsheet)
-
-def add_sample_data(spreadsheet):
-    """Add sample data to sheets"""
-    # Sample projects
-    project_sheet = spreadsheet.worksheet("Project Overview")
-    sample_projects = [
-        ["Beehiiv + TinyEmail Automation", "Automate daily campaign stats to Sheets", "Aug 28", "Sept 6", "In Progress", "Andre, Partner", "Roadmap drafted, API research ongoing", datetime.now().isoformat()],
-        ["Slack AI Assistant", "AI chatbot with doc parsing", "Sept 7", "Sept 15", "On Hold", "Andre", "Waiting for client feedback", datetime.now().isoformat()]
-    ]
-    project_sheet.update('A2:H3', sample_projects)
-    
-    # Sample daily updates
-    daily_sheet = spreadsheet.worksheet("Daily Updates")
-    sample_updates = [
-        ["2025-08-27", "Beehiiv + TinyEmail", "Andre", "Finished roadmap & doc", "Start API auth setup", "Need API keys from client", "API connector working", datetime.now().isoformat()],
-        ["2025-08-27", "Beehiiv + TinyEmail", "Partner", "Explored TinyEmail docs", "Build Beehiiv client prototype", "None", "End-to-end test for 1 brand", datetime.now().isoformat()],
-        ["2025-08-28", "Slack AI Assistant", "Andre", "Setup Flask skeleton", "Write Slackbot listener", "None", "Slackbot responds to `/ask`", datetime.now().isoformat()]
-    ]
-    daily_sheet.update('A2:H4', sample_updates)
-    
-    # Sample sprint goals
-    sprint_sheet = spreadsheet.worksheet("Sprint Goals")
-    sample_sprints = [
-        ["Sprint 1", "Aug 27–Sept 6", "Beehiiv + TinyEmail", "Automated ingestion & write to Sheets", "Job runs daily at 8am PH time with alerts", "Andre, Partner", "In Progress", datetime.now().isoformat()],
-        ["Sprint 2", "Sept 7–Sept 15", "Slack AI Assistant", "Slackbot answers questions from uploaded docs", "Answers accurate within ±10%", "Andre", "Planned", datetime.now().isoformat()]
-    ]
-    sprint_sheet.update('A2:H3', sample_sprints)
-    
-    # Sample retrospective
-    retro_sheet = spreadsheet.worksheet("Results & Retrospective")
-    sample_retro = [
-        ["Sprint 1", "Clear roadmap, strong API division", "Client was slow with credentials", "Automation working daily", datetime.now().isoformat()]
-    ]
-    retro_sheet.update('A2:E2', sample_retro)
-
-def load_sheet_data(spreadsheet, sheet_name):
-    """Load data from a specific sheet"""
-    if not spreadsheet:
-        return []
+        return serve_metrics(port)
+    except OSError as e:
+        logger.warning("Metrics endpoint not started on port %s: %s", port, e)
+        return None
+
+@st.cache_resource
+def get_snapshot_publisher(store_id, _store, persist_dir=None):
+    """One background refresher per store; every session renders its snapshot"""
+    return SnapshotPublisher(_store, interval=SNAPSHOT_POLL_SECONDS, persist_dir=persist_dir)
+
+@st.cache_resource
+def get_update_history(store_id, _store):
+    """Archived months of Daily Updates, loaded on demand and shared by all sessions"""
+    return UpdateHistory(_store)
+
+@st.cache_resource
+def start_archiver(store_id, _store, _publisher, _history):
+    """Background archiver for a store; republishes the (smaller) snapshot after each move"""
+    def on_archive(moved):
+        _history.clear()
+        _publisher.poll_now()
+    return PeriodArchiver(_store, interval=ARCHIVE_INTERVAL_SECONDS, on_archive=on_archive)
+
+@st.cache_resource
+def get_project_rollups(store_id, _store, _publisher):
+    """Per-project rollups, folded forward by every snapshot the publisher publishes"""
+    rollups = ProjectRollups()
+    projects_frame = _publisher.snapshot.frame("Project Overview")
+    if projects_frame is not None:
+        # Projects quiet this month still get their last update from the archives
+        rollups.backfill(_store, projects_frame["Project"])
+    _publisher.subscribe(lambda snapshot: rollups.sync(snapshot.frames, version=snapshot.version))
+    return rollups
+
+@st.cache_resource
+def get_search_index(store_id):
+    """Full-text index of a store's free-text worksheets, shared by all sessions"""
+    return SearchIndex()
+
+def init_store(connection):
+    """Pick the storage backend; falls back to local SQLite when Sheets is unreachable
+
+    Returns (spreadsheet, store). The store is None while a Sheets-only
+    backend is still connecting.
+    """
+    if STORAGE_BACKEND == "memory":
+        return None, get_memory_store()
     
-    try:
-        sheet = spreadsheet.worksheet(sheet_name)
-        data = sheet.get_all_records()
-        return data
-    except Exception as e:
-        st.error(f"Error loading {sheet_name}: {str(e)}")
+    spreadsheet = connection.result if connection.done else None
+    sheets_store = get_sheets_store(spreadsheet.id, spreadsheet) if spreadsheet else None
+    if STORAGE_BACKEND == "sqlite":
+        return spreadsheet, get_sqlite_store(SQLITE_PATH)
+    if connection.done and sheets_store is None:
+        return None, get_outage_store(OUTAGE_DB_PATH)
+    # Connected again: a later outage starts from a fresh journal read
+    get_outage_store.clear()
+    return spreadsheet, sheets_store
+
+def load_sheet_frame(snapshot, sheet_name):
+    """A sheet from the shared snapshot as a typed DataFrame (None when unavailable)"""
+    if not snapshot:
+        return None
+    with timer.phase(f"load {sheet_name}"):
+        return snapshot.frame(sheet_name)
+
+def load_sheet_data(snapshot, sheet_name):
+    """Load data from a specific sheet as a list of row dicts"""
+    frame = load_sheet_frame(snapshot, sheet_name)
+    if frame is None:
         return []
+    return frame.to_dict("records")
 
-def append_to_sheet(spreadsheet, sheet_name, data):
-    """Append a row of data to a sheet"""
-    if not spreadsheet:
-        st.error("Google Sheets not connected. Data not saved.")
+def append_to_sheet(publisher, sheet_name, data):
+    """Append a row through the storage backend (queued for Google Sheets)"""
+    if not publisher:
+        st.error("No storage backend available. Data not saved.")
         return False
     
     try:
-        sheet = spreadsheet.worksheet(sheet_name)
-        # Add timestamp
-        data.append(datetime.now().isoformat())
-        sheet.append_row(data)
+        with timer.phase(f"append {sheet_name}"):
+            # Add timestamp, row id and initial version
+            data.append(datetime.now().isoformat())
+            publisher.store.append_row(sheet_name, versioned_row(sheet_name, data))
+            # Publish right away so every open session sees the new row
+            publisher.refresh(fetch=False)
         return True
     except Exception as e:
         st.error(f"Error saving to {sheet_name}: {str(e)}")
         return False
 
+def show_write_queue_status(write_queue):
+    """Sidebar line with queued/flushed state of pending writes"""
+    queue_status = write_queue.status()
+    pending = sum(queue_status["pending"].values())
+
+    # Poll while rows are queued so the status flips to saved without a click
+    @st.fragment(run_every=2 if pending else None)
+    def write_queue_status():
+        current = write_queue.status()
+        still_pending = sum(current["pending"].values())
+        if pending and not still_pending:
+            # Everything landed: rerun the page so it reads the saved rows
+            st.rerun()
+        if current["last_error"]:
+            st.warning(f"⚠️ {still_pending} change(s) queued, retrying: {current['last_error']}")
+        elif still_pending:
+            st.info(f"⏳ {still_pending} change(s) queued for Google Sheets")
+        else:
+            st.caption(f"✅ All changes saved ({current['flushed']} rows flushed)")
+
+    with st.sidebar:
+        write_queue_status()
+
+def show_connection_status(connection):
+    """Sidebar connection state; polls while the background connect is running"""
+    if connection is None:
+        return
+    
+    connected_before = connection.done
+    
+    @st.fragment(run_every=None if connected_before else 1)
+    def connection_status():
+        if not connection.done:
+            st.info(f"🔄 Connecting to Google Sheets… ({connection.elapsed:.1f}s)")
+            return
+        if not connected_before:
+            # The attempt finished while this page was showing: rerun so pages load data
+            st.rerun()
+        if connection.connected:
+            st.success("✅ Connected to Google Sheets")
+        else:
+            st.error("❌ Google Sheets not connected")
+        for level, message in connection.notes:
+            getattr(st, level)(message)
+    
+    with st.sidebar:
+        connection_status()
+
+def show_snapshot_status(publisher, rendered_version):
+    """Sidebar snapshot info; reruns the page when a newer snapshot is published"""
+    
+    @st.fragment(run_every=SNAPSHOT_CHECK_SECONDS)
+    def snapshot_status():
+        if publisher.version != rendered_version:
+            st.rerun()
+        stats = publisher.stats()
+        st.caption(
+            f"🔁 Snapshot v{stats['version']} · {stats['age_seconds']:.0f}s old · {stats['polls']} polls"
+            + (" · from disk" if stats["source"] == "disk" else "")
+        )
+        if stats["last_error"]:
+            st.warning(f"⚠️ Showing the last good data, refresh failed: {stats['last_error']}")
+    
+    with st.sidebar:
+        snapshot_status()
+
+def show_diagnostics(rerun, store, publisher):
+    """Optional sidebar panel: this rerun's phases and process-wide API accounting"""
+    if not st.sidebar.toggle("🩺 Diagnostics", key="show_diagnostics"):
+        return
+    
+    with st.sidebar:
+        st.caption(f"This rerun: {rerun['total_ms']:.0f} ms")
+        st.dataframe(
+            [{"Phase": name, "ms": ms} for name, ms in rerun["phases_ms"].items()],
+            hide_index=True,
+        )
+        
+        by_worksheet = {}
+        for labels, calls in REGISTRY.counters("sprint_tracker_api_calls_total"):
+            by_worksheet.setdefault(labels["worksheet"], {"Worksheet": labels["worksheet"], "Calls": 0, "KB in": 0.0, "KB out": 0.0})
+            by_worksheet[labels["worksheet"]]["Calls"] += calls
+        for labels, size in REGISTRY.counters("sprint_tracker_api_bytes_total"):
+            row = by_worksheet.setdefault(labels["worksheet"], {"Worksheet": labels["worksheet"], "Calls": 0, "KB in": 0.0, "KB out": 0.0})
+            row["KB in" if labels["direction"] == "received" else "KB out"] += round(size / 1024, 1)
+        st.caption("Google API since start")
+        if by_worksheet:
+            st.dataframe(list(by_worksheet.values()), hide_index=True)
+        else:
+            st.caption("No API calls yet")
+        
+        retries = sum(value for _, value in REGISTRY.counters("sprint_tracker_api_retries_total"))
+        errors = sum(value for _, value in REGISTRY.counters("sprint_tracker_api_errors_total"))
+        throttled = REGISTRY.counters("sprint_tracker_api_errors_total")
+        quota_errors = sum(value for labels, value in throttled if labels["status"] == "429")
+        st.caption(f"Retries {retries} · errors {errors} (quota {quota_errors})")
+        
+        if getattr(store, "sync", None) is not None:
+            sync_stats = store.sync.stats()
+            st.caption(
+                f"Sync: {sync_stats['full_reloads']} full · {sync_stats['delta_syncs']} delta · "
+                f"{sync_stats['fallbacks']} fallbacks"
+            )
+        snapshot_stats = publisher.stats()
+        st.caption(f"Snapshot: v{snapshot_stats['version']} · {snapshot_stats['polls']} polls")
+        st.download_button(
+            "Download metrics",
+            REGISTRY.render_prometheus(),
+            file_name="sprint_tracker_metrics.prom",
+            mime="text/plain",
+        )
+
 def get_status_badge(status):
     status_class = status.lower().replace(' ', '-')
     return f'<span class="status-{status_class}">{status}</span>'
 
-# Initialize Google Sheets
-spreadsheet = init_google_sheets()
+# Status badges for table view (st.dataframe cells can't render the HTML badges)
+STATUS_BADGES = {
+    "In Progress": "🔵 In Progress",
+    "On Hold": "🟠 On Hold",
+    "Completed": "🟢 Completed",
+    "Planned": "🟣 Planned",
+}
+
+def render_records_table(frame, columns, status_column=None):
+    """Render rows as one st.dataframe grid instead of a set of elements per row
+
+    The grid is a single element whose canvas only draws the rows scrolled into view.
+    """
+    table = frame.reindex(columns=columns).astype({status_column: object} if status_column else {})
+    column_config = {columns[0]: st.column_config.TextColumn(columns[0], pinned=True)}
+    if status_column:
+        table[status_column] = table[status_column].map(STATUS_BADGES).fillna(table[status_column])
+        column_config[status_column] = st.column_config.TextColumn(status_column, width="small")
+    st.dataframe(table, column_config=column_config, hide_index=True, height=TABLE_HEIGHT)
 
 # Sidebar navigation
 st.sidebar.title("Sprint Tracker")
 
-# Show connection status
-if spreadsheet:
-    st.sidebar.success("✅ Connected to Google Sheets")
-    if st.sidebar.button("View Spreadsheet"):
-        st.sidebar.write(f"[Open in Google Sheets]({spreadsheet.url})")
-else:
-    st.sidebar.error("❌ Google Sheets not connected")
-    st.sidebar.info("Running in demo mode")
-
 page = st.sidebar.selectbox(
     "Navigate to:",
-    ["Project Overview", "Daily Updates", "Sprint Goals", "Results & Retrospective"]
+    ["Project Overview", "Daily Updates", "Sprint Goals", "Results & Retrospective", "Analytics", "Search", "Import / Export"]
 )
 
+if METRICS_PORT:
+    start_metrics_endpoint(int(METRICS_PORT))
+
+timer.add("startup", time.perf_counter() - SCRIPT_STARTED_AT)
+
+# Connect in the background; the sidebar renders without waiting on OAuth
+with timer.phase("connect"):
+    connection = get_sheets_connection() if STORAGE_BACKEND != "memory" else None
+    show_connection_status(connection)
+
+first_paint_ms = (time.perf_counter() - SCRIPT_STARTED_AT) * 1000
+
+# Deferred imports: pandas (and with it the data layer) load after the first paint
+timer.start("imports")
+from tracker.analytics import blocker_age, developer_cadence, on_time_rate, sprint_completion
+from tracker.archive import PeriodArchiver, UpdateHistory
+from tracker.bulk import BulkImportError, data_columns, detect_format, export_file, import_rows
+from tracker.columnar import read_latest_snapshot
+from tracker.fake_sheets import InMemorySpreadsheet
+from tracker.queries import filter_updates, latest_page
+from tracker.rollups import ROLLUP_COLUMNS, ProjectRollups
+from tracker.search import SEARCH_COLUMNS, SearchIndex
+from tracker.snapshot import SnapshotPublisher
+from tracker.storage import GoogleSheetsStore, SqliteStore, open_outage_store
+timer.stop()
+
+# Initialize storage (Google Sheets and/or local SQLite)
+with timer.phase("connect"):
+    spreadsheet, store = init_store(connection)
+
+# Persisted snapshots are kept per data source; the in-memory stand-in and the
+# outage copy (itself made from the Sheets snapshot) have none
+if STORAGE_BACKEND == "memory" or store is None or (STORAGE_BACKEND == "sheets" and spreadsheet is None):
+    snapshot_dir = None
+elif isinstance(store, GoogleSheetsStore):
+    snapshot_dir = os.path.join(SNAPSHOT_DIR, f"sheets-{spreadsheet.id}")
+else:
+    snapshot_dir = os.path.join(SNAPSHOT_DIR, "sqlite")
+
+if spreadsheet and st.sidebar.button("View Spreadsheet"):
+    st.sidebar.write(f"[Open in Google Sheets]({spreadsheet.url})")
+if store is not None:
+    st.sidebar.caption(f"💾 Data served from {store.label}")
+    if store.write_queue is not None:
+        show_write_queue_status(store.write_queue)
+
 if st.sidebar.button("Refresh Data"):
-    st.cache_resource.clear()
+    if store is not None:
+        store.refresh()
+        get_snapshot_publisher(id(store), store, snapshot_dir).refresh()
+    if connection is not None and connection.done and not connection.connected:
+        # Let a failed connection be retried
+        get_sheets_connection.clear()
     st.rerun()
 
+cache_stats = get_read_cache().stats()
+st.sidebar.caption(
+    f"Read cache: {cache_stats['hits']} hits · {cache_stats['misses']} misses · "
+    f"{cache_stats['evictions']} evictions"
+)
+
+startup_ms = (time.perf_counter() - SCRIPT_STARTED_AT) * 1000
+st.sidebar.caption(
+    f"⏱️ First paint {first_paint_ms:.0f} ms (budget {FIRST_PAINT_BUDGET_MS:.0f} ms) · "
+    f"ready {startup_ms:.0f} ms"
+    + (f" · connect {connection.elapsed:.1f}s" if connection is not None and connection.done else "")
+)
+if first_paint_ms > FIRST_PAINT_BUDGET_MS:
+    logger.warning("First paint took %.0f ms, over the %.0f ms budget", first_paint_ms, FIRST_PAINT_BUDGET_MS)
+
+if store is None:
+    st.info("🔄 Connecting to Google Sheets… the page will load as soon as the connection is ready.")
+    st.stop()
+
+# Every page renders from one shared snapshot, so views cost no API calls
+with timer.phase("snapshot"):
+    publisher = get_snapshot_publisher(id(store), store, snapshot_dir)
+    if STORAGE_BACKEND == "sqlite" and spreadsheet is not None:
+        # Writes made while connecting are queued for Sheets now
+        if store.attach_mirror(get_sheets_store(spreadsheet.id, spreadsheet)):
+            publisher.refresh(fetch=False)
+    snapshot = publisher.snapshot
+    update_history = get_update_history(id(store), store)
+    if ARCHIVE_INTERVAL_SECONDS:
+        start_archiver(id(store), store, publisher, update_history)
+    rollups = get_project_rollups(id(store), store, publisher)
+show_snapshot_status(publisher, snapshot.version)
+
 # Main content
+timer.start("render")
 if page == "Project Overview":
     st.title("Project Overview")
     st.caption("High-level status of all projects")
@@ -247,8 +609,8 @@ if page == "Project Overview":
     if st.button("Add Project", type="primary"):
         if project_name and goal:
             data_row = [project_name, goal, start_date, target_end, status, owners, notes]
-            if append_to_sheet(spreadsheet, "Project Overview", data_row):
-                st.success("Project added successfully!")
+            if append_to_sheet(publisher, "Project Overview", data_row):
+                st.success("Project queued for saving!")
                 st.rerun()
         else:
             st.error("Please fill in Project and Goal fields")
@@ -258,29 +620,93 @@ if page == "Project Overview":
     # Display projects
     st.subheader("Current Projects")
     
-    projects_data = load_sheet_data(spreadsheet, "Project Overview")
+    projects_frame = load_sheet_frame(snapshot, "Project Overview")
     
-    if projects_data:
-        # Display as a table with custom formatting
-        for project in projects_data:
-            col1, col2, col3, col4, col5, col6 = st.columns([2, 2, 1, 1, 1.5, 2])
-            
+    if projects_frame is not None and len(projects_frame):
+        # Rollups are kept current as rows arrive, so joining them costs O(projects)
+        with timer.phase("rollups"):
+            rollup_table = rollups.table(projects_frame["Project"])
+            rollup_table["Last Update"] = rollup_table["Last Update"].dt.strftime("%Y-%m-%d").fillna("—")
+            rollup_table["Active Sprint"] = rollup_table["Active Sprint"].fillna("—")
+            projects_frame = projects_frame.assign(**{column: rollup_table[column].to_numpy() for column in ROLLUP_COLUMNS})
+        
+        view = st.radio("View", ["Table", "Cards"], horizontal=True, key="projects_view")
+        if view == "Table":
+            render_records_table(
+                projects_frame,
+                ["Project", "Goal", "Start Date", "Target End Date", "Current Status", "Owner(s)", *ROLLUP_COLUMNS, "Notes"],
+                status_column="Current Status",
+            )
+        else:
+            # Display as a table with custom formatting
+            for project in projects_frame.to_dict("records"):
+                col1, col2, col3, col4, col5, col6 = st.columns([2, 2, 1, 1, 1.5, 2])
+                
+                with col1:
+                    st.write(f"**{project['Project']}**")
+                with col2:
+                    st.write(project['Goal'])
+                with col3:
+                    st.write(project['Start Date'])
+                with col4:
+                    st.write(project['Target End Date'])
+                with col5:
+                    st.markdown(get_status_badge(project['Current Status']), unsafe_allow_html=True)
+                with col6:
+                    st.write(project['Owner(s)'])
+                
+                st.caption(
+                    f"Last update {project['Last Update']} · {project['Open Blockers']} open blocker(s) · "
+                    f"sprint {project['Active Sprint']} · {project['Updates (7d)']} update(s) in the last 7 days"
+                )
+                if project['Notes']:
+                    st.caption(f"Notes: {project['Notes']}")
+                st.divider()
+        
+        # Change a project's status; the update is refused if someone else
+        # changed the project since this page was loaded
+        st.subheader("Update Project Status")
+        notice = st.session_state.pop("project_update_notice", None)
+        if notice:
+            getattr(st, notice[0])(notice[1])
+        
+        seen_versions = st.session_state.get("project_versions", {})
+        editable = projects_frame[(projects_frame["Row ID"] != "") & (projects_frame["Project"] != "")]
+        if len(editable):
+            project_names = dict(zip(editable["Row ID"], editable["Project"]))
+            col1, col2, col3 = st.columns([3, 2, 1])
             with col1:
-                st.write(f"**{project['Project']}**")
+                row_id = st.selectbox("Project", list(project_names), format_func=project_names.get, key="status_project")
             with col2:
-                st.write(project['Goal'])
+                new_status = st.selectbox("New Status", ["In Progress", "On Hold", "Completed", "Planned"], key="status_value")
             with col3:
-                st.write(project['Start Date'])
-            with col4:
-                st.write(project['Target End Date'])
-            with col5:
-                st.markdown(get_status_badge(project['Current Status']), unsafe_allow_html=True)
-            with col6:
-                st.write(project['Owner(s)'])
+                st.write("")
+                update_clicked = st.button("Update Status")
             
-            if project['Notes']:
-                st.caption(f"Notes: {project['Notes']}")
-            st.divider()
+            if update_clicked:
+                try:
+                    with timer.phase("update Project Overview"):
+                        store.update_row(
+                            "Project Overview", row_id, {"Current Status": new_status},
+                            expected_version=seen_versions.get(row_id),
+                        )
+                        publisher.refresh(fetch=False)
+                    st.session_state["project_update_notice"] = ("success", f"{project_names[row_id]} is now {new_status}.")
+                except WriteConflict:
+                    # The store dropped its stale copy; publish what is there now
+                    publisher.poll_now()
+                    st.session_state["project_update_notice"] = (
+                        "warning",
+                        f"{project_names[row_id]} was changed by someone else since you loaded it. "
+                        "The latest values are shown now; review them and try again.",
+                    )
+                except Exception as e:
+                    st.session_state["project_update_notice"] = ("error", f"Error updating {project_names[row_id]}: {str(e)}")
+                st.rerun()
+            
+            st.session_state["project_versions"] = {
+                row_id: parse_version(version) for row_id, version in zip(editable["Row ID"], editable["Version"])
+            }
     else:
         st.info("No projects added yet. Add your first project above.")
 
@@ -296,7 +722,7 @@ elif page == "Daily Updates":
     with col1:
         update_date = st.date_input("Date", datetime.now()).strftime('%Y-%m-%d')
         # Get project list from Google Sheets
-        projects_data = load_sheet_data(spreadsheet, "Project Overview")
+        projects_data = load_sheet_data(snapshot, "Project Overview")
         project_list = [p['Project'] for p in projects_data] if projects_data else ['Beehiiv + TinyEmail', 'Slack AI Assistant']
         selected_project = st.selectbox("Project", project_list)
         developer = st.text_input("Developer", placeholder="e.g., Andre")
@@ -314,8 +740,8 @@ elif page == "Daily Updates":
     if st.button("Add Update", type="primary"):
         if selected_project and developer:
             data_row = [update_date, selected_project, developer, yesterday_progress, today_focus, blockers, next_milestone]
-            if append_to_sheet(spreadsheet, "Daily Updates", data_row):
-                st.success("Daily update added successfully!")
+            if append_to_sheet(publisher, "Daily Updates", data_row):
+                st.success("Daily update queued for saving!")
                 st.rerun()
         else:
             st.error("Please fill in Project and Developer fields")
@@ -325,13 +751,68 @@ elif page == "Daily Updates":
     # Display daily updates
     st.subheader("Recent Updates")
     
-    updates_data = load_sheet_data(spreadsheet, "Daily Updates")
+    hot_updates = load_sheet_frame(snapshot, "Daily Updates")
+    archived_periods = update_history.periods("Daily Updates")
     
-    if updates_data:
-        # Sort by date descending (most recent first)
-        updates_data = sorted(updates_data, key=lambda x: x['Date'], reverse=True)
+    if hot_updates is not None and (len(hot_updates) or archived_periods):
+        # Choices cover the archived months too, without loading their rows
+        with timer.phase("filter choices"):
+            project_choices = update_history.choices("Daily Updates", hot_updates, "Project")
+            developer_choices = update_history.choices("Daily Updates", hot_updates, "Developer")
+        # Filters run as one vectorized mask over the cached frame
+        filter_cols = st.columns([2, 2, 2, 1])
+        with filter_cols[0]:
+            project_filter = st.selectbox("Filter by project", ["All", *project_choices])
+        with filter_cols[1]:
+            developer_filter = st.selectbox("Filter by developer", ["All", *developer_choices])
+        with filter_cols[2]:
+            date_range = st.date_input("Date range", value=(), key="updates_date_range")
+        with filter_cols[3]:
+            blockers_only = st.checkbox("Has blockers")
+        
+        date_from = date_range[0] if len(date_range) > 0 else None
+        date_to = date_range[1] if len(date_range) > 1 else date_from
+        wanted_rows = st.session_state.get("updates_page", 1) * UPDATES_PAGE_SIZE
+        newest_archives = 0
+        with timer.phase("load Daily Updates archive"):
+            if date_from is not None:
+                # Only the archived months the range reaches are read
+                updates_frame = update_history.frame("Daily Updates", hot_updates, date_from, date_to)
+            else:
+                updates_frame = hot_updates
+            while True:
+                filtered, filtered_dates = filter_updates(
+                    updates_frame,
+                    project=None if project_filter == "All" else project_filter,
+                    developer=None if developer_filter == "All" else developer_filter,
+                    date_from=date_from,
+                    date_to=date_to,
+                    blockers_only=blockers_only,
+                )
+                more_archived = date_from is None and newest_archives < len(archived_periods)
+                if len(filtered) >= wanted_rows or not more_archived:
+                    break
+                # Not enough for this page yet: read back one more month, newest first
+                newest_archives += 1
+                updates_frame = update_history.newest("Daily Updates", hot_updates, newest_archives)
+        
+        # One page past what is loaded while older months remain archived
+        total_pages = max(1, -(-len(filtered) // UPDATES_PAGE_SIZE)) + (1 if more_archived else 0)
+        if st.session_state.get("updates_page", 1) > total_pages:
+            st.session_state["updates_page"] = total_pages
+        page_number = st.number_input("Page", min_value=1, max_value=total_pages, step=1, key="updates_page")
+        first = (page_number - 1) * UPDATES_PAGE_SIZE
+        st.caption(
+            f"Showing {min(first + 1, len(filtered))}–{min(first + UPDATES_PAGE_SIZE, len(filtered))} of "
+            f"{len(filtered)}{'+' if more_archived else ''} updates"
+        )
         
-        for update in updates_data[:20]:  # Show last 20 updates
+        # Most recent first; only the rows up to this page are selected, not fully sorted
+        page_rows = latest_page(filtered, filtered_dates, page_number - 1, UPDATES_PAGE_SIZE)
+        if not len(page_rows):
+            st.info("No updates match these filters.")
+        
+        for update in page_rows.to_dict("records"):
             with st.expander(f"{update['Date']} - {update['Project']} - {update['Developer']}"):
                 col1, col2 = st.columns(2)
                 
@@ -365,7 +846,7 @@ elif page == "Sprint Goals":
         sprint_name = st.text_input("Sprint", placeholder="e.g., Sprint 1")
         dates = st.text_input("Dates", placeholder="e.g., Aug 27–Sept 6")
         # Get project list from Google Sheets
-        projects_data = load_sheet_data(spreadsheet, "Project Overview")
+        projects_data = load_sheet_data(snapshot, "Project Overview")
         project_list = [p['Project'] for p in projects_data] if projects_data else ['Beehiiv + TinyEmail', 'Slack AI Assistant']
         sprint_project = st.selectbox("Project", project_list, key="sprint_project")
     
@@ -378,8 +859,8 @@ elif page == "Sprint Goals":
     if st.button("Add Sprint Goal", type="primary"):
         if sprint_name and sprint_project and goal:
             data_row = [sprint_name, dates, sprint_project, goal, success_criteria, owners, status]
-            if append_to_sheet(spreadsheet, "Sprint Goals", data_row):
-                st.success("Sprint goal added successfully!")
+            if append_to_sheet(publisher, "Sprint Goals", data_row):
+                st.success("Sprint goal queued for saving!")
                 st.rerun()
         else:
             st.error("Please fill in Sprint, Project, and Goal fields")
@@ -389,31 +870,39 @@ elif page == "Sprint Goals":
     # Display sprint goals
     st.subheader("Current Sprint Goals")
     
-    goals_data = load_sheet_data(spreadsheet, "Sprint Goals")
+    goals_frame = load_sheet_frame(snapshot, "Sprint Goals")
     
-    if goals_data:
-        for goal in goals_data:
-            with st.container():
-                col1, col2, col3, col4, col5, col6 = st.columns([1, 1.5, 1.5, 2, 1.5, 1])
-                
-                with col1:
-                    st.write(f"**{goal['Sprint']}**")
-                with col2:
-                    st.write(goal['Dates'])
-                with col3:
-                    st.write(goal['Project'])
-                with col4:
-                    st.write(goal['Goal'])
-                with col5:
-                    st.write(goal['Success Criteria'])
-                with col6:
-                    st.write(goal['Owner(s)'])
-                
-                col1, col2 = st.columns([1, 5])
-                with col1:
-                    st.markdown(get_status_badge(goal['Status']), unsafe_allow_html=True)
-                
-                st.divider()
+    if goals_frame is not None and len(goals_frame):
+        view = st.radio("View", ["Table", "Cards"], horizontal=True, key="goals_view")
+        if view == "Table":
+            render_records_table(
+                goals_frame,
+                ["Sprint", "Dates", "Project", "Goal", "Success Criteria", "Owner(s)", "Status"],
+                status_column="Status",
+            )
+        else:
+            for goal in goals_frame.to_dict("records"):
+                with st.container():
+                    col1, col2, col3, col4, col5, col6 = st.columns([1, 1.5, 1.5, 2, 1.5, 1])
+                    
+                    with col1:
+                        st.write(f"**{goal['Sprint']}**")
+                    with col2:
+                        st.write(goal['Dates'])
+                    with col3:
+                        st.write(goal['Project'])
+                    with col4:
+                        st.write(goal['Goal'])
+                    with col5:
+                        st.write(goal['Success Criteria'])
+                    with col6:
+                        st.write(goal['Owner(s)'])
+                    
+                    col1, col2 = st.columns([1, 5])
+                    with col1:
+                        st.markdown(get_status_badge(goal['Status']), unsafe_allow_html=True)
+                    
+                    st.divider()
     else:
         st.info("No sprint goals yet. Add your first sprint goal above.")
 
@@ -440,8 +929,8 @@ elif page == "Results & Retrospective":
     if st.button("Add Retrospective", type="primary"):
         if sprint_name:
             data_row = [sprint_name, what_went_well, what_could_be_better, key_results]
-            if append_to_sheet(spreadsheet, "Results & Retrospective", data_row):
-                st.success("Retrospective added successfully!")
+            if append_to_sheet(publisher, "Results & Retrospective", data_row):
+                st.success("Retrospective queued for saving!")
                 st.rerun()
         else:
             st.error("Please fill in Sprint field")
@@ -451,7 +940,7 @@ elif page == "Results & Retrospective":
     # Display retrospectives
     st.subheader("Sprint Retrospectives")
     
-    retro_data = load_sheet_data(spreadsheet, "Results & Retrospective")
+    retro_data = load_sheet_data(snapshot, "Results & Retrospective")
     
     if retro_data:
         for retro in retro_data:
@@ -475,9 +964,151 @@ elif page == "Results & Retrospective":
     else:
         st.info("No retrospectives yet. Add your first retrospective above.")
 
+elif page == "Analytics":
+    st.title("Analytics")
+    st.caption("Sprint completion, cadence and blocker metrics computed from the logs")
+    
+    projects_frame = load_sheet_frame(snapshot, "Project Overview")
+    # Archived months count too; they are read once and then reused
+    with timer.phase("load Daily Updates archive"):
+        updates_frame = update_history.history("Daily Updates", load_sheet_frame(snapshot, "Daily Updates"))
+    goals_frame = load_sheet_frame(snapshot, "Sprint Goals")
+    
+    # Each metric is memoized on the content of its input frames
+    completion = sprint_completion(goals_frame)
+    cadence = developer_cadence(updates_frame)
+    blockers = blocker_age(updates_frame)
+    rate, on_time = on_time_rate(projects_frame, updates_frame, today=datetime.now().date())
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("On-time delivery", "—" if rate is None else f"{rate:.0%}")
+    with col2:
+        st.metric("Open blockers", int(blockers["Open"].sum()) if len(blockers) else 0)
+    with col3:
+        st.metric("Active developers", len(cadence))
+    
+    st.subheader("Sprint Completion")
+    if len(completion):
+        st.bar_chart(completion, x="Sprint", y=["Completed", "Remaining"])
+        st.dataframe(completion, hide_index=True)
+    else:
+        st.info("No sprint goals yet.")
+    
+    st.subheader("Developer Cadence")
+    if len(cadence):
+        st.dataframe(cadence, hide_index=True)
+    else:
+        st.info("No daily updates yet.")
+    
+    st.subheader("Blocker Age")
+    if len(blockers):
+        st.dataframe(blockers, hide_index=True)
+    else:
+        st.success("No blockers reported.")
+    
+    st.subheader("On-Time Delivery")
+    if len(on_time):
+        st.dataframe(on_time, hide_index=True)
+    else:
+        st.info("No projects yet.")
+
+elif page == "Search":
+    st.title("Search")
+    st.caption("Full-text search across daily updates, sprint goals and retrospectives")
+    
+    # Re-index only the rows that changed since the snapshot last indexed
+    search_index = get_search_index(id(store))
+    if search_index.synced_version != snapshot.version:
+        search_index.sync(snapshot.frames, version=snapshot.version)
+    # Archived months are indexed once each
+    for period in update_history.periods("Daily Updates"):
+        search_index.sync_archive("Daily Updates", period, update_history.archive_frame("Daily Updates", period))
+    
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        search_text = st.text_input("Search", placeholder="e.g., API keys blocker")
+    with col2:
+        search_sheets = st.multiselect("In", list(SEARCH_COLUMNS), default=list(SEARCH_COLUMNS))
+    
+    if not search_sheets:
+        st.info("Pick at least one worksheet to search in.")
+    elif search_text.strip():
+        search_started = time.perf_counter()
+        results = search_index.search(search_text, sheets=search_sheets, limit=50)
+        search_ms = (time.perf_counter() - search_started) * 1000
+        st.caption(f"{len(results)} result(s) in {search_ms:.1f} ms · {search_index.document_count()} rows indexed")
+        
+        for result in results:
+            st.markdown(f"**{result['title']}** · _{result['sheet']}_")
+            st.markdown(result["snippet"].replace("\n", "  \n"))
+            st.divider()
+        if not results:
+            st.info("No matches.")
+
+elif page == "Import / Export":
+    st.title("Import / Export")
+    st.caption("Bulk-load rows from CSV or JSON files, or download a worksheet")
+    
+    sheet_name = st.selectbox(
+        "Worksheet", ["Project Overview", "Daily Updates", "Sprint Goals", "Results & Retrospective"],
+        key="bulk_sheet",
+    )
+    
+    st.subheader("Import")
+    st.caption(
+        f"Columns: {', '.join(data_columns(sheet_name))}. Created At, Row ID and Version are optional. "
+        "CSV needs a header row; JSON may be an array of objects or one object per line."
+    )
+    upload = st.file_uploader("CSV or JSON file", type=["csv", "json", "jsonl", "ndjson"], key="bulk_upload")
+    if upload is not None and st.button("Import rows", type="primary"):
+        progress_bar = st.progress(0.0, text="Starting import…")
+        try:
+            with timer.phase(f"import {sheet_name}"):
+                result = import_rows(
+                    store, sheet_name, upload, detect_format(upload.name),
+                    checkpoint_dir=IMPORT_CHECKPOINT_DIR,
+                    progress=lambda rows, fraction: progress_bar.progress(
+                        fraction, text=f"{rows:,} rows written · {fraction:.0%} of the file read"
+                    ),
+                )
+            progress_bar.progress(1.0, text="Import finished")
+            if result["resumed_from"]:
+                st.info(f"Resumed an unfinished import of this file after record {result['resumed_from']:,}.")
+            st.success(
+                f"Imported {result['rows_written']:,} rows into {sheet_name}"
+                + (f" ({result['skipped_existing']:,} already stored were skipped)" if result["skipped_existing"] else "")
+            )
+            if result["invalid"]:
+                st.warning(f"{result['invalid']:,} invalid record(s) were not imported.")
+                st.dataframe(
+                    [{"Record": number, "Problem": message} for number, message in result["errors"]],
+                    hide_index=True,
+                )
+        except BulkImportError as e:
+            st.error(str(e))
+        except Exception as e:
+            st.error(f"Import stopped: {e}. Import the same file again to resume where it left off.")
+        finally:
+            # Pick up whatever was written, even by an import that failed part way
+            publisher.refresh()
+    
+    st.subheader("Export")
+    export_format = st.radio("Format", ["CSV", "JSON Lines"], horizontal=True, key="bulk_export_format")
+    export_frame = load_sheet_frame(snapshot, sheet_name)
+    fmt = "csv" if export_format == "CSV" else "json"
+    st.caption(f"{len(export_frame):,} rows in the current snapshot")
+    st.download_button(
+        f"Download {sheet_name}",
+        # Written out chunk by chunk only when clicked, off the script thread
+        data=lambda: export_file(export_frame, sheet_name, fmt),
+        file_name=f"{sheet_name.lower().replace(' & ', '-').replace(' ', '-')}.{'csv' if fmt == 'csv' else 'jsonl'}",
+        mime="text/csv" if fmt == "csv" else "application/x-ndjson",
+    )
+
 # Footer
 st.divider()
-st.markdown("**Sprint Tracker** - Data stored in Google Sheets")
+st.markdown(f"**Sprint Tracker** - Data stored in {store.label}")
 
 # Display spreadsheet URL in sidebar if connected
 if spreadsheet and st.sidebar.button("📊 Open Google Sheets"):
@@ -506,4 +1137,8 @@ with st.sidebar.expander("⚙️ Setup Instructions"):
     auth_uri = "https://accounts.google.com/o/oauth2/auth"
     token_uri = "https://oauth2.googleapis.com/token"
     ```
-    """)
\ No newline at end of file
+    """)
+
+# Close out this rerun's timings (also logged as one JSON line) and show them if asked
+rerun_record = timer.finish(page=page)
+show_diagnostics(rerun_record, store, publisher)
@@ -0,0 +1,15 @@
+import pytest
+
+from tracker.bootstrap import bootstrap_schema
+from tracker.fake_sheets import InMemorySpreadsheet
+from tracker.storage import GoogleSheetsStore, SqliteStore
+
+
+@pytest.fixture(params=["sqlite", "sheets"])
+def store(request, tmp_path):
+    """An empty store of each backend; Google Sheets runs against the in-memory stand-in."""
+    if request.param == "sqlite":
+        return SqliteStore(str(tmp_path / "tracker.db"))
+    spreadsheet = InMemorySpreadsheet()
+    bootstrap_schema(spreadsheet, sample_rows=None)
+    return GoogleSheetsStore(spreadsheet, str(tmp_path / "pending.jsonl"))
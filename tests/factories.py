@@ -0,0 +1,6 @@
+import uuid
+
+
+def update_row(text="progress", date="2026-10-01", created_at="2026-10-01T09:00:00"):
+    """A Daily Updates row as the app writes it."""
+    return [date, "Project A", "Andre", text, "", "None", "", created_at, uuid.uuid4().hex, "1"]
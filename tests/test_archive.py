@@ -0,0 +1,67 @@
+import io
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from tests.factories import update_row
+from tracker.archive import UpdateHistory, row_periods
+from tracker.bulk import import_rows
+from tracker.queries import filter_updates
+
+
+def in_range(store, date_from, date_to):
+    history = UpdateHistory(store)
+    frame = history.frame("Daily Updates", store.read_frame("Daily Updates"), date_from, date_to)
+    filtered, _ = filter_updates(frame, date_from=date_from, date_to=date_to)
+    return list(filtered["Yesterday's Progress"])
+
+
+def test_row_periods_follow_the_date_column():
+    rows = [
+        update_row(date="2024-03-05", created_at="2026-10-02T09:00:00"),
+        update_row(date="Mar 5", created_at="2026-04-02T09:00:00"),
+        update_row(date="", created_at="2026-09-30T09:00:00"),
+    ]
+    assert row_periods("Daily Updates", rows) == ["2024-03", "2026-03", "2026-09"]
+
+
+def test_late_entered_row_is_found_by_date_range_once_archived(store):
+    store.append_rows("Daily Updates", [
+        update_row("on time", date="2026-08-03", created_at="2026-08-03T09:00:00"),
+        update_row("entered late", date="2026-08-04", created_at="2026-09-20T09:00:00"),
+        update_row("this month", date="2026-10-01", created_at="2026-10-01T09:00:00"),
+    ])
+    moved = store.archive_rows("Daily Updates", "2026-10")
+
+    assert moved == {"2026-08": 2}
+    assert store.archived_periods("Daily Updates") == ["2026-08"]
+    assert in_range(store, date(2026, 8, 1), date(2026, 8, 31)) == ["on time", "entered late"]
+
+
+def test_bulk_imported_history_is_found_by_date_range_once_archived(store):
+    csv = (
+        "Date,Project,Developer,Yesterday's Progress,Today's Focus,Blockers,Next Milestone\n"
+        "2024-03-05,Project A,Andre,imported,,None,\n"
+    )
+    result = import_rows(store, "Daily Updates", io.BytesIO(csv.encode()), "csv", requests_per_minute=0)
+    assert result["rows_written"] == 1
+    created_at = store.read_frame("Daily Updates")["Created At"].iloc[0]
+    next_month = (created_at + pd.DateOffset(months=1)).strftime("%Y-%m")
+    store.archive_rows("Daily Updates", next_month)
+
+    assert "2024-03" in store.archived_periods("Daily Updates")
+    assert in_range(store, date(2024, 3, 1), date(2024, 3, 31)) == ["imported"]
+
+
+def test_filter_choices_cover_archives_without_loading_them(store, monkeypatch):
+    old = update_row(date="2026-08-03", created_at="2026-08-03T09:00:00")
+    old[2] = "Partner"
+    store.append_rows("Daily Updates", [old, update_row(date="2026-10-01", created_at="2026-10-01T09:00:00")])
+    store.archive_rows("Daily Updates", "2026-10")
+    history = UpdateHistory(store)
+    monkeypatch.setattr(store, "read_archive", lambda *args: pytest.fail("archive rows were loaded"))
+
+    hot = store.read_frame("Daily Updates")
+    assert history.choices("Daily Updates", hot, "Developer") == ["Andre", "Partner"]
+    assert history.choices("Daily Updates", hot, "Project") == ["Project A"]
@@ -0,0 +1,33 @@
+import io
+
+import pandas as pd
+
+from tracker.bulk import export_file, import_rows, iter_export, record_to_row
+
+RECORD = {"Date": "2024-03-05", "Project": "Project A", "Developer": "Andre"}
+
+
+def test_imported_row_is_created_at_its_date():
+    row = record_to_row("Daily Updates", dict(RECORD), "id", "2026-10-17T09:00:00")
+    assert row[7] == "2024-03-05T00:00:00"
+
+
+def test_created_at_given_by_the_record_is_kept():
+    row = record_to_row("Daily Updates", {**RECORD, "Created At": "2024-03-06T10:00:00"}, "id", "2026-10-17T09:00:00")
+    assert row[7] == "2024-03-06T10:00:00"
+
+
+def test_unparsed_date_falls_back_to_the_import_time():
+    row = record_to_row("Daily Updates", {**RECORD, "Date": "sometime"}, "id", "2026-10-17T09:00:00")
+    assert row[7] == "2026-10-17T09:00:00"
+
+
+def test_export_file_matches_the_streamed_export(store):
+    csv = "Date,Project,Developer\n" + "".join(f"2026-10-{day:02d},Project A,Andre\n" for day in range(1, 11))
+    import_rows(store, "Daily Updates", io.BytesIO(csv.encode()), "csv", requests_per_minute=0)
+    frame = store.read_frame("Daily Updates")
+    assert pd.to_datetime(frame["Created At"]).dt.day.tolist() == list(range(1, 11))
+
+    for fmt in ("csv", "json"):
+        with export_file(frame, "Daily Updates", fmt, chunk_rows=3) as exported:
+            assert exported.read() == "".join(iter_export(frame, "Daily Updates", fmt)).encode("utf-8")
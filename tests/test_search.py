@@ -0,0 +1,39 @@
+import pandas as pd
+
+from tests.factories import update_row
+from tracker.schema import SHEET_HEADERS
+from tracker.search import SearchIndex
+
+
+def daily_updates(*rows):
+    return pd.DataFrame([list(row) for row in rows], columns=SHEET_HEADERS["Daily Updates"])
+
+
+def indexed():
+    blocked = update_row("Finished roadmap & doc")
+    blocked[5] = "Need API keys from client"
+    index = SearchIndex()
+    index.sync({"Daily Updates": daily_updates(blocked, update_row("Wired up the API client"))})
+    return index
+
+
+def test_placeholder_query_finds_the_reported_blocker():
+    results = indexed().search("API keys blocker")
+    assert len(results) == 1
+    assert "**Blocker**: Need **API** **keys** from client" in results[0]["snippet"]
+
+
+def test_rows_without_a_blocker_are_not_found_by_blocker():
+    assert len(indexed().search("blocker")) == 1
+
+
+def test_falls_back_to_any_word_when_no_row_has_all():
+    results = indexed().search("API roadmap unicorn")
+    assert len(results) == 2
+    assert "roadmap" in results[0]["snippet"]
+
+
+def test_empty_sheet_selection_searches_nothing():
+    index = indexed()
+    assert index.search("API", sheets=[]) == []
+    assert len(index.search("API", sheets=None)) == 2
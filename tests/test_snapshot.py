@@ -0,0 +1,42 @@
+import threading
+import uuid
+
+from tracker.bootstrap import bootstrap_schema
+from tracker.fake_sheets import InMemorySpreadsheet
+from tracker.snapshot import SnapshotPublisher
+from tracker.storage import GoogleSheetsStore
+
+
+def test_local_publish_does_not_wait_for_a_stalled_poll(tmp_path):
+    spreadsheet = InMemorySpreadsheet()
+    bootstrap_schema(spreadsheet, sample_rows=None)
+    store = GoogleSheetsStore(spreadsheet, str(tmp_path / "pending.jsonl"))
+    store.write_queue.flush_delay = 3600
+    publisher = SnapshotPublisher(store, interval=3600)
+
+    stalled = threading.Event()
+    release = threading.Event()
+    batch_get = spreadsheet.values_batch_get
+
+    def stalled_batch_get(*args, **kwargs):
+        stalled.set()
+        release.wait(timeout=10)
+        return batch_get(*args, **kwargs)
+
+    spreadsheet.values_batch_get = stalled_batch_get
+    poll = threading.Thread(target=publisher.refresh)
+    poll.start()
+    try:
+        assert stalled.wait(timeout=5)
+        row = ["2026-10-01", "Project A", "Andre", "progress", "", "None", "", "2026-10-01T09:00:00", uuid.uuid4().hex, "1"]
+        store.append_row("Daily Updates", row)
+        local = threading.Thread(target=publisher.refresh, kwargs={"fetch": False})
+        local.start()
+        local.join(timeout=2)
+        assert not local.is_alive()
+        assert len(publisher.snapshot.frame("Daily Updates")) == 1
+    finally:
+        release.set()
+        poll.join(timeout=10)
+    # The poll, which read before the row was queued, still publishes it
+    assert len(publisher.snapshot.frame("Daily Updates")) == 1
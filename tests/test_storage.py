@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+import tracker.storage
+from tests.factories import update_row
+from tracker.bootstrap import bootstrap_schema
+from tracker.columnar import read_latest_snapshot, write_snapshot
+from tracker.fake_sheets import InMemorySpreadsheet
+from tracker.schema import SHEET_NAMES
+from tracker.storage import GoogleSheetsStore, SqliteStore, open_outage_store
+
+
+def test_sqlite_read_racing_an_append_is_not_cached(tmp_path, monkeypatch):
+    store = SqliteStore(str(tmp_path / "tracker.db"))
+    building = threading.Event()
+    appended = threading.Event()
+    build_frame = tracker.storage.rows_to_frame
+
+    def slow_rows_to_frame(sheet_name, values):
+        building.set()
+        appended.wait(timeout=5)
+        return build_frame(sheet_name, values)
+
+    monkeypatch.setattr(tracker.storage, "rows_to_frame", slow_rows_to_frame)
+    reader = threading.Thread(target=store.read_frames, args=(["Daily Updates"],))
+    reader.start()
+    assert building.wait(timeout=5)
+    monkeypatch.setattr(tracker.storage, "rows_to_frame", build_frame)
+    store.append_row("Daily Updates", update_row())
+    appended.set()
+    reader.join(timeout=5)
+
+    assert store.row_count("Daily Updates") == 1
+    assert len(store.read_frame("Daily Updates")) == 1
+
+
+def test_sqlite_append_extends_cached_frame(tmp_path):
+    store = SqliteStore(str(tmp_path / "tracker.db"))
+    assert len(store.read_frame("Daily Updates")) == 0
+    store.append_row("Daily Updates", update_row())
+    store.append_rows("Daily Updates", [update_row("a"), update_row("b")])
+    frame = store.read_frame("Daily Updates")
+    assert list(frame["Yesterday's Progress"]) == ["progress", "a", "b"]
+
+
+def test_outage_store_serves_the_sheets_snapshot_and_pending_rows(tmp_path):
+    spreadsheet = InMemorySpreadsheet()
+    bootstrap_schema(spreadsheet, sample_rows=None)
+    journal = str(tmp_path / "pending.jsonl")
+    sheets = GoogleSheetsStore(spreadsheet, journal)
+    sheets.write_queue.flush_delay = 3600
+    sheets.append_rows("Daily Updates", [update_row("in sheets")])
+    sheets.write_queue.enqueue("Daily Updates", update_row("pending, in snapshot"))
+    write_snapshot(str(tmp_path / "snapshot" / "sheets-abc"), sheets.read_frames(SHEET_NAMES))
+    sheets.write_queue.enqueue("Daily Updates", update_row("pending, after snapshot"))
+    # A stale copy from an earlier outage is replaced
+    SqliteStore(str(tmp_path / "outage.db")).append_row("Daily Updates", update_row("stale"))
+
+    frames, _ = read_latest_snapshot(str(tmp_path / "snapshot"), prefix="sheets-")
+    store = open_outage_store(str(tmp_path / "outage.db"), journal, frames)
+
+    assert list(store.read_frame("Daily Updates")["Yesterday's Progress"]) == [
+        "in sheets", "pending, in snapshot", "pending, after snapshot",
+    ]
+    store.append_row("Daily Updates", update_row("during outage"))
+    assert len(store.write_queue.pending_rows("Daily Updates")) == 3
+    assert store.row_count("Daily Updates") == 4
+    row_id = store.read_frame("Daily Updates")["Row ID"].iloc[0]
+    with pytest.raises(RuntimeError):
+        store.update_row("Daily Updates", row_id, {"Blockers": "x"})
@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from tests.factories import update_row
+from tracker.versioning import WriteConflict, stress_concurrent_appends
+
+
+def test_concurrent_appends_land_exactly_once(store):
+    result = stress_concurrent_appends(store, appends=200, threads=16)
+    assert result == {"appended": 200, "stored": 200, "unique": 200, "ok": True}
+
+
+def test_update_based_on_a_stale_version_conflicts(store):
+    row = update_row()
+    row_id = row[-2]
+    store.append_row("Daily Updates", row)
+    assert store.update_row("Daily Updates", row_id, {"Blockers": "first"}, expected_version=1) == 2
+
+    with pytest.raises(WriteConflict) as conflict:
+        store.update_row("Daily Updates", row_id, {"Blockers": "second"}, expected_version=1)
+
+    assert (conflict.value.expected_version, conflict.value.current_version) == (1, 2)
+    store.refresh()
+    frame = store.read_frame("Daily Updates")
+    assert list(frame["Blockers"]) == ["first"]
+    assert list(frame["Version"]) == ["2"]
+
+
+def test_update_of_a_missing_row_conflicts(store):
+    with pytest.raises(WriteConflict) as conflict:
+        store.update_row("Daily Updates", "no-such-row", {"Blockers": "x"}, expected_version=1)
+    assert conflict.value.current_version is None
+
+
+def test_only_one_of_racing_updates_wins(store):
+    row = update_row()
+    store.append_row("Daily Updates", row)
+    barrier = threading.Barrier(8)
+    outcomes = []
+
+    def update(index):
+        barrier.wait()
+        try:
+            store.update_row("Daily Updates", row[-2], {"Blockers": f"writer {index}"}, expected_version=1)
+            outcomes.append("won")
+        except WriteConflict:
+            outcomes.append("conflict")
+
+    threads = [threading.Thread(target=update, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(outcomes) == ["conflict"] * 7 + ["won"]
@@ -0,0 +1,5 @@
+"""Data layer for the Sprint Tracker Streamlit app.
+
+Everything in this package is free of Streamlit calls so that objects held in
+``st.cache_resource`` (and the exceptions they raise) survive script reruns.
+"""
@@ -0,0 +1,198 @@
+"""Sprint metrics computed with vectorized pandas operations.
+
+Every public function is memoized on a content hash of the DataFrames it is
+given, so reruns over unchanged data return the previous result immediately.
+"""
+import functools
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+
+import pandas as pd
+
+from tracker.dates import date_column
+from tracker.queries import blocker_mask, parse_update_dates
+
+_MEMO_SIZE = 64
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+# id(frame) -> (weakref to frame, fingerprint); avoids rehashing the same cached object
+_fingerprints = {}
+
+
+def frame_fingerprint(frame):
+    """Content hash of a DataFrame (columns and values, not the index)."""
+    entry = _fingerprints.get(id(frame))
+    if entry is not None and entry[0]() is frame:
+        return entry[1]
+    digest = hashlib.sha1("\x1f".join(map(str, frame.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    fingerprint = digest.hexdigest()
+    try:
+        _fingerprints[id(frame)] = (weakref.ref(frame, lambda _, key=id(frame): _fingerprints.pop(key, None)), fingerprint)
+    except TypeError:
+        pass
+    return fingerprint
+
+
+def remember_fingerprint(frame, fingerprint):
+    """Record ``fingerprint`` for ``frame`` when it was derived more cheaply than by hashing."""
+    try:
+        _fingerprints[id(frame)] = (weakref.ref(frame, lambda _, key=id(frame): _fingerprints.pop(key, None)), fingerprint)
+    except TypeError:
+        pass
+
+
+def memoized_on_frames(fn):
+    """Memoize ``fn`` on the content of its DataFrame arguments (small LRU)."""
+
+    def key_part(value):
+        return ("frame", frame_fingerprint(value)) if isinstance(value, pd.DataFrame) else value
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (fn.__qualname__, tuple(key_part(arg) for arg in args),
+               tuple(sorted((name, key_part(value)) for name, value in kwargs.items())))
+        with _memo_lock:
+            if key in _memo:
+                _memo.move_to_end(key)
+                return _memo[key]
+        result = fn(*args, **kwargs)
+        with _memo_lock:
+            _memo[key] = result
+            while len(_memo) > _MEMO_SIZE:
+                _memo.popitem(last=False)
+        return result
+
+    return wrapper
+
+
+def _is_completed(status):
+    return status.fillna("").astype(str).str.strip().str.lower().eq("completed")
+
+
+@memoized_on_frames
+def sprint_completion(goals):
+    """Per-sprint goal counts: total, completed, remaining and percent complete.
+
+    Sprints are ordered by the start of their "Dates" range. This is where
+    each sprint stands now, not a burndown: goals carry no timestamp of when
+    they were completed.
+    """
+    if goals is None or goals.empty:
+        return pd.DataFrame(columns=["Sprint", "Goals", "Completed", "Remaining", "Percent Complete"])
+    completed = _is_completed(goals["Status"])
+    summary = (
+        goals.assign(_completed=completed.astype(int), _start=date_column(goals, "Sprint Goals", "Dates"))
+        .groupby("Sprint", sort=False, observed=True)
+        .agg(Goals=("_completed", "size"), Completed=("_completed", "sum"), _start=("_start", "min"))
+        .sort_values("_start", kind="stable", na_position="last")
+        .drop(columns="_start")
+        .reset_index()
+    )
+    summary["Remaining"] = summary["Goals"] - summary["Completed"]
+    summary["Percent Complete"] = (100.0 * summary["Completed"] / summary["Goals"]).round(1)
+    return summary
+
+
+@memoized_on_frames
+def developer_cadence(updates, window_days=7):
+    """Per-developer update cadence.
+
+    Columns: total updates, distinct active days, first/last update, mean
+    days between active days, and updates in the trailing ``window_days``
+    ending at the newest update in the log.
+    """
+    columns = ["Developer", "Updates", "Active Days", "First Update", "Last Update",
+               "Mean Gap (days)", f"Last {window_days} Days"]
+    if updates is None or updates.empty:
+        return pd.DataFrame(columns=columns)
+    frame = pd.DataFrame({"Developer": updates["Developer"], "Date": parse_update_dates(updates)})
+    frame = frame.dropna(subset=["Date"])
+    if frame.empty:
+        return pd.DataFrame(columns=columns)
+
+    grouped = frame.groupby("Developer", observed=True)
+    summary = grouped["Date"].agg(["size", "nunique", "min", "max"])
+    summary.columns = ["Updates", "Active Days", "First Update", "Last Update"]
+
+    days = frame.drop_duplicates().sort_values(["Developer", "Date"])
+    gaps = days.groupby("Developer", observed=True)["Date"].diff().dt.days
+    summary["Mean Gap (days)"] = gaps.groupby(days["Developer"], observed=True).mean().round(1)
+
+    window_start = frame["Date"].max() - pd.Timedelta(days=window_days - 1)
+    recent = frame[frame["Date"] >= window_start].groupby("Developer", observed=True).size()
+    summary[f"Last {window_days} Days"] = recent.reindex(summary.index, fill_value=0)
+    return summary.reset_index()[columns]
+
+
+@memoized_on_frames
+def blocker_age(updates):
+    """How long each blocker string has persisted for a project.
+
+    A blocker is identified by its normalized text per project. ``Open`` means
+    it was still reported on the project's most recent update day.
+    """
+    columns = ["Project", "Blocker", "First Seen", "Last Seen", "Age (days)", "Reports", "Open"]
+    if updates is None or updates.empty:
+        return pd.DataFrame(columns=columns)
+    dates = parse_update_dates(updates)
+    latest_per_project = dates.groupby(updates["Project"], observed=True).max()
+
+    mask = blocker_mask(updates) & dates.notna()
+    blocked = pd.DataFrame({
+        "Project": updates["Project"][mask],
+        "Blocker": updates["Blockers"][mask].astype(str).str.strip(),
+        "Date": dates[mask],
+    })
+    if blocked.empty:
+        return pd.DataFrame(columns=columns)
+    blocked["_key"] = blocked["Blocker"].str.lower().str.split().str.join(" ")
+
+    ages = blocked.groupby(["Project", "_key"], sort=False, observed=True).agg(
+        Blocker=("Blocker", "first"),
+        **{"First Seen": ("Date", "min"), "Last Seen": ("Date", "max"), "Reports": ("Date", "size")},
+    ).reset_index()
+    ages["Age (days)"] = (ages["Last Seen"] - ages["First Seen"]).dt.days + 1
+    ages["Open"] = ages["Last Seen"].to_numpy() == ages["Project"].map(latest_per_project).to_numpy()
+    return ages.sort_values(["Open", "Age (days)"], ascending=[False, False])[columns].reset_index(drop=True)
+
+
+@memoized_on_frames
+def on_time_rate(projects, updates, today=None):
+    """Share of due projects finished by their Target End Date.
+
+    A project is due once it is Completed or its target date has passed. A
+    Completed project counts as on time when its last Daily Update is on or
+    before the target date. Returns ``(rate, per_project_frame)``; ``rate`` is
+    None when nothing is due yet.
+    """
+    columns = ["Project", "Target End Date", "Completed", "Last Update", "Due", "On Time"]
+    if projects is None or projects.empty:
+        return None, pd.DataFrame(columns=columns)
+    today = pd.Timestamp(today) if today is not None else pd.Timestamp.now().normalize()
+    targets = date_column(projects, "Project Overview", "Target End Date")
+
+    last_update = pd.Series(dtype="datetime64[ns]")
+    if updates is not None and not updates.empty:
+        last_update = parse_update_dates(updates).groupby(updates["Project"], observed=True).max()
+
+    result = pd.DataFrame({
+        "Project": projects["Project"],
+        "Target End Date": targets,
+        "Completed": _is_completed(projects["Current Status"]),
+        "Last Update": projects["Project"].map(last_update),
+    })
+    result["Due"] = targets.notna() & (result["Completed"] | (targets < today))
+    finished_by = result["Last Update"].fillna(targets)
+    result["On Time"] = result["Due"] & result["Completed"] & (finished_by <= targets)
+    due = int(result["Due"].sum())
+    rate = float(result["On Time"].sum()) / due if due else None
+    return rate, result[columns]
+
+
+def clear_memo():
+    with _memo_lock:
+        _memo.clear()
+
@@ -0,0 +1,311 @@
+"""Monthly archives of the append-only log worksheets.
+
+Rows entered in a closed month (by "Created At") are moved out of the hot
+worksheet into an archive named after the month they are about, e.g. "Daily
+Updates 2025-01": a worksheet of its own on Google Sheets, a table of its own
+in SQLite. That month is the one of the row's "Date" (parsed as the views
+parse it), falling back to "Created At" where there is none, so an update
+entered late or imported years afterwards still sits in the archive a date
+range looks in. The hot worksheet, which every snapshot loads, then only
+holds what was entered this month.
+
+:class:`UpdateHistory` reads archives on demand: a date range pulls in only
+the months it covers, and since archives don't change once written each one
+is loaded at most once per process. Views over the whole log (analytics,
+search) use :meth:`UpdateHistory.history`, which joins every archive once and
+afterwards only appends the hot rows; filter choices come from
+:meth:`UpdateHistory.choices`, one distinct-values read per archive; the newest-first list
+of updates reads archives newest first, only as far back as a page needs.
+:class:`PeriodArchiver` moves closed months out on a background thread.
+
+Run ``python -m tracker.archive`` to archive a SQLite database by hand.
+"""
+import hashlib
+import re
+import threading
+import time
+import weakref
+from datetime import date
+
+import pandas as pd
+
+from tracker.analytics import frame_fingerprint, remember_fingerprint
+from tracker.columnar import append_compact, compact_frame
+from tracker.dates import normalize_date_column
+from tracker.schema import ARCHIVED_SHEETS, SHEET_HEADERS
+
+# Month label of an archive, as in its name
+PERIOD_FORMAT = "%Y-%m"
+
+# Column whose month picks a row's archive, where a worksheet has it
+PARTITION_COLUMN = "Date"
+
+_PERIOD_RE = re.compile(r"^\d{4}-\d{2}$")
+
+
+def period_of(value):
+    """``"YYYY-MM"`` of an ISO timestamp string or date, or None if it has none."""
+    if isinstance(value, (date, pd.Timestamp)):
+        return value.strftime(PERIOD_FORMAT)
+    text = str(value or "")[:7]
+    return text if _PERIOD_RE.match(text) else None
+
+
+def archive_name(sheet_name, period):
+    return f"{sheet_name} {period}"
+
+
+def archive_period(sheet_name, name):
+    """The period of archive ``name`` of ``sheet_name``, or None if it isn't one."""
+    prefix = sheet_name + " "
+    if not name.startswith(prefix):
+        return None
+    period = name[len(prefix):]
+    return period if _PERIOD_RE.match(period) else None
+
+
+def closed_prefix(rows, created_index, before_period):
+    """Number of leading ``rows`` created before ``before_period``.
+
+    Rows are appended in time order, so a closed month's rows sit at the top
+    of the worksheet and can be cut as one block. The block stops at the
+    first row of a later month or without a usable "Created At"; anything
+    out of order behind it stays in the hot worksheet.
+    """
+    count = 0
+    for row in rows:
+        period = period_of(row[created_index] if created_index < len(row) else "")
+        if period is None or period >= before_period:
+            break
+        count += 1
+    return count
+
+
+def _cells(rows, index):
+    return pd.Series([row[index] if index < len(row) else "" for row in rows], dtype=object)
+
+
+def row_periods(sheet_name, rows):
+    """The archive period of each of ``rows``: the month of its "Date", else of its "Created At"."""
+    headers = SHEET_HEADERS[sheet_name]
+    created = _cells(rows, headers.index("Created At"))
+    fallback = [period_of(text) for text in created]
+    if PARTITION_COLUMN not in headers:
+        return fallback
+    dates, _ = normalize_date_column(_cells(rows, headers.index(PARTITION_COLUMN)), created)
+    return [period if pd.isna(day) else day.strftime(PERIOD_FORMAT) for day, period in zip(dates, fallback)]
+
+
+def group_by_period(rows, periods):
+    """Split rows into a dict of period -> rows, given each row's period."""
+    groups = {}
+    for row, period in zip(rows, periods):
+        groups.setdefault(period, []).append(row)
+    return groups
+
+
+def periods_for_range(periods, date_from=None, date_to=None):
+    """The archived ``periods`` a "Date" range can have rows in (None ends are open)."""
+    first = period_of(date_from) if date_from is not None else None
+    last = period_of(date_to) if date_to is not None else None
+    return [
+        period for period in periods
+        if (first is None or period >= first) and (last is None or period <= last)
+    ]
+
+
+class UpdateHistory:
+    """Hot rows from the snapshot plus whichever archives a query needs."""
+
+    def __init__(self, store):
+        self.store = store
+        self._frames = {}
+        # sheet name -> (all archives as one frame, its fingerprint)
+        self._archived = {}
+        # sheet name -> (weak reference to the hot frame, archived frame, history frame)
+        self._histories = {}
+        # (sheet name, period, column) -> distinct values of that archive
+        self._values = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def periods(self, sheet_name):
+        return self.store.archived_periods(sheet_name)
+
+    def archive_frame(self, sheet_name, period):
+        key = (sheet_name, period)
+        with self._lock:
+            frame = self._frames.get(key)
+        if frame is None:
+            frame = compact_frame(self.store.read_archive(sheet_name, period))
+            with self._lock:
+                self._frames[key] = frame
+                self.loads += 1
+        return frame
+
+    def frame(self, sheet_name, hot_frame, date_from=None, date_to=None):
+        """``hot_frame`` plus the archives a ``date_from``..``date_to`` range needs.
+
+        Without a range only the hot rows are returned.
+        """
+        if date_from is None and date_to is None:
+            return hot_frame
+        return self._with_archives(sheet_name, hot_frame, periods_for_range(self.periods(sheet_name), date_from, date_to))
+
+    def newest(self, sheet_name, hot_frame, count):
+        """``hot_frame`` plus the ``count`` newest archives."""
+        periods = self.periods(sheet_name)
+        return self._with_archives(sheet_name, hot_frame, periods[len(periods) - count:] if count else [])
+
+    def _with_archives(self, sheet_name, hot_frame, periods):
+        if not periods:
+            return hot_frame
+        archived = [self.archive_frame(sheet_name, period) for period in periods]
+        return compact_frame(pd.concat([*archived, hot_frame], ignore_index=True))
+
+    def history(self, sheet_name, hot_frame):
+        """Every row of ``sheet_name``: all archives, oldest first, then ``hot_frame``.
+
+        The archives are joined once; a new ``hot_frame`` is appended to that,
+        and the result's fingerprint is derived from the two parts' so
+        memoized metrics don't hash the whole log again.
+        """
+        if hot_frame is None:
+            return None
+        archived = self._archived_frame(sheet_name)
+        if archived is None:
+            return hot_frame
+        with self._lock:
+            cached = self._histories.get(sheet_name)
+        if cached is not None and cached[0]() is hot_frame and cached[1] is archived[0]:
+            return cached[2]
+        frame = append_compact(archived[0], hot_frame)
+        remember_fingerprint(frame, hashlib.sha1((archived[1] + frame_fingerprint(hot_frame)).encode()).hexdigest())
+        with self._lock:
+            self._histories[sheet_name] = (weakref.ref(hot_frame), archived[0], frame)
+        return frame
+
+    def choices(self, sheet_name, hot_frame, column):
+        """Sorted distinct values of ``column`` across ``hot_frame`` and every archive.
+
+        Each archive's values are read once, without loading its rows (or
+        taken from its frame if that is already loaded).
+        """
+        values = set(hot_frame[column].dropna()) if hot_frame is not None else set()
+        for period in self.periods(sheet_name):
+            key = (sheet_name, period, column)
+            with self._lock:
+                archived = self._values.get(key)
+                frame = self._frames.get((sheet_name, period))
+            if archived is None:
+                if frame is not None:
+                    archived = set(frame[column].dropna())
+                else:
+                    archived = set(self.store.archive_values(sheet_name, period, column))
+                with self._lock:
+                    self._values[key] = archived
+            values |= archived
+        values.discard("")
+        return sorted(values)
+
+    def _archived_frame(self, sheet_name):
+        with self._lock:
+            entry = self._archived.get(sheet_name)
+        if entry is None:
+            periods = self.periods(sheet_name)
+            if not periods:
+                return None
+            frame = compact_frame(pd.concat(
+                [self.archive_frame(sheet_name, period) for period in periods], ignore_index=True
+            ))
+            entry = (frame, frame_fingerprint(frame))
+            with self._lock:
+                self._archived[sheet_name] = entry
+        return entry
+
+    def clear(self):
+        """Forget loaded archives (after more rows were archived into them)."""
+        with self._lock:
+            self._frames.clear()
+            self._archived.clear()
+            self._histories.clear()
+            self._values.clear()
+
+
+class PeriodArchiver:
+    """Moves closed months of ``sheet_names`` into archives every ``interval`` seconds.
+
+    ``on_archive(moved)`` is called after a run that moved rows, with a dict
+    of sheet name -> {period: rows moved}.
+    """
+
+    def __init__(self, store, sheet_names=None, interval=3600.0, on_archive=None):
+        self.store = store
+        self.sheet_names = sorted(sheet_names or ARCHIVED_SHEETS)
+        self.interval = interval
+        self.on_archive = on_archive
+        self.runs = 0
+        self.rows_archived = 0
+        self.last_error = None
+        self._stopped = False
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="period-archiver", daemon=True)
+        self._thread.start()
+
+    def archive(self, today=None):
+        """Archive every month before the one ``today`` falls in; returns what moved."""
+        current = period_of(today or date.today())
+        moved = {}
+        for name in self.sheet_names:
+            periods = self.store.archive_rows(name, current)
+            if periods:
+                moved[name] = periods
+        self.runs += 1
+        self.rows_archived += sum(sum(periods.values()) for periods in moved.values())
+        if moved and self.on_archive is not None:
+            self.on_archive(moved)
+        return moved
+
+    def _run(self):
+        while not self._stopped:
+            try:
+                self.archive()
+                self.last_error = None
+            except Exception as error:
+                # Nothing is lost: rows only leave the hot sheet once archived
+                self.last_error = str(error)
+            self._wake.wait(timeout=self.interval)
+            self._wake.clear()
+
+    def stats(self):
+        return {"runs": self.runs, "rows_archived": self.rows_archived, "last_error": self.last_error}
+
+    def close(self):
+        self._stopped = True
+        self._wake.set()
+        self._thread.join(timeout=5)
+
+
+def _main():
+    import argparse
+
+    from tracker.storage import SqliteStore
+
+    parser = argparse.ArgumentParser(prog="python -m tracker.archive", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", default="sprint_tracker.db", help="SQLite database (default: %(default)s)")
+    parser.add_argument("--before", help="archive months before this YYYY-MM (default: the current month)")
+    args = parser.parse_args()
+
+    store = SqliteStore(args.db)
+    before = args.before or period_of(date.today())
+    started = time.perf_counter()
+    for name in sorted(ARCHIVED_SHEETS):
+        moved = store.archive_rows(name, before)
+        for period, count in moved.items():
+            print(f"{archive_name(name, period)}: {count} rows archived")
+        print(f"{name}: {store.row_count(name)} rows left, archives {', '.join(store.archived_periods(name)) or 'none'}")
+    print(f"done in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,277 @@
+"""Benchmarks for the tracker's hot paths at several data sizes.
+
+    python -m tracker.benchmark [--rows 1000,10000,100000] [--repeat 5]
+        [--latency-ms 0] [--error-rate 0] [--output results.json]
+    python -m tracker.benchmark --compare baseline.json results.json
+
+Data comes from :mod:`tracker.synthetic` and lives in an
+:class:`~tracker.fake_sheets.InMemorySpreadsheet`, which can add latency to
+each API call and fail some of them with 429s. Each benchmark reports
+median/min/max milliseconds plus the API calls and throttled calls it
+caused. Results are a JSON document tagged with the git commit, so runs
+can be compared across commits with ``--compare``. The page-render
+benchmarks run the Streamlit script with ``streamlit.testing`` and are
+skipped with ``--no-render``.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from tracker import sheets
+from tracker.fake_sheets import InMemorySpreadsheet
+from tracker.queries import filter_updates, latest_page
+from tracker.schema import SHEET_NAMES
+from tracker.snapshot import SnapshotPublisher
+from tracker.storage import GoogleSheetsStore
+from tracker.synthetic import populate, workbook_for_updates
+from tracker.versioning import versioned_row
+
+DEFAULT_ROWS = [1_000, 10_000, 100_000]
+UPDATES_PAGE_SIZE = 20
+SCRIPT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sprint_tracker.py")
+
+# Pages timed end to end, with the widget values that select their per-row views
+RENDER_PAGES = [
+    ("Project Overview", {"projects_view": "Cards"}),
+    ("Daily Updates", {}),
+    ("Sprint Goals", {"goals_view": "Cards"}),
+    ("Results & Retrospective", {}),
+    ("Analytics", {}),
+]
+
+
+def _time(fn, repeat, setup=None):
+    """Run ``setup`` (untimed) then ``fn`` ``repeat`` times; returns seconds per run."""
+    timings = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        started = time.perf_counter()
+        fn(state) if setup else fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+class _Bench:
+    """One data size: a populated fake spreadsheet, a warm store and its snapshot."""
+
+    def __init__(self, rows, latency, error_rate, seed):
+        self.rows = rows
+        self.workdir = tempfile.mkdtemp(prefix="sprint-tracker-bench-")
+        self.workbook = workbook_for_updates(rows, seed=seed)
+        self.spreadsheet = InMemorySpreadsheet(seed=seed)
+        populate(self.spreadsheet, self.workbook)
+        # Faults apply to the benchmarked calls only, not to loading the data
+        self.spreadsheet.latency = latency
+        self.spreadsheet.error_rate = error_rate
+        self.store = self.new_store()
+        self.publisher = SnapshotPublisher(self.store, interval=3600)
+        self._appended = 0
+
+    def new_store(self):
+        journal = os.path.join(self.workdir, f"pending-{time.perf_counter_ns()}.jsonl")
+        return GoogleSheetsStore(self.spreadsheet, journal)
+
+    def update_row(self):
+        self._appended += 1
+        return versioned_row("Daily Updates", [
+            "2026-01-01", "Project A", "Developer 1", "bench", "bench", "None", "bench",
+            pd.Timestamp.now().isoformat(),
+        ])
+
+    def close(self):
+        self.publisher.close()
+        self.store.write_queue.close(flush=False)
+
+
+def _benchmarks(bench):
+    """(name, fn, setup) triples for one data size."""
+    updates = bench.publisher.snapshot.frame("Daily Updates")
+    first_project = str(updates["Project"].iloc[0])
+
+    def cold_store():
+        store = bench.new_store()
+        store.write_queue.close(flush=False)
+        return store
+
+    def external_append():
+        # Someone else appended a row since the last poll
+        bench.spreadsheet.worksheet("Daily Updates").append_rows([bench.update_row()])
+
+    def queued_rows():
+        for _ in range(50):
+            bench.store.write_queue.enqueue("Daily Updates", bench.update_row())
+
+    def append_to_sheet():
+        bench.store.append_row("Daily Updates", bench.update_row())
+        bench.publisher.refresh(fetch=False)
+
+    def sort_and_slice(project=None):
+        filtered, dates = filter_updates(updates, project=project)
+        return latest_page(filtered, dates, 0, UPDATES_PAGE_SIZE)
+
+    return [
+        ("load_sheet_frame.cold", lambda store: store.read_frames(SHEET_NAMES), cold_store),
+        ("load_sheet_frame.delta_poll", lambda _: bench.store.poll_frames(SHEET_NAMES), external_append),
+        ("load_sheet_data", lambda: bench.publisher.snapshot.frame("Daily Updates").to_dict("records"), None),
+        ("append_to_sheet", append_to_sheet, None),
+        ("write_queue.flush_50", lambda _: bench.store.write_queue.flush(), queued_rows),
+        ("daily_updates.sort_and_slice", sort_and_slice, None),
+        ("daily_updates.sort_and_slice.project", lambda: sort_and_slice(first_project), None),
+    ]
+
+
+def _render_benchmarks(rows, repeat):
+    """Time full reruns of each page with the in-memory backend holding ``rows`` updates."""
+    try:
+        import streamlit as st
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        return []
+    os.environ["SPRINT_TRACKER_BACKEND"] = "memory"
+    os.environ["SPRINT_TRACKER_SYNTHETIC_UPDATES"] = str(rows)
+    st.cache_resource.clear()
+    app = AppTest.from_file(SCRIPT_PATH, default_timeout=600)
+    app.run()
+    results = []
+    for page, widgets in RENDER_PAGES:
+        app.sidebar.selectbox[0].select(page)
+        app.run()
+        for key, value in widgets.items():
+            app.radio(key=key).set_value(value)
+        timings = _time(app.run, repeat)
+        if app.exception:
+            raise RuntimeError(f"{page} failed: {app.exception[0].value}")
+        results.append((f"render.{page.lower().replace(' & ', '_').replace(' ', '_')}", timings))
+    st.cache_resource.clear()
+    return results
+
+
+def _summary(name, rows, timings, api_calls=None, throttled=None):
+    ms = [t * 1000 for t in timings]
+    return {
+        "benchmark": name,
+        "rows": rows,
+        "repeat": len(ms),
+        "median_ms": round(statistics.median(ms), 3),
+        "min_ms": round(min(ms), 3),
+        "max_ms": round(max(ms), 3),
+        "api_calls": api_calls,
+        "throttled": throttled,
+    }
+
+
+def run(rows_list=DEFAULT_ROWS, repeat=5, latency=0.0, error_rate=0.0, seed=0, render=True, log=None):
+    results = []
+    for rows in rows_list:
+        bench = _Bench(rows, latency, error_rate, seed)
+        try:
+            for name, fn, setup in _benchmarks(bench):
+                bench.spreadsheet.reset_counters()
+                timings = _time(fn, repeat, setup)
+                results.append(_summary(name, rows, timings, bench.spreadsheet.api_calls, bench.spreadsheet.throttled))
+                if log:
+                    log(results[-1])
+        finally:
+            bench.close()
+        if render:
+            for name, timings in _render_benchmarks(rows, repeat):
+                results.append(_summary(name, rows, timings))
+                if log:
+                    log(results[-1])
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(SCRIPT_PATH),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current, threshold=1.25):
+    """Print median ratios current/baseline; returns the regressed benchmark keys."""
+    before = {(r["benchmark"], r["rows"]): r for r in baseline["results"]}
+    regressed = []
+    print(f"{'benchmark':45} {'rows':>8} {'before ms':>10} {'after ms':>10} {'ratio':>7}")
+    for result in current["results"]:
+        key = (result["benchmark"], result["rows"])
+        if key not in before:
+            continue
+        old, new = before[key]["median_ms"], result["median_ms"]
+        ratio = new / old if old else float("inf")
+        flag = " !" if ratio > threshold else ""
+        if flag:
+            regressed.append(key)
+        print(f"{key[0]:45} {key[1]:>8} {old:>10.2f} {new:>10.2f} {ratio:>6.2f}x{flag}")
+    return regressed
+
+
+def _main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default=",".join(map(str, DEFAULT_ROWS)),
+                        help="comma-separated Daily Updates row counts")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added to every fake API call")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of API calls failing with 429")
+    parser.add_argument("--backoff-ms", type=float, default=50.0,
+                        help="first retry delay while benchmarking (the app uses 1 s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-render", action="store_true", help="skip the Streamlit page renders")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="compare two result files instead of running")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="median ratio counted as a regression by --compare")
+    args = parser.parse_args()
+
+    if args.compare:
+        documents = []
+        for path in args.compare:
+            with open(path, encoding="utf-8") as handle:
+                documents.append(json.load(handle))
+        raise SystemExit(1 if compare(*documents, threshold=args.threshold) else 0)
+
+    sheets.RETRY_BASE_DELAY = args.backoff_ms / 1000
+
+    def log(result):
+        print(f"{result['benchmark']:45} {result['rows']:>8} {result['median_ms']:>10.2f} ms", file=sys.stderr)
+
+    results = run(
+        [int(rows) for rows in args.rows.split(",")], repeat=args.repeat, latency=args.latency_ms / 1000,
+        error_rate=args.error_rate, seed=args.seed, render=not args.no_render, log=log,
+    )
+    document = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "latency_ms": args.latency_ms,
+            "error_rate": args.error_rate,
+            "backoff_ms": args.backoff_ms,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(document, handle, indent=2)
+    else:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,181 @@
+"""Idempotent spreadsheet bootstrapper driven by the declared schema.
+
+The current layout is read with two calls (sheet metadata, then the header
+rows of the tabs that exist), compared with :mod:`tracker.schema`, and every
+difference is applied in a single ``batchUpdate`` request: missing tabs are
+added, short grids widened, header rows rewritten, sample rows written into
+newly created tabs, pending migrations run and the schema version stamped in
+spreadsheet developer metadata. Running it against an up-to-date spreadsheet
+issues no write at all.
+"""
+from tracker.schema import (
+    ROW_ID_COLUMN,
+    SCHEMA_VERSION,
+    SCHEMA_VERSION_KEY,
+    SHEET_HEADERS,
+    SHEET_SIZES,
+    column_letter,
+)
+from tracker.sheets import quote_sheet_name
+from tracker.versioning import new_row_id
+
+# version -> fn(spreadsheet, layout) returning extra batchUpdate requests that
+# bring a spreadsheet from version - 1 to version. Header and column changes
+# are handled by the declarative diff; migrations cover data changes and only
+# see tabs that existed before this run (those listed in ``layout.headers``).
+MIGRATIONS = {}
+
+
+def migration(version):
+    def register(fn):
+        MIGRATIONS[version] = fn
+        return fn
+    return register
+
+
+class SpreadsheetLayout:
+    """What the bootstrapper found: tab ids, grid sizes, headers and version."""
+
+    def __init__(self, sheets, headers, version, version_metadata_id):
+        self.sheets = sheets
+        self.headers = headers
+        self.version = version
+        self.version_metadata_id = version_metadata_id
+
+    def sheet_id(self, sheet_name):
+        return self.sheets[sheet_name]["sheetId"]
+
+
+def read_layout(spreadsheet):
+    """Fetch tab properties, header rows and the stamped schema version."""
+    metadata = spreadsheet.fetch_sheet_metadata(params={
+        "fields": "sheets.properties(sheetId,title,gridProperties),"
+                  "developerMetadata(metadataId,metadataKey,metadataValue)",
+    })
+    sheets = {sheet["properties"]["title"]: sheet["properties"] for sheet in metadata.get("sheets", [])}
+
+    version, version_metadata_id = 0, None
+    for entry in metadata.get("developerMetadata", []):
+        if entry.get("metadataKey") == SCHEMA_VERSION_KEY:
+            version = int(entry.get("metadataValue") or 0)
+            version_metadata_id = entry.get("metadataId")
+
+    existing = [name for name in SHEET_HEADERS if name in sheets]
+    headers = {}
+    if existing:
+        ranges = [f"{quote_sheet_name(name)}!1:1" for name in existing]
+        response = spreadsheet.values_batch_get(ranges)
+        for name, value_range in zip(existing, response.get("valueRanges", [])):
+            values = value_range.get("values", [])
+            headers[name] = list(values[0]) if values else []
+    return SpreadsheetLayout(sheets, headers, version, version_metadata_id)
+
+
+def _row_data(row):
+    return {"values": [{"userEnteredValue": {"stringValue": str(cell)}} for cell in row]}
+
+
+def _write_rows(sheet_id, start_row, rows):
+    return {"updateCells": {
+        "rows": [_row_data(row) for row in rows],
+        "fields": "userEnteredValue",
+        "start": {"sheetId": sheet_id, "rowIndex": start_row, "columnIndex": 0},
+    }}
+
+
+@migration(2)
+def _backfill_row_versions(spreadsheet, layout):
+    """Give every existing data row a Row ID and Version 1."""
+    existing = [name for name in SHEET_HEADERS if name in layout.headers]
+    if not existing:
+        return []
+    ranges = []
+    for name in existing:
+        last_column = column_letter(SHEET_HEADERS[name].index(ROW_ID_COLUMN) + 1)
+        ranges.append(f"{quote_sheet_name(name)}!A2:{last_column}")
+    response = spreadsheet.values_batch_get(ranges)
+
+    requests = []
+    for name, value_range in zip(existing, response.get("valueRanges", [])):
+        id_index = SHEET_HEADERS[name].index(ROW_ID_COLUMN)
+        rows = []
+        for row in value_range.get("values", []):
+            has_data = any(str(cell).strip() for cell in row[:id_index])
+            has_id = len(row) > id_index and str(row[id_index]).strip()
+            # Empty RowData leaves the row untouched
+            rows.append([new_row_id(), "1"] if has_data and not has_id else [])
+        if any(rows):
+            requests.append({"updateCells": {
+                "rows": [_row_data(row) for row in rows],
+                "fields": "userEnteredValue",
+                "start": {"sheetId": layout.sheet_id(name), "rowIndex": 1, "columnIndex": id_index},
+            }})
+    return requests
+
+
+def plan_bootstrap(layout, sample_rows=None, spreadsheet=None):
+    """List the batchUpdate requests that bring ``layout`` up to the schema.
+
+    ``sample_rows`` (sheet name -> rows) are only written into tabs created
+    by this plan, never into existing ones. Migrations that need to look at
+    existing data read it through ``spreadsheet``.
+    """
+    requests = []
+    next_id = max((props["sheetId"] for props in layout.sheets.values()), default=0) + 1
+    for name, headers in SHEET_HEADERS.items():
+        rows, cols = SHEET_SIZES.get(name, (100, len(headers)))
+        cols = max(cols, len(headers))
+        props = layout.sheets.get(name)
+        if props is None:
+            sheet_id = next_id
+            next_id += 1
+            props = {"sheetId": sheet_id, "title": name, "gridProperties": {"rowCount": rows, "columnCount": cols}}
+            layout.sheets[name] = props
+            requests.append({"addSheet": {"properties": props}})
+            new_rows = [headers, *(sample_rows or {}).get(name, [])]
+            requests.append(_write_rows(sheet_id, 0, new_rows))
+            continue
+
+        grid = props.get("gridProperties", {})
+        if grid.get("columnCount", 0) < len(headers):
+            requests.append({"updateSheetProperties": {
+                "properties": {"sheetId": props["sheetId"], "gridProperties": {"columnCount": len(headers)}},
+                "fields": "gridProperties.columnCount",
+            }})
+        if layout.headers.get(name, []) != headers:
+            requests.append(_write_rows(props["sheetId"], 0, [headers]))
+
+    for version in range(layout.version + 1, SCHEMA_VERSION + 1):
+        migrate = MIGRATIONS.get(version)
+        if migrate is not None:
+            requests.extend(migrate(spreadsheet, layout))
+
+    if layout.version != SCHEMA_VERSION:
+        if layout.version_metadata_id is None:
+            requests.append({"createDeveloperMetadata": {"developerMetadata": {
+                "metadataKey": SCHEMA_VERSION_KEY,
+                "metadataValue": str(SCHEMA_VERSION),
+                "location": {"spreadsheet": True},
+                "visibility": "DOCUMENT",
+            }}})
+        else:
+            requests.append({"updateDeveloperMetadata": {
+                "dataFilters": [{"developerMetadataLookup": {"metadataId": layout.version_metadata_id}}],
+                "developerMetadata": {"metadataValue": str(SCHEMA_VERSION)},
+                "fields": "metadataValue",
+            }})
+    return requests
+
+
+def bootstrap_schema(spreadsheet, sample_rows=None):
+    """Bring ``spreadsheet`` up to the declared schema in one batchUpdate.
+
+    Safe to call on every start. Returns the list of requests applied
+    (empty when nothing had to change).
+    """
+    layout = read_layout(spreadsheet)
+    requests = plan_bootstrap(layout, sample_rows, spreadsheet)
+    if requests:
+        spreadsheet.batch_update({"requests": requests})
+    return requests
+
@@ -0,0 +1,492 @@
+"""Bulk CSV / JSON import and export of worksheet rows.
+
+Imports stream the source file record by record, check each one against the
+worksheet's headers and write them ``chunk_rows`` at a time through
+``store.append_rows``, pacing the requests to the store's write quota. After
+every chunk a checkpoint records how many source records are safely stored,
+so an import that fails part way is resumed by running it again on the same
+file. Rows without a "Created At" are stamped with their "Date" where it
+parses, so imported history sorts and archives by when it happened. Rows
+without a Row ID get one derived from the file and record number;
+on resume rows whose id is already stored are skipped, so a chunk that landed
+just before the failure is not written twice.
+
+Exports stream a worksheet out as CSV or JSON Lines, a chunk of rows at a time;
+:func:`export_file` spools them to a temporary file rather than memory.
+
+Run ``python -m tracker.bulk import|export ...`` to do either from the shell.
+"""
+import codecs
+import csv
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from tracker.schema import REQUIRED_COLUMNS, ROW_ID_COLUMN, SHEET_HEADERS, VERSION_COLUMN
+
+FORMATS = ("csv", "json")
+
+# Rows per append_rows request (a few hundred KB of cells)
+DEFAULT_CHUNK_ROWS = 1000
+
+# Rows per chunk of exported text
+EXPORT_CHUNK_ROWS = 5000
+
+# Invalid records kept for the report; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+_READ_SIZE = 1 << 16
+
+# Namespace of the Row IDs given to imported rows that have none
+_ROW_ID_NAMESPACE = uuid.UUID("8f3c1e52-0d7a-4b8e-9a51-6c2f4e7d9b10")
+
+
+class BulkImportError(Exception):
+    """The source file can't be imported at all (unknown sheet, bad header, bad JSON)."""
+
+
+def data_columns(sheet_name):
+    """Columns a user fills in, i.e. the headers before Created At."""
+    headers = SHEET_HEADERS[sheet_name]
+    return headers[:headers.index("Created At")]
+
+
+def detect_format(file_name):
+    """``"csv"`` or ``"json"`` from a file name's extension (JSON Lines counts as json)."""
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".json", ".jsonl", ".ndjson"):
+        return "json"
+    raise BulkImportError(f"Can't tell the format of {file_name!r}; use a .csv, .json or .jsonl file")
+
+
+def check_columns(sheet_name, columns):
+    """Raise :class:`BulkImportError` unless ``columns`` fit the worksheet's headers."""
+    headers = SHEET_HEADERS[sheet_name]
+    duplicated = sorted({column for column in columns if columns.count(column) > 1})
+    unknown = [column for column in columns if column not in headers]
+    missing = [column for column in REQUIRED_COLUMNS[sheet_name] if column not in columns]
+    problems = []
+    if duplicated:
+        problems.append("duplicated column(s) " + ", ".join(map(repr, duplicated)))
+    if unknown:
+        problems.append("unknown column(s) " + ", ".join(map(repr, unknown)))
+    if missing:
+        problems.append("missing required column(s) " + ", ".join(map(repr, missing)))
+    if problems:
+        raise BulkImportError(f"{sheet_name}: " + "; ".join(problems) + f" (expected {', '.join(headers)})")
+
+
+def source_fingerprint(stream, sheet_name):
+    """Hash of the file contents and target sheet; identifies an import for resuming."""
+    digest = hashlib.sha1(sheet_name.encode("utf-8") + b"\0")
+    stream.seek(0)
+    for block in iter(lambda: stream.read(_READ_SIZE), b""):
+        digest.update(block)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+def _csv_records(text, sheet_name):
+    """Yield (record number, dict or error message) from CSV text with a header row."""
+    reader = csv.reader(text)
+    header = next(reader, None)
+    if header is None:
+        raise BulkImportError("The file is empty")
+    header = [column.strip() for column in header]
+    check_columns(sheet_name, header)
+    number = 0
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue
+        number += 1
+        if len(values) > len(header):
+            yield number, f"line {reader.line_num}: {len(values)} fields for {len(header)} columns"
+            continue
+        yield number, dict(zip(header, values))
+
+
+def _json_values(text):
+    """Yield the items of a top-level JSON array, or each line of JSON Lines."""
+    decoder = json.JSONDecoder()
+    buffer, position = "", 0
+    in_array = None
+    done = False
+    while True:
+        if not done and len(buffer) - position < _READ_SIZE:
+            block = text.read(_READ_SIZE)
+            done = not block
+            buffer = buffer[position:] + block
+            position = 0
+        # Skip whitespace and, inside an array, the separating commas
+        while position < len(buffer) and (buffer[position].isspace() or (in_array and buffer[position] == ",")):
+            position += 1
+        if position == len(buffer):
+            if done:
+                if in_array:
+                    raise BulkImportError("The JSON array is not closed")
+                return
+            continue
+        if in_array is None:
+            in_array = buffer[position] == "["
+            position += in_array
+            continue
+        if in_array and buffer[position] == "]":
+            return
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as error:
+            if not done:
+                # The value may continue past this block; read more and retry
+                block = text.read(_READ_SIZE)
+                done = not block
+                buffer = buffer[position:] + block
+                position = 0
+                continue
+            raise BulkImportError(f"Invalid JSON: {error}") from None
+        if end == len(buffer) and not done:
+            # A number cut off at the block boundary decodes short; re-read it whole
+            block = text.read(_READ_SIZE)
+            done = not block
+            buffer = buffer[position:] + block
+            position = 0
+            continue
+        position = end
+        yield value
+
+
+def _json_records(text, sheet_name):
+    """Yield (record number, dict or error message) from a JSON array or JSON Lines."""
+    headers = SHEET_HEADERS[sheet_name]
+    for number, value in enumerate(_json_values(text), start=1):
+        if not isinstance(value, dict):
+            yield number, f"expected an object, got {type(value).__name__}"
+            continue
+        unknown = [key for key in value if key not in headers]
+        if unknown:
+            yield number, "unknown field(s) " + ", ".join(map(repr, unknown))
+            continue
+        nested = [key for key, cell in value.items() if isinstance(cell, (dict, list))]
+        if nested:
+            yield number, "field(s) " + ", ".join(map(repr, nested)) + " must be plain values"
+            continue
+        yield number, {key: "" if cell is None else str(cell) for key, cell in value.items()}
+
+
+def read_records(stream, sheet_name, fmt):
+    """Yield (record number, dict or error message) from a binary ``stream``.
+
+    Records are numbered from 1 in file order, skipping blank CSV lines.
+    Header problems raise :class:`BulkImportError` before anything is yielded.
+    """
+    if sheet_name not in SHEET_HEADERS:
+        raise BulkImportError(f"Unknown worksheet {sheet_name!r}")
+    if fmt not in FORMATS:
+        raise BulkImportError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            yield from _csv_records(text, sheet_name)
+        else:
+            yield from _json_records(text, sheet_name)
+    finally:
+        # Leave the caller's stream open
+        text.detach()
+
+
+def record_to_row(sheet_name, record, row_id, created_at):
+    """Sheet row for a validated ``record``, or an error message.
+
+    Without a "Created At" of its own the row gets its "Date" (if it has one
+    that parses), else ``created_at``.
+    """
+    import pandas as pd
+
+    from tracker.dates import parse_date_text
+
+    record = {column: value.strip() for column, value in record.items()}
+    empty = [column for column in REQUIRED_COLUMNS[sheet_name] if not record.get(column)]
+    if empty:
+        return "empty required field(s) " + ", ".join(map(repr, empty))
+    if not record.get("Created At") and record.get("Date"):
+        day, _ = parse_date_text(record["Date"], pd.Timestamp(created_at))
+        if day is not pd.NaT:
+            created_at = day.isoformat()
+    defaults = {"Created At": created_at, ROW_ID_COLUMN: row_id, VERSION_COLUMN: "1"}
+    return [record.get(column) or defaults.get(column, "") for column in SHEET_HEADERS[sheet_name]]
+
+
+class RateLimiter:
+    """Token bucket allowing ``per_minute`` calls, with bursts of up to ``burst``."""
+
+    def __init__(self, per_minute, burst=5, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 60.0 / per_minute
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until a call is allowed; returns the seconds waited."""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) / self.interval)
+            self._updated = now
+            delay = 0.0
+            if self._tokens < 1:
+                delay = (1 - self._tokens) * self.interval
+                self.sleep(delay)
+                self._tokens = 1.0
+                self._updated = self.clock()
+            self._tokens -= 1
+            return delay
+
+
+class ImportCheckpoint:
+    """Progress of one import, kept in ``<directory>/<fingerprint>.json``."""
+
+    def __init__(self, directory, fingerprint):
+        self.path = os.path.join(directory, f"{fingerprint}.json")
+        self.fingerprint = fingerprint
+        self.records_done = 0
+        self.rows_written = 0
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as handle:
+                state = json.load(handle)
+            if state.get("fingerprint") == fingerprint:
+                self.records_done = state.get("records_done", 0)
+                self.rows_written = state.get("rows_written", 0)
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        state = {
+            "fingerprint": self.fingerprint,
+            "records_done": self.records_done,
+            "rows_written": self.rows_written,
+            "saved_at": datetime.now().isoformat(),
+        }
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(state, handle)
+        os.replace(temp_path, self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def import_rows(store, sheet_name, stream, fmt, checkpoint_dir=None, chunk_rows=DEFAULT_CHUNK_ROWS,
+                requests_per_minute=None, progress=None):
+    """Import the CSV or JSON in binary ``stream`` into ``sheet_name``.
+
+    Rows go out ``chunk_rows`` per ``store.append_rows`` call, no faster than
+    ``requests_per_minute`` (default: the store's ``write_requests_per_minute``).
+    With a ``checkpoint_dir`` an earlier, unfinished import of the same file
+    is resumed. ``progress(rows_written, fraction)`` is called after each
+    chunk, ``fraction`` being the share of the file read so far.
+
+    Returns a dict: ``rows_written`` (including rows written by the run being
+    resumed), ``invalid`` (count), ``errors`` (up to ``MAX_REPORTED_ERRORS``
+    ``(record number, message)`` pairs), ``skipped_existing`` and
+    ``resumed_from`` (records already done when this run started). Rows whose
+    Row ID is already stored are skipped, so importing an export is a no-op.
+    """
+    fingerprint = source_fingerprint(stream, sheet_name)
+    stream.seek(0, os.SEEK_END)
+    total_bytes = stream.tell() or 1
+    stream.seek(0)
+
+    checkpoint = ImportCheckpoint(checkpoint_dir, fingerprint) if checkpoint_dir else None
+    resumed_from = checkpoint.records_done if checkpoint else 0
+    stored_ids = None
+
+    def already_stored(row_id):
+        # Read once, and only when needed: on resume (a chunk may have been
+        # stored just before the last run stopped) or for rows that bring
+        # their own Row ID, as a re-imported export does
+        nonlocal stored_ids
+        if stored_ids is None:
+            stored_ids = set(store.poll_frames([sheet_name])[sheet_name][ROW_ID_COLUMN].astype(str))
+        return row_id in stored_ids
+
+    if requests_per_minute is None:
+        requests_per_minute = store.write_requests_per_minute
+    limiter = RateLimiter(requests_per_minute) if requests_per_minute else None
+    result = {
+        "rows_written": checkpoint.rows_written if checkpoint else 0,
+        "invalid": 0,
+        "errors": [],
+        "skipped_existing": 0,
+        "resumed_from": resumed_from,
+    }
+    created_at = datetime.now().isoformat()
+    row_id_index = SHEET_HEADERS[sheet_name].index(ROW_ID_COLUMN)
+    chunk = []
+
+    def flush(records_done):
+        if chunk:
+            if limiter is not None:
+                limiter.wait()
+            store.append_rows(sheet_name, chunk)
+            result["rows_written"] += len(chunk)
+            chunk.clear()
+        if checkpoint is not None:
+            checkpoint.records_done = records_done
+            checkpoint.rows_written = result["rows_written"]
+            checkpoint.save()
+        if progress is not None:
+            progress(result["rows_written"], min(1.0, stream.tell() / total_bytes))
+
+    number = 0
+    for number, record in read_records(stream, sheet_name, fmt):
+        if number <= resumed_from:
+            continue
+        generated_id = uuid.uuid5(_ROW_ID_NAMESPACE, f"{fingerprint}:{number}").hex
+        row = record_to_row(sheet_name, record, generated_id, created_at) if isinstance(record, dict) else record
+        if isinstance(row, str):
+            result["invalid"] += 1
+            if len(result["errors"]) < MAX_REPORTED_ERRORS:
+                result["errors"].append((number, row))
+            continue
+        row_id = row[row_id_index]
+        if (resumed_from or row_id != generated_id) and already_stored(row_id):
+            result["skipped_existing"] += 1
+            continue
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            flush(number)
+    flush(number)
+    if checkpoint is not None:
+        checkpoint.clear()
+    return result
+
+
+def iter_export(frame, sheet_name, fmt, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Yield ``frame`` (a loaded worksheet) as CSV or JSON Lines text, in chunks."""
+    from tracker.sheets import frame_to_rows
+
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    headers = SHEET_HEADERS[sheet_name]
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(headers)
+    for start in range(0, len(frame), chunk_rows):
+        rows = frame_to_rows(frame.iloc[start:start + chunk_rows], headers)
+        if fmt == "csv":
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        else:
+            yield "".join(json.dumps(dict(zip(headers, row)), ensure_ascii=False) + "\n" for row in rows)
+    if fmt == "csv" and buffer.tell():
+        # Header only: the worksheet has no rows
+        yield buffer.getvalue()
+
+
+def export_rows(frame, sheet_name, fmt, out, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write ``frame`` to the binary stream ``out``; returns the number of rows."""
+    encoder = codecs.getincrementalencoder("utf-8")()
+    for text in iter_export(frame, sheet_name, fmt, chunk_rows):
+        out.write(encoder.encode(text))
+    return len(frame)
+
+
+def export_file(frame, sheet_name, fmt, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write ``frame`` to an anonymous temporary file and return it, rewound.
+
+    Only one chunk of text is in memory at a time; the file is deleted once
+    closed.
+    """
+    out = tempfile.TemporaryFile(buffering=0)
+    export_rows(frame, sheet_name, fmt, out, chunk_rows)
+    out.seek(0)
+    return out
+
+
+def _main():
+    import argparse
+    import sys
+
+    from tracker.schema import SHEET_NAMES
+    from tracker.storage import SqliteStore
+
+    parser = argparse.ArgumentParser(prog="python -m tracker.bulk", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", default="sprint_tracker.db", help="SQLite database to use (default: %(default)s)")
+    parser.add_argument("--credentials", help="service account JSON; import into / export from Google Sheets")
+    parser.add_argument("--spreadsheet", default="Sprint Tracker Data", help="spreadsheet name with --credentials")
+    commands = parser.add_subparsers(dest="command", required=True)
+    importer = commands.add_parser("import", help="append rows from a CSV or JSON file")
+    importer.add_argument("sheet", choices=SHEET_NAMES)
+    importer.add_argument("path")
+    importer.add_argument("--format", choices=FORMATS, help="default: from the file extension")
+    importer.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    importer.add_argument("--requests-per-minute", type=float, help="default: the backend's write quota")
+    importer.add_argument("--checkpoint-dir", default=".sprint_tracker_imports",
+                          help="where resume checkpoints are kept (default: %(default)s)")
+    exporter = commands.add_parser("export", help="write a worksheet to a CSV or JSON Lines file")
+    exporter.add_argument("sheet", choices=SHEET_NAMES)
+    exporter.add_argument("path")
+    exporter.add_argument("--format", choices=FORMATS, help="default: from the file extension")
+    args = parser.parse_args()
+
+    if args.credentials:
+        import gspread
+
+        from tracker.storage import GoogleSheetsStore
+
+        spreadsheet = gspread.service_account(filename=args.credentials).open(args.spreadsheet)
+        store = GoogleSheetsStore(spreadsheet, os.path.join(tempfile.mkdtemp(), "pending.jsonl"))
+    else:
+        store = SqliteStore(args.db)
+
+    try:
+        fmt = args.format or detect_format(args.path)
+        if args.command == "export":
+            with open(args.path, "wb") as out:
+                count = export_rows(store.read_frame(args.sheet), args.sheet, fmt, out)
+            print(f"Exported {count} rows of {args.sheet} to {args.path}")
+            return
+
+        started = time.perf_counter()
+
+        def report(rows_written, fraction):
+            print(f"\r{fraction:6.1%} read · {rows_written} rows written", end="", file=sys.stderr, flush=True)
+
+        with open(args.path, "rb") as stream:
+            result = import_rows(
+                store, args.sheet, stream, fmt, checkpoint_dir=args.checkpoint_dir, chunk_rows=args.chunk_rows,
+                requests_per_minute=args.requests_per_minute, progress=report,
+            )
+        print(file=sys.stderr)
+    except BulkImportError as error:
+        parser.exit(1, f"error: {error}\n")
+    except Exception as error:
+        parser.exit(1, f"\nerror: {error}\nRun the same command again to resume the import.\n")
+
+    if result["resumed_from"]:
+        print(f"Resumed after record {result['resumed_from']}")
+    print(f"Imported {result['rows_written']} rows into {args.sheet} in {time.perf_counter() - started:.1f}s"
+          + (f", skipped {result['skipped_existing']} already stored" if result["skipped_existing"] else ""))
+    if result["invalid"]:
+        print(f"{result['invalid']} invalid record(s):")
+        for number, message in result["errors"]:
+            print(f"  record {number}: {message}")
+
+
+if __name__ == "__main__":
+    _main()
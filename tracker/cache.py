@@ -0,0 +1,73 @@
+"""Per-worksheet read cache with a TTL and a bounded number of entries."""
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class SheetReadCache:
+    """TTL + LRU cache for worksheet reads, keyed by worksheet name.
+
+    Entries expire ``ttl_seconds`` after they were stored. When more than
+    ``max_entries`` are held, the least recently used entry is evicted.
+    Hit, miss and eviction counters are kept for the diagnostics sidebar.
+    """
+
+    def __init__(self, ttl_seconds=60.0, max_entries=16, clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Return the cached value for ``key`` or ``default`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                self.evictions += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """Drop ``key`` so the next read goes back to the sheet."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and self._clock() < entry[0]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
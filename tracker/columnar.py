@@ -0,0 +1,207 @@
+"""Compact columnar copies of the worksheets, persisted as Arrow IPC files.
+
+Low-cardinality columns (project, developer, status) are held as pandas
+categoricals, so each distinct value is stored once, and the remaining text
+columns use pandas' default string dtype (Arrow-backed from pandas 3 on,
+one buffer per column instead of a Python object per cell). Snapshots are written
+uncompressed in the Arrow IPC file format and reloaded through a memory map.
+Fixed-width columns (category codes, datetimes) then come straight from the
+page cache, and a restart does not need any API calls before the first
+render.
+
+Run ``python -m tracker.columnar [rows]`` to compare memory and load time
+with the list-of-dicts path.
+"""
+import json
+import os
+import re
+import time
+
+import pandas as pd
+
+from tracker.schema import SCHEMA_VERSION
+
+# Columns converted to categoricals wherever a worksheet has them
+CATEGORICAL_COLUMNS = ["Project", "Developer", "Current Status", "Status"]
+
+_MANIFEST = "manifest.json"
+
+
+def compact_frame(frame):
+    """Return ``frame`` with categorical and text columns in compact dtypes."""
+    columns = {}
+    for column in frame.columns:
+        dtype = frame[column].dtype
+        if column in CATEGORICAL_COLUMNS:
+            if not isinstance(dtype, pd.CategoricalDtype):
+                columns[column] = frame[column].astype("category")
+        elif dtype == object:
+            columns[column] = frame[column].astype("str")
+    return frame.assign(**columns) if columns else frame
+
+
+def append_compact(head, tail):
+    """``head`` with ``tail`` appended, both compact; categoricals stay categoricals."""
+    tail = compact_frame(tail)
+    head_columns, tail_columns = {}, {}
+    for column in CATEGORICAL_COLUMNS:
+        if column in head.columns and column in tail.columns:
+            # Concatenating categoricals only keeps the dtype when the categories match
+            categories = head[column].cat.categories.union(tail[column].cat.categories, sort=False)
+            head_columns[column] = head[column].cat.set_categories(categories)
+            tail_columns[column] = tail[column].cat.set_categories(categories)
+    return pd.concat([head.assign(**head_columns), tail.assign(**tail_columns)], ignore_index=True)
+
+
+def _file_name(sheet_name):
+    return re.sub(r"[^a-z0-9]+", "-", sheet_name.lower()).strip("-") + ".arrow"
+
+
+def write_snapshot(directory, frames, version=None):
+    """Persist ``frames`` (sheet name -> DataFrame) as Arrow IPC files.
+
+    Each file is written to a temporary name and renamed into place, and the
+    manifest last, so a reader never sees a half-written snapshot.
+    """
+    import pyarrow as pa
+
+    os.makedirs(directory, exist_ok=True)
+    sheets = {}
+    for sheet_name, frame in frames.items():
+        table = pa.Table.from_pandas(compact_frame(frame), preserve_index=False)
+        file_name = _file_name(sheet_name)
+        tmp_path = os.path.join(directory, file_name + ".tmp")
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, os.path.join(directory, file_name))
+        sheets[sheet_name] = file_name
+
+    manifest = {"schema_version": SCHEMA_VERSION, "version": version, "written_at": time.time(), "sheets": sheets}
+    tmp_path = os.path.join(directory, _MANIFEST + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle)
+    os.replace(tmp_path, os.path.join(directory, _MANIFEST))
+
+
+def _read_manifest(directory):
+    try:
+        with open(os.path.join(directory, _MANIFEST), encoding="utf-8") as handle:
+            manifest = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("schema_version") == SCHEMA_VERSION else None
+
+
+def read_snapshot(directory):
+    """Load a snapshot written by :func:`write_snapshot`.
+
+    Returns ``(frames, manifest)``, or ``None`` when there is no snapshot
+    or it was written for another schema version.
+    """
+    import pyarrow as pa
+
+    manifest = _read_manifest(directory)
+    if manifest is None:
+        return None
+
+    frames = {}
+    try:
+        for sheet_name, file_name in manifest["sheets"].items():
+            with pa.memory_map(os.path.join(directory, file_name)) as source:
+                table = pa.ipc.open_file(source).read_all()
+            frames[sheet_name] = compact_frame(table.to_pandas())
+    except (OSError, KeyError, pa.ArrowInvalid):
+        return None
+    return frames, manifest
+
+
+def read_latest_snapshot(root, prefix=""):
+    """Load the most recently written snapshot among the directories in ``root`` named ``prefix*``.
+
+    Returns ``(frames, manifest)`` like :func:`read_snapshot`, or ``None``.
+    """
+    try:
+        names = sorted(name for name in os.listdir(root) if name.startswith(prefix))
+    except OSError:
+        return None
+    manifests = [(_read_manifest(os.path.join(root, name)), name) for name in names]
+    manifests = [(manifest["written_at"], name) for manifest, name in manifests if manifest is not None]
+    for _, name in sorted(manifests, reverse=True):
+        loaded = read_snapshot(os.path.join(root, name))
+        if loaded is not None:
+            return loaded
+    return None
+
+
+def _main():
+    import gc
+    import sys
+    import tempfile
+    import tracemalloc
+
+    import numpy as np
+    import pyarrow as pa
+
+    from tracker.schema import SHEET_HEADERS
+    from tracker.sheets import rows_to_frame
+    from tracker.versioning import versioned_row
+
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = np.random.default_rng(0)
+    words = np.array("api keys blocker client slack bot flask deploy review tests docs schema auth".split())
+    projects = [f"Project {i}" for i in range(12)]
+    developers = [f"Developer {i}" for i in range(25)]
+    start = pd.Timestamp("2025-01-01")
+    header = SHEET_HEADERS["Daily Updates"]
+    rows = [
+        versioned_row("Daily Updates", [
+            (start + pd.Timedelta(days=int(i * 365 / row_count))).strftime("%Y-%m-%d"),
+            projects[i % len(projects)],
+            developers[i % len(developers)],
+            " ".join(rng.choice(words, 8)),
+            " ".join(rng.choice(words, 8)),
+            "None" if i % 5 else "Need API keys from client",
+            " ".join(rng.choice(words, 4)),
+            (start + pd.Timedelta(minutes=i)).isoformat(),
+        ])
+        for i in range(row_count)
+    ]
+    # What the API hands back; each path parses it afresh, as a load would
+    payload = json.dumps([header, *rows])
+    del rows
+
+    def measure(build):
+        """(result, seconds, bytes retained on the Python heap and in Arrow's pool)."""
+        gc.collect()
+        started = time.perf_counter()
+        result = build()
+        elapsed = time.perf_counter() - started
+        del result
+        gc.collect()
+        arrow_before = pa.total_allocated_bytes()
+        tracemalloc.start()
+        result = build()
+        size = tracemalloc.get_traced_memory()[0] + pa.total_allocated_bytes() - arrow_before
+        tracemalloc.stop()
+        return result, elapsed, size
+
+    def load_records():
+        values = json.loads(payload)
+        return [dict(zip(values[0], row)) for row in values[1:]]
+
+    records, records_s, records_bytes = measure(load_records)
+    del records
+    frame, frame_s, frame_bytes = measure(lambda: compact_frame(rows_to_frame("Daily Updates", json.loads(payload))))
+    directory = tempfile.mkdtemp(prefix="sprint-tracker-columnar-")
+    write_snapshot(directory, {"Daily Updates": frame})
+    del frame
+    loaded, mmap_s, mmap_bytes = measure(lambda: read_snapshot(directory))
+
+    print(f"rows: {row_count}")
+    print(f"list of dicts (get_all_records):  {records_s * 1000:8.0f} ms {records_bytes / 2**20:8.1f} MiB retained")
+    print(f"compact frame from sheet values:  {frame_s * 1000:8.0f} ms {frame_bytes / 2**20:8.1f} MiB retained")
+    print(f"compact frame from Arrow (mmap):  {mmap_s * 1000:8.0f} ms {mmap_bytes / 2**20:8.1f} MiB retained")
+
+
+if __name__ == "__main__":
+    _main()
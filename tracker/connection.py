@@ -0,0 +1,49 @@
+"""Background connection setup so the first paint never waits on OAuth."""
+import threading
+import time
+
+
+class BackgroundConnection:
+    """Runs ``connect(*args, notes)`` once on a daemon thread.
+
+    ``connect`` returns the connected object (or None on failure) and may add
+    ``(level, message)`` pairs to ``notes`` for the UI to show afterwards.
+    Callers poll :attr:`done` instead of blocking on the network.
+    """
+
+    def __init__(self, connect, *args):
+        self.notes = []
+        self.result = None
+        self.error = None
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(connect, args), name="sheets-connect", daemon=True)
+        self._thread.start()
+
+    def _run(self, connect, args):
+        try:
+            self.result = connect(*args, self.notes)
+        except Exception as error:
+            self.error = error
+            self.notes.append(("error", f"Could not connect to Google Sheets: {error}"))
+        finally:
+            self.finished_at = time.perf_counter()
+            self._done.set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def connected(self):
+        return self.done and self.result is not None
+
+    def wait(self, timeout=None):
+        """Block up to ``timeout`` seconds; True once the attempt has finished."""
+        return self._done.wait(timeout)
+
+    @property
+    def elapsed(self):
+        """Seconds spent connecting so far (or in total, once done)."""
+        return (self.finished_at or time.perf_counter()) - self.started_at
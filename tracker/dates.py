@@ -0,0 +1,197 @@
+"""Parsing of the free-text date columns into typed datetime columns.
+
+"Start Date", "Target End Date" and the Sprint "Dates" range ("Aug 27–Sept 6")
+are typed by hand and usually carry no year. Each distinct (text, reference
+month) pair is parsed once and remembered; a column is then filled with a
+vectorized gather over those results. The year is inferred as the one that
+puts the date closest to the row's "Created At" (or today).
+"""
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Derived datetime columns added to each worksheet frame: source column -> (start, end)
+DERIVED_DATE_COLUMNS = {
+    "Project Overview": {"Start Date": ("start_at", None), "Target End Date": ("target_end_at", None)},
+    "Daily Updates": {"Date": ("date_at", None)},
+    "Sprint Goals": {"Dates": ("start_at", "end_at")},
+}
+
+_MONTHS = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
+    "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
+    "aug": 8, "august": 8, "sep": 9, "sept": 9, "september": 9, "oct": 10, "october": 10,
+    "nov": 11, "november": 11, "dec": 12, "december": 12,
+}
+
+_ISO_RE = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})(?:[T ].*)?$")
+_NUMERIC_RE = re.compile(r"^(\d{1,2})/(\d{1,2})(?:/(\d{2}|\d{4}))?$")
+_MONTH_DAY_RE = re.compile(r"^([A-Za-z]+)\.?\s*(\d{1,2})(?:st|nd|rd|th)?(?:,?\s+(\d{4}))?$")
+_DAY_MONTH_RE = re.compile(r"^(\d{1,2})(?:st|nd|rd|th)?\s+([A-Za-z]+)\.?(?:,?\s+(\d{4}))?$")
+_DAY_ONLY_RE = re.compile(r"^(\d{1,2})(?:st|nd|rd|th)?$")
+_RANGE_SEPARATOR_RE = re.compile(r"\s*(?:–|—|\bto\b|\buntil\b)\s*|\s+-\s+", re.IGNORECASE)
+
+_MEMO_LIMIT = 100_000
+_memo = {}
+_memo_lock = threading.Lock()
+
+
+def _parse_parts(text):
+    """``text`` -> ``(year or None, month or None, day)``, or None if unrecognized."""
+    text = text.strip()
+    match = _ISO_RE.match(text)
+    if match:
+        return int(match.group(1)), int(match.group(2)), int(match.group(3))
+    match = _NUMERIC_RE.match(text)
+    if match:
+        year = match.group(3)
+        if year and len(year) == 2:
+            year = "20" + year
+        return (int(year) if year else None), int(match.group(1)), int(match.group(2))
+    match = _MONTH_DAY_RE.match(text)
+    if match and match.group(1).lower() in _MONTHS:
+        return (int(match.group(3)) if match.group(3) else None), _MONTHS[match.group(1).lower()], int(match.group(2))
+    match = _DAY_MONTH_RE.match(text)
+    if match and match.group(2).lower() in _MONTHS:
+        return (int(match.group(3)) if match.group(3) else None), _MONTHS[match.group(2).lower()], int(match.group(1))
+    match = _DAY_ONLY_RE.match(text)
+    if match:
+        return None, None, int(match.group(1))
+    return None
+
+
+def _timestamp(year, month, day):
+    try:
+        return pd.Timestamp(year=year, month=month, day=day)
+    except ValueError:
+        return pd.NaT
+
+
+def _closest_year(month, day, reference):
+    """The year that puts month/day nearest to ``reference``."""
+    candidates = [_timestamp(year, month, day) for year in (reference.year - 1, reference.year, reference.year + 1)]
+    candidates = [candidate for candidate in candidates if candidate is not pd.NaT]
+    if not candidates:
+        return pd.NaT
+    return min(candidates, key=lambda candidate: abs(candidate - reference))
+
+
+def _split_range(text):
+    parts = _RANGE_SEPARATOR_RE.split(text, maxsplit=1)
+    if len(parts) == 1 and not _ISO_RE.match(text) and "-" in text:
+        # "Aug 27-30" / "Aug 27-Sept 6": a bare hyphen only separates non-ISO dates
+        parts = text.split("-", 1)
+    return [part.strip() for part in parts]
+
+
+def parse_date_text(text, reference, as_range=False):
+    """Parse one free-text date (or range) relative to ``reference``.
+
+    Returns ``(start, end)`` Timestamps; ``end`` is NaT unless ``as_range``
+    and the text holds two dates. Unrecognized text gives ``(NaT, NaT)``.
+    """
+    text = (text or "").strip()
+    if not text:
+        return pd.NaT, pd.NaT
+    parts = _split_range(text) if as_range else [text]
+
+    start_parts = _parse_parts(parts[0])
+    if start_parts is None or start_parts[1] is None:
+        return pd.NaT, pd.NaT
+    year, month, day = start_parts
+    start = _timestamp(year, month, day) if year else _closest_year(month, day, reference)
+    if not as_range or len(parts) == 1 or start is pd.NaT:
+        return start, pd.NaT
+
+    end_parts = _parse_parts(parts[1])
+    if end_parts is None:
+        return start, pd.NaT
+    end_year, end_month, end_day = end_parts
+    end_month = end_month or start.month
+    end = _timestamp(end_year or start.year, end_month, end_day)
+    if not end_year and end is not pd.NaT and end < start:
+        # "Dec 28–Jan 3" crosses into the next year
+        end = _timestamp(start.year + 1, end_month, end_day)
+    return start, end
+
+
+def _parse_memoized(text, reference_month, as_range):
+    key = (text, reference_month, as_range)
+    with _memo_lock:
+        result = _memo.get(key)
+    if result is None:
+        year, month = reference_month
+        reference = pd.Timestamp(year=year, month=month, day=15)
+        result = parse_date_text(text, reference, as_range=as_range)
+        with _memo_lock:
+            if len(_memo) >= _MEMO_LIMIT:
+                _memo.clear()
+            _memo[key] = result
+    return result
+
+
+def normalize_date_column(texts, references=None, as_range=False, today=None):
+    """Parse a column of free-text dates into datetime Series.
+
+    ``references`` (datetimes, e.g. "Created At") anchor year inference per
+    row; missing references fall back to ``today``. Returns ``(start, end)``.
+    """
+    today = pd.Timestamp(today) if today is not None else pd.Timestamp.now()
+    texts = texts.fillna("").astype(str).str.strip()
+    if len(texts) == 0:
+        empty = pd.Series([], index=texts.index, dtype="datetime64[ns]")
+        return empty, empty.copy()
+    default_month = today.year * 12 + today.month - 1
+    if references is None:
+        reference_months = np.full(len(texts), default_month, dtype=np.int64)
+    else:
+        references = pd.to_datetime(references, errors="coerce")
+        reference_months = (references.dt.year * 12 + references.dt.month - 1).fillna(default_month).to_numpy(dtype=np.int64)
+
+    # Parse each distinct (text, month) once, then gather back to rows
+    text_codes, text_uniques = pd.factorize(texts)
+    month_codes, month_uniques = pd.factorize(reference_months)
+    pair_codes, pairs = pd.factorize(text_codes.astype(np.int64) * len(month_uniques) + month_codes)
+    starts = np.empty(len(pairs), dtype="datetime64[ns]")
+    ends = np.empty(len(pairs), dtype="datetime64[ns]")
+    for index, pair in enumerate(pairs):
+        text_code, month_code = divmod(int(pair), len(month_uniques))
+        year, month = divmod(int(month_uniques[month_code]), 12)
+        start, end = _parse_memoized(text_uniques[text_code], (year, month + 1), as_range)
+        starts[index] = np.datetime64("NaT") if start is pd.NaT else start.to_datetime64()
+        ends[index] = np.datetime64("NaT") if end is pd.NaT else end.to_datetime64()
+    return pd.Series(starts[pair_codes], index=texts.index), pd.Series(ends[pair_codes], index=texts.index)
+
+
+def derived_columns(sheet_name):
+    """Names of the typed columns :func:`add_date_columns` adds for ``sheet_name``."""
+    return [
+        column
+        for pair in DERIVED_DATE_COLUMNS.get(sheet_name, {}).values()
+        for column in pair
+        if column
+    ]
+
+
+def add_date_columns(sheet_name, frame):
+    """Add the typed ``*_at`` columns for ``sheet_name`` to ``frame`` in place."""
+    references = frame["Created At"] if "Created At" in frame.columns else None
+    for source, (start_column, end_column) in DERIVED_DATE_COLUMNS.get(sheet_name, {}).items():
+        if source not in frame.columns:
+            continue
+        start, end = normalize_date_column(frame[source], references, as_range=end_column is not None)
+        frame[start_column] = start
+        if end_column:
+            frame[end_column] = end
+    return frame
+
+
+def date_column(frame, sheet_name, source, end=False):
+    """The typed column derived from ``source``, computing it if ``frame`` lacks it."""
+    start_column, end_column = DERIVED_DATE_COLUMNS[sheet_name][source]
+    column = end_column if end else start_column
+    if column not in frame.columns:
+        frame = add_date_columns(sheet_name, frame.copy())
+    return frame[column]
@@ -0,0 +1,314 @@
+"""In-memory stand-in for the parts of gspread the tracker uses.
+
+Lets the app and its data layer run offline (``SPRINT_TRACKER_BACKEND=memory``)
+without a service account. For benchmarks the spreadsheet can add latency to
+every API call and fail a fraction of them with 429 quota errors, and it
+counts the calls made.
+"""
+import random
+import re
+import threading
+import time
+import uuid
+
+from tracker.schema import column_letter
+
+_CELL_RE = re.compile(r"^([A-Z]*)(\d*)$")
+
+
+def _column_index(letters):
+    index = 0
+    for char in letters:
+        index = index * 26 + ord(char) - ord("A") + 1
+    return index
+
+
+def _parse_cell(cell):
+    match = _CELL_RE.match(cell)
+    if not match:
+        raise ValueError(f"Unsupported cell reference: {cell!r}")
+    letters, digits = match.groups()
+    return (int(digits) if digits else None, _column_index(letters) if letters else None)
+
+
+def split_range(a1):
+    """Split ``'Sheet'!A1:H`` into ``(sheet_title, "A1:H")``; either may be None."""
+    if "!" in a1:
+        title, cells = a1.rsplit("!", 1)
+    elif ":" in a1 or (_CELL_RE.match(a1) and any(ch.isdigit() for ch in a1)):
+        title, cells = None, a1
+    else:
+        title, cells = a1, None
+    if title and title.startswith("'") and title.endswith("'"):
+        title = title[1:-1].replace("''", "'")
+    return title, cells
+
+
+def parse_cells(cells):
+    """``"A2:H"`` -> 1-based ``(row1, col1, row2, col2)`` with None for open ends."""
+    start, _, end = cells.partition(":")
+    row1, col1 = _parse_cell(start)
+    row2, col2 = _parse_cell(end) if end else (row1, col1)
+    return row1 or 1, col1 or 1, row2, col2
+
+
+class _QuotaExceededResponse:
+    """Enough of a ``requests.Response`` for ``gspread.exceptions.APIError``."""
+
+    status_code = 429
+    text = "Quota exceeded for quota metric 'Read requests' (simulated)"
+
+    def json(self):
+        return {"error": {"code": 429, "message": self.text, "status": "RESOURCE_EXHAUSTED"}}
+
+
+class InMemoryWorksheet:
+    def __init__(self, spreadsheet, title, rows=1000, cols=26, sheet_id=0):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.id = sheet_id
+        self.row_count = rows
+        self.col_count = cols
+        self._values = []
+        self._lock = threading.Lock()
+
+    def _trimmed(self):
+        """Values as the API returns them: no trailing empty cells or rows."""
+        rows = []
+        for row in self._values:
+            row = list(row)
+            while row and row[-1] in ("", None):
+                row.pop()
+            rows.append(row)
+        while rows and not rows[-1]:
+            rows.pop()
+        return rows
+
+    def get_values(self, cells=None):
+        self.spreadsheet._api_call()
+        return self._read(cells)
+
+    def _read(self, cells=None):
+        with self._lock:
+            values = self._trimmed()
+        if cells is None:
+            return values
+        row1, col1, row2, col2 = parse_cells(cells)
+        selected = values[row1 - 1:row2]
+        result = [row[col1 - 1:col2] for row in selected]
+        while result and not result[-1]:
+            result.pop()
+        return result
+
+    get = get_values
+
+    def get_all_values(self):
+        return self.get_values()
+
+    def get_all_records(self):
+        values = self.get_values()
+        if not values:
+            return []
+        header = values[0]
+        return [
+            dict(zip(header, list(row) + [""] * (len(header) - len(row))))
+            for row in values[1:]
+        ]
+
+    def update(self, range_name, values, **kwargs):
+        self.spreadsheet._api_call()
+        self._write(range_name, values)
+
+    def _write(self, range_name, values):
+        row1, col1, _, _ = parse_cells(range_name)
+        with self._lock:
+            for offset, row in enumerate(values):
+                index = row1 - 1 + offset
+                while len(self._values) <= index:
+                    self._values.append([])
+                target = self._values[index]
+                needed = col1 - 1 + len(row)
+                if len(target) < needed:
+                    target.extend([""] * (needed - len(target)))
+                target[col1 - 1:needed] = [str(cell) for cell in row]
+            self.row_count = max(self.row_count, len(self._values))
+
+    def batch_update(self, data, **kwargs):
+        self.spreadsheet._api_call()
+        for value_range in data:
+            self._write(value_range["range"], value_range["values"])
+
+    def append_rows(self, values, value_input_option="RAW", **kwargs):
+        self.spreadsheet._api_call()
+        with self._lock:
+            # Like the API, append after the last row that has any content
+            self._values = [list(row) for row in self._trimmed()]
+            self._values.extend([str(cell) for cell in row] for row in values)
+            self.row_count = max(self.row_count, len(self._values))
+
+    def append_row(self, values, value_input_option="RAW", **kwargs):
+        self.append_rows([values], value_input_option=value_input_option)
+
+
+class InMemorySpreadsheet:
+    """Spreadsheet held in memory.
+
+    ``latency`` seconds are slept on every API call and ``error_rate`` of the
+    calls raise a 429 ``gspread.exceptions.APIError`` instead (``seed`` makes
+    that reproducible). ``api_calls`` and ``throttled`` count what happened.
+    """
+
+    def __init__(self, title="Sprint Tracker Data", latency=0.0, error_rate=0.0, seed=None):
+        self.id = uuid.uuid4().hex
+        self.title = title
+        self.url = f"memory://{self.id}"
+        self.latency = latency
+        self.error_rate = error_rate
+        self.api_calls = 0
+        self.throttled = 0
+        self._random = random.Random(seed)
+        self._worksheets = []
+        self._developer_metadata = []
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def _api_call(self):
+        with self._stats_lock:
+            self.api_calls += 1
+            throttle = self.error_rate and self._random.random() < self.error_rate
+            if throttle:
+                self.throttled += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if throttle:
+            import gspread
+
+            raise gspread.exceptions.APIError(_QuotaExceededResponse())
+
+    def reset_counters(self):
+        with self._stats_lock:
+            self.api_calls = 0
+            self.throttled = 0
+
+    def worksheets(self):
+        self._api_call()
+        with self._lock:
+            return list(self._worksheets)
+
+    def _find(self, title):
+        with self._lock:
+            for worksheet in self._worksheets:
+                if worksheet.title == title:
+                    return worksheet
+        import gspread
+
+        raise gspread.WorksheetNotFound(title)
+
+    def worksheet(self, title):
+        self._api_call()
+        return self._find(title)
+
+    def add_worksheet(self, title, rows, cols, index=None):
+        self._api_call()
+        with self._lock:
+            if any(ws.title == title for ws in self._worksheets):
+                raise ValueError(f"A sheet with the name {title!r} already exists")
+            sheet_id = max((ws.id for ws in self._worksheets), default=-1) + 1
+            worksheet = InMemoryWorksheet(self, title, rows, cols, sheet_id)
+            self._worksheets.append(worksheet)
+            return worksheet
+
+    def values_batch_get(self, ranges, params=None):
+        self._api_call()
+        value_ranges = []
+        for a1 in ranges:
+            title, cells = split_range(a1)
+            values = self._find(title)._read(cells)
+            value_range = {"range": a1, "majorDimension": "ROWS"}
+            if values:
+                value_range["values"] = values
+            value_ranges.append(value_range)
+        return {"spreadsheetId": self.id, "valueRanges": value_ranges}
+
+    def fetch_sheet_metadata(self, params=None):
+        self._api_call()
+        with self._lock:
+            return {
+                "spreadsheetId": self.id,
+                "sheets": [
+                    {"properties": {
+                        "sheetId": ws.id,
+                        "title": ws.title,
+                        "gridProperties": {"rowCount": ws.row_count, "columnCount": ws.col_count},
+                    }}
+                    for ws in self._worksheets
+                ],
+                "developerMetadata": [dict(entry) for entry in self._developer_metadata],
+            }
+
+    def _by_id(self, sheet_id):
+        for worksheet in self._worksheets:
+            if worksheet.id == sheet_id:
+                return worksheet
+        raise ValueError(f"No sheet with id {sheet_id}")
+
+    def batch_update(self, body):
+        """Apply the subset of batchUpdate requests the tracker sends."""
+        self._api_call()
+        replies = []
+        for request in body.get("requests", []):
+            (kind, payload), = request.items()
+            if kind == "addSheet":
+                props = payload["properties"]
+                grid = props.get("gridProperties", {})
+                with self._lock:
+                    if any(ws.title == props["title"] for ws in self._worksheets):
+                        raise ValueError(f"A sheet with the name {props['title']!r} already exists")
+                    sheet_id = props.get("sheetId", max((ws.id for ws in self._worksheets), default=-1) + 1)
+                    self._worksheets.append(InMemoryWorksheet(
+                        self, props["title"], grid.get("rowCount", 1000), grid.get("columnCount", 26), sheet_id))
+                replies.append({"addSheet": {"properties": {"sheetId": sheet_id, "title": props["title"]}}})
+                continue
+            if kind == "updateCells":
+                start = payload["start"]
+                worksheet = self._by_id(start["sheetId"])
+                rows = [
+                    [cell.get("userEnteredValue", {}).get("stringValue", "") for cell in row.get("values", [])]
+                    for row in payload.get("rows", [])
+                ]
+                first_row = start.get("rowIndex", 0) + 1
+                first_col = start.get("columnIndex", 0) + 1
+                for offset, row in enumerate(rows):
+                    worksheet._write(f"{column_letter(first_col)}{first_row + offset}", [row])
+            elif kind == "updateSheetProperties":
+                props = payload["properties"]
+                worksheet = self._by_id(props["sheetId"])
+                grid = props.get("gridProperties", {})
+                worksheet.row_count = grid.get("rowCount", worksheet.row_count)
+                worksheet.col_count = grid.get("columnCount", worksheet.col_count)
+            elif kind == "deleteDimension":
+                span = payload["range"]
+                if span["dimension"] != "ROWS":
+                    raise NotImplementedError("Only row deletion is supported in memory")
+                worksheet = self._by_id(span["sheetId"])
+                with worksheet._lock:
+                    del worksheet._values[span["startIndex"]:span["endIndex"]]
+                    worksheet.row_count -= span["endIndex"] - span["startIndex"]
+            elif kind == "createDeveloperMetadata":
+                with self._lock:
+                    entry = dict(payload["developerMetadata"])
+                    entry["metadataId"] = len(self._developer_metadata) + 1
+                    self._developer_metadata.append(entry)
+            elif kind == "updateDeveloperMetadata":
+                ids = {f["developerMetadataLookup"]["metadataId"] for f in payload["dataFilters"]}
+                with self._lock:
+                    for entry in self._developer_metadata:
+                        if entry["metadataId"] in ids:
+                            entry.update(payload["developerMetadata"])
+            else:
+                raise NotImplementedError(f"batch_update request {kind!r} is not supported in memory")
+            replies.append({})
+        return {"spreadsheetId": self.id, "replies": replies}
+
+    def share(self, *args, **kwargs):
+        pass
@@ -0,0 +1,308 @@
+"""Process-wide metrics: API call accounting, per-rerun phase timing, export.
+
+* :data:`REGISTRY` holds counters and summaries and renders them in the
+  Prometheus text format; :func:`serve_metrics` exposes that on ``/metrics``.
+* :class:`InstrumentedSpreadsheet` wraps a gspread (or in-memory)
+  spreadsheet and counts calls, errors and JSON payload bytes per worksheet.
+* :class:`RerunTimer` splits one Streamlit rerun into named phases and logs
+  the result as one JSON line on the ``sprint_tracker.metrics`` logger.
+
+Only the standard library is used so the module is cheap to import before
+the first paint.
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger("sprint_tracker.metrics")
+
+_HELP = {
+    "sprint_tracker_api_requests_total": ("counter", "Google Sheets API requests by method."),
+    "sprint_tracker_api_calls_total": ("counter", "API requests touching each worksheet."),
+    "sprint_tracker_api_bytes_total": ("counter", "JSON payload bytes sent and received per worksheet."),
+    "sprint_tracker_api_errors_total": ("counter", "Failed API requests by method and HTTP status."),
+    "sprint_tracker_api_retries_total": ("counter", "Retries after quota (429) and server errors."),
+    "sprint_tracker_phase_seconds": ("summary", "Wall time of each rerun phase, excluding nested phases."),
+    "sprint_tracker_reruns_total": ("counter", "Script reruns by page."),
+}
+
+# Label used for calls that are not about one worksheet (metadata, batchUpdate)
+SPREADSHEET_LABEL = "(spreadsheet)"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsRegistry:
+    """Labelled counters and count/sum summaries."""
+
+    def __init__(self):
+        self._counters = {}
+        self._summaries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, amount=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            count, total = self._summaries.get(key, (0, 0.0))
+            self._summaries[key] = (count + 1, total + value)
+
+    def value(self, name, **labels):
+        with self._lock:
+            return self._counters.get(self._key(name, labels), 0)
+
+    def counters(self, name):
+        """List of (labels dict, value) for one counter."""
+        with self._lock:
+            return [(dict(labels), value) for (metric, labels), value in self._counters.items() if metric == name]
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+    def render_prometheus(self):
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            summaries = sorted(self._summaries.items())
+        lines, seen = [], set()
+
+        def header(name):
+            if name not in seen:
+                seen.add(name)
+                kind, text = _HELP.get(name, ("untyped", name))
+                lines.append(f"# HELP {name} {text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        def labels_text(labels):
+            return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}" if labels else ""
+
+        for (name, labels), value in counters:
+            header(name)
+            lines.append(f"{name}{labels_text(labels)} {value}")
+        for (name, labels), (count, total) in summaries:
+            header(name)
+            lines.append(f"{name}_count{labels_text(labels)} {count}")
+            lines.append(f"{name}_sum{labels_text(labels)} {total:.6f}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def record_retry(fn, error):
+    """Count one retry of ``fn`` (called by ``tracker.sheets.call_with_backoff``)."""
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    REGISTRY.inc("sprint_tracker_api_retries_total", method=getattr(fn, "__name__", "call"), status=str(status))
+
+
+def _payload_size(value):
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _range_title(a1):
+    """Worksheet title of an A1 range such as ``'Daily Updates'!A2:J``."""
+    title = a1.rsplit("!", 1)[0] if "!" in a1 else a1
+    if title.startswith("'") and title.endswith("'"):
+        title = title[1:-1].replace("''", "'")
+    return title or SPREADSHEET_LABEL
+
+
+class _Instrumented:
+    """Shared accounting for the spreadsheet and worksheet proxies."""
+
+    def __init__(self, target, registry):
+        self._target = target
+        self._registry = registry
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+    def _call(self, method, worksheets, fn, sent=None):
+        registry = self._registry
+        registry.inc("sprint_tracker_api_requests_total", method=method)
+        for worksheet in worksheets:
+            registry.inc("sprint_tracker_api_calls_total", worksheet=worksheet, method=method)
+        if sent is not None:
+            registry.inc("sprint_tracker_api_bytes_total", _payload_size(sent), worksheet=worksheets[0], direction="sent")
+        try:
+            return fn()
+        except Exception as error:
+            status = getattr(getattr(error, "response", None), "status_code", None)
+            registry.inc("sprint_tracker_api_errors_total", method=method, status=str(status))
+            raise
+
+    def _received(self, worksheet, value):
+        self._registry.inc("sprint_tracker_api_bytes_total", _payload_size(value), worksheet=worksheet, direction="received")
+        return value
+
+
+class InstrumentedWorksheet(_Instrumented):
+    """Worksheet proxy counting the calls the tracker makes on worksheets."""
+
+    def append_rows(self, values, *args, **kwargs):
+        return self._call("append_rows", [self._target.title],
+                          lambda: self._target.append_rows(values, *args, **kwargs), sent=values)
+
+    def batch_update(self, data, *args, **kwargs):
+        return self._call("batch_update", [self._target.title],
+                          lambda: self._target.batch_update(data, *args, **kwargs), sent=data)
+
+    def update(self, *args, **kwargs):
+        return self._call("update", [self._target.title],
+                          lambda: self._target.update(*args, **kwargs), sent=[args, kwargs.get("values")])
+
+    def get_values(self, *args, **kwargs):
+        values = self._call("get_values", [self._target.title], lambda: self._target.get_values(*args, **kwargs))
+        return self._received(self._target.title, values)
+
+    def get_all_values(self, *args, **kwargs):
+        values = self._call("get_all_values", [self._target.title],
+                            lambda: self._target.get_all_values(*args, **kwargs))
+        return self._received(self._target.title, values)
+
+    def get_all_records(self, *args, **kwargs):
+        records = self._call("get_all_records", [self._target.title],
+                             lambda: self._target.get_all_records(*args, **kwargs))
+        return self._received(self._target.title, records)
+
+
+class InstrumentedSpreadsheet(_Instrumented):
+    """Spreadsheet proxy; worksheets it hands out are instrumented too."""
+
+    def __init__(self, spreadsheet, registry=REGISTRY):
+        super().__init__(spreadsheet, registry)
+
+    def _wrap(self, worksheet):
+        return InstrumentedWorksheet(worksheet, self._registry)
+
+    def worksheets(self, *args, **kwargs):
+        worksheets = self._call("worksheets", [SPREADSHEET_LABEL], lambda: self._target.worksheets(*args, **kwargs))
+        return [self._wrap(worksheet) for worksheet in worksheets]
+
+    def worksheet(self, title):
+        return self._wrap(self._call("worksheet", [title], lambda: self._target.worksheet(title)))
+
+    def add_worksheet(self, *args, **kwargs):
+        return self._wrap(self._call("add_worksheet", [SPREADSHEET_LABEL],
+                                     lambda: self._target.add_worksheet(*args, **kwargs)))
+
+    def values_batch_get(self, ranges, params=None):
+        titles = [_range_title(a1) for a1 in ranges]
+        response = self._call("values_batch_get", list(dict.fromkeys(titles)),
+                              lambda: self._target.values_batch_get(ranges, params=params))
+        for title, value_range in zip(titles, response.get("valueRanges", [])):
+            self._received(title, value_range.get("values", []))
+        return response
+
+    def fetch_sheet_metadata(self, params=None):
+        metadata = self._call("fetch_sheet_metadata", [SPREADSHEET_LABEL],
+                              lambda: self._target.fetch_sheet_metadata(params=params))
+        return self._received(SPREADSHEET_LABEL, metadata)
+
+    def batch_update(self, body):
+        return self._call("batch_update", [SPREADSHEET_LABEL], lambda: self._target.batch_update(body), sent=body)
+
+
+class RerunTimer:
+    """Exclusive wall time per named phase of one script run.
+
+    Phases may nest; a parent's time excludes its children, so the phases of
+    a finished run add up to its total.
+    """
+
+    def __init__(self, started_at=None, registry=REGISTRY):
+        self.started_at = time.perf_counter() if started_at is None else started_at
+        self.phases = OrderedDict()
+        self._registry = registry
+        self._stack = []
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def start(self, name):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def stop(self):
+        name, started, children = self._stack.pop()
+        elapsed = time.perf_counter() - started
+        self.add(name, elapsed - children)
+        if self._stack:
+            self._stack[-1][2] += elapsed
+        return elapsed
+
+    def phase(self, name):
+        timer = self
+
+        class _Phase:
+            def __enter__(self):
+                timer.start(name)
+
+            def __exit__(self, *exc_info):
+                timer.stop()
+
+        return _Phase()
+
+    def finish(self, **fields):
+        """Close open phases, record them in the registry and log one JSON line."""
+        while self._stack:
+            self.stop()
+        total = time.perf_counter() - self.started_at
+        other = total - sum(self.phases.values())
+        if other > 0:
+            self.add("other", other)
+        for name, seconds in self.phases.items():
+            self._registry.observe("sprint_tracker_phase_seconds", seconds, phase=name)
+        if "page" in fields:
+            self._registry.inc("sprint_tracker_reruns_total", page=fields["page"])
+        record = {
+            "event": "rerun",
+            **fields,
+            "total_ms": round(total * 1000, 2),
+            "phases_ms": {name: round(seconds * 1000, 2) for name, seconds in self.phases.items()},
+        }
+        logger.info(json.dumps(record))
+        return record
+
+
+def serve_metrics(port, registry=REGISTRY, host="0.0.0.0"):
+    """Serve ``registry`` as Prometheus text on ``http://host:port/metrics``.
+
+    Runs on a daemon thread; returns the server (call ``shutdown()`` to stop).
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug("metrics endpoint: " + format, *args)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-endpoint", daemon=True).start()
+    return server
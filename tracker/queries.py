@@ -0,0 +1,72 @@
+"""Vectorized filtering and pagination over worksheet DataFrames."""
+import numpy as np
+import pandas as pd
+
+from tracker.dates import date_column
+
+# Blocker cells that mean "no blocker"
+NO_BLOCKER_VALUES = {"", "none", "n/a", "na", "-"}
+
+
+def parse_update_dates(frame):
+    """Typed ``Date`` of Daily Updates rows (unparseable -> NaT)."""
+    if "Date" not in frame.columns:
+        return pd.Series(pd.NaT, index=frame.index, dtype="datetime64[ns]")
+    return date_column(frame, "Daily Updates", "Date")
+
+
+def blocker_mask(frame):
+    """Boolean Series: rows whose Blockers cell describes an actual blocker."""
+    blockers = frame["Blockers"].fillna("").astype(str).str.strip().str.lower()
+    return ~blockers.isin(NO_BLOCKER_VALUES)
+
+
+def filter_updates(frame, project=None, developer=None, date_from=None, date_to=None,
+                   blockers_only=False, dates=None):
+    """Filter Daily Updates rows with one combined boolean mask.
+
+    ``dates`` may be passed in when the parsed Date column is already at hand.
+    Returns ``(filtered_frame, filtered_dates)``.
+    """
+    if dates is None:
+        dates = parse_update_dates(frame)
+    mask = np.ones(len(frame), dtype=bool)
+    if project:
+        mask &= (frame["Project"] == project).to_numpy()
+    if developer:
+        mask &= (frame["Developer"] == developer).to_numpy()
+    if date_from is not None:
+        mask &= (dates >= pd.Timestamp(date_from)).to_numpy()
+    if date_to is not None:
+        mask &= (dates <= pd.Timestamp(date_to)).to_numpy()
+    if blockers_only:
+        mask &= blocker_mask(frame).to_numpy()
+    return frame[mask], dates[mask]
+
+
+def latest_page(frame, dates, page, page_size):
+    """Rows ``page * page_size`` .. for the newest-first ordering, without a full sort.
+
+    Only the ``(page + 1) * page_size`` newest rows are selected (an
+    ``argpartition``) and then ordered, so cost stays close to linear in the
+    number of rows instead of ``n log n``. Rows on the same date are ordered
+    newest-appended first; rows with an unparseable date come last.
+    """
+    total = len(frame)
+    k = min(total, (page + 1) * page_size)
+    if k == 0:
+        return frame.iloc[0:0]
+    day_values = dates.to_numpy(dtype="datetime64[D]")
+    valid = ~np.isnat(day_values)
+    days = day_values.astype(np.int64)
+    if valid.any():
+        floor = days[valid].min() - 1
+        days = np.where(valid, days, floor)
+        days = days - floor
+    else:
+        days = np.zeros(total, dtype=np.int64)
+    # Unique key per row: date first, then position, so page boundaries are stable
+    keys = days * total + np.arange(total, dtype=np.int64)
+    top = np.argpartition(keys, total - k)[total - k:] if k < total else np.arange(total)
+    top = top[np.argsort(keys[top])[::-1]]
+    return frame.iloc[top[page * page_size:k]]
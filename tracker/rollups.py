@@ -0,0 +1,242 @@
+"""Per-project rollups kept up to date as rows arrive.
+
+For each project :class:`ProjectRollups` holds its last update date, the
+blockers reported on that day, the Row IDs of its updates in the trailing
+week and its sprint goals. Daily Updates is append-only, so a sync only
+folds in the rows past the last one it saw. Folding is idempotent (maxima
+and sets), so when rows above that point moved, e.g. after archiving, the
+whole frame is simply folded again without double counting. Sprint Goals
+rows are diffed by content hash, as in :mod:`tracker.search`.
+
+:meth:`ProjectRollups.table` then costs O(projects), however long the log.
+"""
+import threading
+import weakref
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from tracker.dates import date_column
+from tracker.queries import blocker_mask, parse_update_dates
+from tracker.schema import ROW_ID_COLUMN
+
+# Days counted by the "Updates (7d)" rollup, today included
+RECENT_DAYS = 7
+
+ROLLUP_COLUMNS = ["Last Update", "Open Blockers", "Active Sprint", "Updates (7d)"]
+
+_GOAL_COLUMNS = ["Project", "Sprint", "Dates", "Status"]
+
+
+def _row_keys(frame, fallback):
+    """Row IDs, with ``fallback`` (a Series) for rows without one."""
+    if ROW_ID_COLUMN not in frame.columns:
+        return fallback.astype(str).to_numpy()
+    keys = frame[ROW_ID_COLUMN].astype(str)
+    return keys.where(keys != "", fallback.astype(str)).to_numpy()
+
+
+def _update_keys(frame):
+    # Without a Row ID, a developer posts one update per Created At
+    return _row_keys(frame, frame["Developer"].astype(str) + "|" + frame["Created At"].astype(str))
+
+
+def _blocker_key(text):
+    return " ".join(str(text).lower().split())
+
+
+class _ProjectState:
+    __slots__ = ("last_update", "blockers", "recent", "goals", "active")
+
+    def __init__(self):
+        self.last_update = None
+        # Normalized blockers reported on last_update
+        self.blockers = set()
+        # day -> Row IDs of updates on that day, for days still in the window
+        self.recent = {}
+        # goal row key -> (sprint, start, end, completed)
+        self.goals = {}
+        # (day, active sprint) memo, dropped when the goals change
+        self.active = None
+
+
+class ProjectRollups:
+    """Materialized per-project rollups over Daily Updates and Sprint Goals."""
+
+    def __init__(self):
+        self._projects = {}
+        self._lock = threading.Lock()
+        # Position just past the last Daily Updates row folded in, and its key
+        self._cursor = 0
+        self._cursor_key = None
+        self._synced_updates = None
+        self._synced_goals = None
+        # goal row key -> (project, content hash)
+        self._goal_hashes = {}
+        # Version of the data last synced (e.g. a snapshot version), set by callers
+        self.synced_version = None
+        self.last_sync = {"updates": 0, "goals": 0}
+
+    def _state(self, project):
+        state = self._projects.get(project)
+        if state is None:
+            state = self._projects[project] = _ProjectState()
+        return state
+
+    def sync(self, frames, version=None, today=None):
+        """Fold in what changed in ``frames`` (sheet name -> DataFrame) since the last sync.
+
+        Returns counts of Daily Updates rows folded and Sprint Goals rows changed.
+        """
+        today = pd.Timestamp(today or date.today())
+        counts = {"updates": 0, "goals": 0}
+        with self._lock:
+            updates = frames.get("Daily Updates")
+            if updates is not None and (self._synced_updates is None or self._synced_updates() is not updates):
+                counts["updates"] = self._sync_updates(updates, today)
+                self._synced_updates = weakref.ref(updates)
+            goals = frames.get("Sprint Goals")
+            if goals is not None and (self._synced_goals is None or self._synced_goals() is not goals):
+                counts["goals"] = self._sync_goals(goals)
+                self._synced_goals = weakref.ref(goals)
+            self.synced_version = version
+        self.last_sync = counts
+        return counts
+
+    def _sync_updates(self, frame, today):
+        start = self._cursor
+        if start and (start > len(frame) or _update_keys(frame.iloc[start - 1:start])[0] != self._cursor_key):
+            # Rows above the cursor moved (archived, reloaded); fold everything again
+            start = 0
+        tail = frame.iloc[start:]
+        keys = _update_keys(tail)
+        self.fold_updates(tail, today, keys)
+        self._cursor = len(frame)
+        if len(keys):
+            self._cursor_key = keys[-1]
+        elif not len(frame):
+            self._cursor_key = None
+        return len(tail)
+
+    def fold_updates(self, frame, today=None, keys=None):
+        """Fold Daily Updates rows into the rollups; folding a row twice changes nothing."""
+        if not len(frame):
+            return
+        today = pd.Timestamp(today or date.today())
+        keys = _update_keys(frame) if keys is None else keys
+        dates = parse_update_dates(frame)
+        projects = frame["Project"].astype(str)
+        valid = (dates.notna() & (projects != "")).to_numpy()
+        if not valid.any():
+            return
+        frame, dates, projects, keys = frame[valid], dates[valid], projects[valid], keys[valid]
+
+        for project, day in dates.groupby(projects, sort=False).max().items():
+            state = self._state(project)
+            if state.last_update is None or day > state.last_update:
+                state.last_update = day
+                state.blockers = set()
+
+        last_days = projects.map({project: state.last_update for project, state in self._projects.items()})
+        on_last_day = ((dates == last_days) & blocker_mask(frame)).to_numpy()
+        for project, text in zip(projects[on_last_day], frame["Blockers"][on_last_day]):
+            self._projects[project].blockers.add(_blocker_key(text))
+
+        recent = (dates >= today - pd.Timedelta(days=RECENT_DAYS - 1)).to_numpy()
+        for project, day, key in zip(projects[recent], dates[recent], keys[recent]):
+            self._projects[project].recent.setdefault(day, set()).add(key)
+
+    def _sync_goals(self, frame):
+        keys = _row_keys(frame, "#" + pd.Series(np.arange(len(frame)), index=frame.index).astype(str))
+        columns = [column for column in _GOAL_COLUMNS if column in frame.columns]
+        hashes = pd.util.hash_pandas_object(frame[columns], index=False, categorize=False).to_numpy()
+        current = dict(zip(keys, zip(frame["Project"].astype(str), hashes.tolist(), range(len(frame)))))
+
+        changed = [key for key, (project, row_hash, _) in current.items()
+                   if self._goal_hashes.get(key, (None, None))[1] != row_hash]
+        removed = [key for key in self._goal_hashes if key not in current]
+        for key in [*removed, *changed]:
+            previous = self._goal_hashes.pop(key, None)
+            if previous is not None and previous[0] in self._projects:
+                state = self._projects[previous[0]]
+                state.goals.pop(key, None)
+                state.active = None
+
+        if changed:
+            positions = [current[key][2] for key in changed]
+            rows = frame.iloc[positions]
+            starts = date_column(rows, "Sprint Goals", "Dates")
+            ends = date_column(rows, "Sprint Goals", "Dates", end=True)
+            completed = rows["Status"].astype(str).str.strip().str.lower().eq("completed")
+            for key, sprint, start, end, done in zip(changed, rows["Sprint"].astype(str), starts, ends, completed):
+                project, row_hash, _ = current[key]
+                state = self._state(project)
+                state.goals[key] = (sprint, start, end, bool(done))
+                state.active = None
+                self._goal_hashes[key] = (project, row_hash)
+        return len(changed) + len(removed)
+
+    @staticmethod
+    def _active_sprint(state, today):
+        """The sprint whose dates contain ``today``, else the latest open one already started."""
+        if state.active is not None and state.active[0] == today:
+            return state.active[1]
+        running, open_ = [], []
+        for sprint, start, end, done in state.goals.values():
+            if pd.isna(start) or start > today:
+                continue
+            if not pd.isna(end) and end >= today:
+                running.append((start, sprint))
+            elif not done:
+                open_.append((start, sprint))
+        candidates = running or open_
+        active = max(candidates)[1] if candidates else None
+        state.active = (today, active)
+        return active
+
+    def table(self, projects, today=None):
+        """Rollup columns for ``projects`` (in that order) as a DataFrame."""
+        today = pd.Timestamp(today or date.today())
+        window_start = today - pd.Timedelta(days=RECENT_DAYS - 1)
+        rows = []
+        with self._lock:
+            for project in projects:
+                state = self._projects.get(str(project))
+                if state is None:
+                    rows.append((pd.NaT, 0, None, 0))
+                    continue
+                for day in [day for day in state.recent if day < window_start]:
+                    del state.recent[day]
+                rows.append((
+                    state.last_update if state.last_update is not None else pd.NaT,
+                    len(state.blockers),
+                    self._active_sprint(state, today),
+                    sum(len(keys) for day, keys in state.recent.items() if day <= today),
+                ))
+        table = pd.DataFrame(rows, columns=ROLLUP_COLUMNS)
+        table["Last Update"] = pd.to_datetime(table["Last Update"])
+        return table
+
+    def backfill(self, store, projects, sheet_name="Daily Updates", today=None):
+        """Fold in archived months, newest first, until every one of ``projects`` has a last update.
+
+        The newest archive is always folded, since the trailing week may
+        reach into it. Archives are read straight from ``store`` and not
+        kept. Returns the number of archives read.
+        """
+        periods = list(reversed(store.archived_periods(sheet_name)))
+        read = 0
+        for period in periods:
+            with self._lock:
+                missing = any(
+                    self._projects.get(str(project)) is None or self._projects[str(project)].last_update is None
+                    for project in projects
+                )
+                if read and not missing:
+                    break
+            frame = store.read_archive(sheet_name, period)
+            with self._lock:
+                self.fold_updates(frame, today)
+            read += 1
+        return read
@@ -0,0 +1,54 @@
+"""Worksheet names and column headers used by the Sprint Tracker spreadsheet."""
+
+# Every row carries a stable id and a version for compare-and-swap updates
+ROW_ID_COLUMN = "Row ID"
+VERSION_COLUMN = "Version"
+
+SHEET_HEADERS = {
+    "Project Overview": ["Project", "Goal", "Start Date", "Target End Date", "Current Status", "Owner(s)", "Notes", "Created At", ROW_ID_COLUMN, VERSION_COLUMN],
+    "Daily Updates": ["Date", "Project", "Developer", "Yesterday's Progress", "Today's Focus", "Blockers", "Next Milestone", "Created At", ROW_ID_COLUMN, VERSION_COLUMN],
+    "Sprint Goals": ["Sprint", "Dates", "Project", "Goal", "Success Criteria", "Owner(s)", "Status", "Created At", ROW_ID_COLUMN, VERSION_COLUMN],
+    "Results & Retrospective": ["Sprint", "What Went Well", "What Could Be Better", "Key Results", "Created At", ROW_ID_COLUMN, VERSION_COLUMN],
+}
+
+SHEET_NAMES = list(SHEET_HEADERS)
+
+# Columns a row must fill in, as enforced by the entry forms
+REQUIRED_COLUMNS = {
+    "Project Overview": ["Project", "Goal"],
+    "Daily Updates": ["Project", "Developer"],
+    "Sprint Goals": ["Sprint", "Project", "Goal"],
+    "Results & Retrospective": ["Sprint"],
+}
+
+# Grid size (rows, columns) for tabs created by the bootstrapper
+SHEET_SIZES = {
+    "Project Overview": (100, 10),
+    "Daily Updates": (500, 10),
+    "Sprint Goals": (100, 10),
+    "Results & Retrospective": (100, 7),
+}
+
+# Bump when the declared layout changes and register a migration in
+# tracker.bootstrap.MIGRATIONS for anything headers alone can't express
+SCHEMA_VERSION = 2
+SCHEMA_VERSION_KEY = "sprint_tracker_schema_version"
+
+# Worksheets that are only ever appended to; these are synced incrementally
+APPEND_ONLY_SHEETS = {"Daily Updates"}
+
+# Worksheets whose closed months are moved into per-month archives
+ARCHIVED_SHEETS = {"Daily Updates"}
+
+# Columns parsed into datetimes when a worksheet is loaded
+DATETIME_COLUMNS = ["Created At"]
+
+
+def column_letter(index):
+    """1-based column index to its A1 letter (1 -> A, 27 -> AA)."""
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
@@ -0,0 +1,218 @@
+"""Full-text search over the free-text worksheets, backed by SQLite FTS5.
+
+Each searchable row becomes one FTS document: a short title (date, project,
+developer or sprint) and a body made of the row's text columns. Documents
+are keyed by Row ID and a per-row content hash, so :meth:`SearchIndex.sync`
+only re-indexes rows that were added, changed or removed since the last
+sync. Archived months (see :mod:`tracker.archive`) are indexed once each by
+:meth:`SearchIndex.sync_archive` and searched as rows of their worksheet.
+A reported blocker is indexed as "Blocker: <text>", so "blocker" finds the
+updates that have one. Results are ranked with BM25, title matches weighing
+more; when no row has every word, rows with any of them are ranked instead.
+"""
+import re
+import sqlite3
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from tracker.archive import archive_name
+from tracker.queries import NO_BLOCKER_VALUES
+from tracker.schema import ROW_ID_COLUMN
+
+# sheet -> (title columns, body columns)
+SEARCH_COLUMNS = {
+    "Daily Updates": (
+        ["Date", "Project", "Developer"],
+        ["Yesterday's Progress", "Today's Focus", "Blockers", "Next Milestone"],
+    ),
+    "Sprint Goals": (
+        ["Sprint", "Project"],
+        ["Goal", "Success Criteria", "Owner(s)", "Status"],
+    ),
+    "Results & Retrospective": (
+        ["Sprint"],
+        ["What Went Well", "What Could Be Better", "Key Results"],
+    ),
+}
+
+# Indexed in front of a Blockers cell that reports a blocker
+BLOCKER_LABEL = "Blocker: "
+
+# BM25 weights for the (sheet, row_id, title, body) columns
+_BM25_WEIGHTS = (0.0, 0.0, 2.0, 1.0)
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_query(text, match_all=True):
+    """User text -> FTS5 query: every word (or any, without ``match_all``) must match, the last one as a prefix."""
+    tokens = _TOKEN.findall(text.lower())
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return (" " if match_all else " OR ").join(terms)
+
+
+def _cells(frame, column):
+    cells = frame[column].fillna("").astype(str).str.strip()
+    if column == "Blockers":
+        # "None" and the like say there is no blocker; leave them out of the index
+        reported = ~cells.str.lower().isin(NO_BLOCKER_VALUES)
+        cells = cells.where(~reported, BLOCKER_LABEL + cells).where(reported, "")
+    return cells
+
+
+def _joined(frame, columns, separator):
+    parts = [_cells(frame, column) for column in columns if column in frame.columns]
+    if not parts:
+        return pd.Series("", index=frame.index)
+    joined = parts[0]
+    for part in parts[1:]:
+        joined = joined.str.cat(part, sep=separator)
+    # Drop separators left around empty cells
+    return joined.str.replace(f"^(?:{re.escape(separator)})+|(?:{re.escape(separator)})+$", "", regex=True)
+
+
+def _row_keys(frame):
+    """Row IDs, with rows lacking one (or sharing one) keyed by position."""
+    positions = pd.Series(np.arange(len(frame)), index=frame.index).astype(str)
+    if ROW_ID_COLUMN not in frame.columns:
+        return ("#" + positions).to_numpy()
+    keys = frame[ROW_ID_COLUMN].fillna("").astype(str)
+    fallback = (keys == "") | keys.duplicated(keep="first")
+    return keys.where(~fallback, "#" + positions).to_numpy()
+
+
+class SearchIndex:
+    """Incrementally maintained FTS5 index of the searchable worksheets."""
+
+    def __init__(self, path=":memory:"):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5("
+            "sheet UNINDEXED, row_id UNINDEXED, title, body, tokenize='porter unicode61')"
+        )
+        # sheet or archive -> DataFrame indexed by row key with the FTS rowid and content hash
+        self._indexed = {}
+        # sheet or archive -> weak reference to the frame last synced, to skip unchanged objects
+        self._synced_frames = {}
+        self._next_docid = 1
+        # Version of the data last synced (e.g. a snapshot version), set by callers
+        self.synced_version = None
+        self.last_sync = {"added": 0, "updated": 0, "removed": 0}
+
+    def sync(self, frames, version=None):
+        """Bring the index in line with ``frames`` (sheet name -> DataFrame).
+
+        Only rows whose content hash changed are re-indexed. Returns counts of
+        added, updated and removed documents.
+        """
+        counts = {"added": 0, "updated": 0, "removed": 0}
+        with self._lock, self._conn:
+            for sheet_name, (title_columns, body_columns) in SEARCH_COLUMNS.items():
+                frame = frames.get(sheet_name)
+                synced = self._synced_frames.get(sheet_name)
+                if frame is None or (synced is not None and synced() is frame):
+                    continue
+                for key, value in self._sync_sheet(sheet_name, frame, title_columns, body_columns).items():
+                    counts[key] += value
+                self._synced_frames[sheet_name] = weakref.ref(frame)
+            self.synced_version = version
+        self.last_sync = counts
+        return counts
+
+    def sync_archive(self, sheet_name, period, frame):
+        """Index the archive of ``sheet_name`` for ``period``; a no-op once ``frame`` is indexed.
+
+        Returns counts as :meth:`sync` does.
+        """
+        title_columns, body_columns = SEARCH_COLUMNS[sheet_name]
+        partition = archive_name(sheet_name, period)
+        with self._lock, self._conn:
+            synced = self._synced_frames.get(partition)
+            if synced is not None and synced() is frame:
+                return {"added": 0, "updated": 0, "removed": 0}
+            counts = self._sync_sheet(sheet_name, frame, title_columns, body_columns, partition=partition)
+            self._synced_frames[partition] = weakref.ref(frame)
+        return counts
+
+    def _sync_sheet(self, sheet_name, frame, title_columns, body_columns, partition=None):
+        partition = partition or sheet_name
+        columns = [column for column in title_columns + body_columns if column in frame.columns]
+        keys = _row_keys(frame)
+        hashes = pd.util.hash_pandas_object(frame[columns], index=False, categorize=False).to_numpy().view(np.int64)
+        current = pd.DataFrame({"hash": hashes, "position": np.arange(len(frame))}, index=keys)
+        previous = self._indexed.get(partition)
+        if previous is None:
+            previous = pd.DataFrame({"docid": pd.Series(dtype=np.int64), "hash": pd.Series(dtype=np.int64)})
+
+        removed = previous.index.difference(current.index)
+        known_hash = previous["hash"].reindex(current.index)
+        changed = current[known_hash.isna().to_numpy() | (known_hash.to_numpy() != current["hash"].to_numpy())]
+        replaced = previous["docid"].reindex(changed.index).dropna().astype(np.int64)
+
+        stale = np.concatenate([previous.loc[removed, "docid"].to_numpy(), replaced.to_numpy()])
+        if len(stale):
+            self._conn.executemany("DELETE FROM documents WHERE rowid = ?", ((int(docid),) for docid in stale))
+
+        docids = np.arange(self._next_docid, self._next_docid + len(changed), dtype=np.int64)
+        self._next_docid += len(changed)
+        if len(changed):
+            rows = frame.iloc[changed["position"].to_numpy()]
+            titles = _joined(rows, title_columns, " · ").to_numpy()
+            bodies = _joined(rows, body_columns, "\n").to_numpy()
+            self._conn.executemany(
+                "INSERT INTO documents (rowid, sheet, row_id, title, body) VALUES (?, ?, ?, ?, ?)",
+                zip(docids.tolist(), [sheet_name] * len(changed), changed.index.tolist(), titles, bodies),
+            )
+
+        kept = previous.drop(index=removed.union(changed.index), errors="ignore")
+        added = pd.DataFrame({"docid": docids, "hash": changed["hash"].to_numpy()}, index=changed.index)
+        self._indexed[partition] = pd.concat([kept, added])
+        return {"added": len(changed) - len(replaced), "updated": len(replaced), "removed": len(removed)}
+
+    def search(self, text, sheets=None, limit=50):
+        """Ranked matches for ``text`` as a list of dicts (best first).
+
+        Each result has ``sheet``, ``row_id``, ``title``, ``snippet`` (matches
+        wrapped in ``**``) and ``score`` (lower is better, as BM25 in FTS5).
+        ``sheets=None`` searches every worksheet; an empty list searches none.
+        Rows matching every word are returned if there are any, otherwise
+        rows matching some of them.
+        """
+        if sheets is not None and not sheets:
+            return []
+        results = self._search(fts_query(text), sheets, limit)
+        if not results and len(_TOKEN.findall(text)) > 1:
+            results = self._search(fts_query(text, match_all=False), sheets, limit)
+        return results
+
+    def _search(self, query, sheets, limit):
+        if query is None:
+            return []
+        sql = (
+            "SELECT sheet, row_id, title, snippet(documents, 3, '**', '**', '…', 16), "
+            f"bm25(documents, {', '.join(map(str, _BM25_WEIGHTS))}) AS score "
+            "FROM documents WHERE documents MATCH ?"
+        )
+        params = [query]
+        if sheets is not None:
+            sql += f" AND sheet IN ({', '.join('?' * len(sheets))})"
+            params.extend(sheets)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {"sheet": sheet, "row_id": row_id, "title": title, "snippet": snippet, "score": score}
+            for sheet, row_id, title, snippet, score in rows
+        ]
+
+    def document_count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
@@ -0,0 +1,285 @@
+"""Batched Google Sheets reads and memoized worksheet handles."""
+import hashlib
+import itertools
+import json
+import random
+import threading
+import time
+import weakref
+
+import pandas as pd
+
+from tracker.dates import add_date_columns, derived_columns
+from tracker.metrics import record_retry
+from tracker.schema import APPEND_ONLY_SHEETS, DATETIME_COLUMNS, SHEET_HEADERS, column_letter
+
+
+# HTTP statuses worth retrying: quota exhaustion and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# First backoff delay in seconds, doubled on each retry
+RETRY_BASE_DELAY = 1.0
+
+
+def is_retryable(error):
+    """True for Sheets API errors that should be retried with backoff."""
+    import gspread
+
+    if not isinstance(error, gspread.exceptions.APIError):
+        return False
+    return getattr(error.response, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+def call_with_backoff(fn, *args, retries=5, base_delay=None, max_delay=32.0, sleep=time.sleep, **kwargs):
+    """Call ``fn`` and retry 429/5xx API errors with jittered exponential backoff."""
+    if base_delay is None:
+        base_delay = RETRY_BASE_DELAY
+    for attempt in range(retries + 1):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as error:
+            if attempt == retries or not is_retryable(error):
+                raise
+            record_retry(fn, error)
+            delay = min(max_delay, base_delay * 2 ** attempt)
+            sleep(delay * random.uniform(0.5, 1.0))
+
+
+def quote_sheet_name(sheet_name):
+    """Quote a worksheet title for use in an A1 range."""
+    return "'" + sheet_name.replace("'", "''") + "'"
+
+
+class WorksheetRegistry:
+    """Worksheet handles for one spreadsheet, resolved once by title.
+
+    ``spreadsheet.worksheet(title)`` costs a metadata round trip per call, so
+    all tabs are listed with a single ``worksheets()`` request and reused.
+    """
+
+    def __init__(self, spreadsheet):
+        self.spreadsheet = spreadsheet
+        self._handles = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        self._handles = {ws.title: ws for ws in self.spreadsheet.worksheets()}
+
+    def get(self, sheet_name):
+        with self._lock:
+            if self._handles is None or sheet_name not in self._handles:
+                # Unknown title: the tab may have been added since we last looked
+                self._load()
+            try:
+                return self._handles[sheet_name]
+            except KeyError:
+                import gspread
+
+                raise gspread.WorksheetNotFound(sheet_name) from None
+
+    def titles(self):
+        with self._lock:
+            if self._handles is None:
+                self._load()
+            return list(self._handles)
+
+    def reset(self):
+        with self._lock:
+            self._handles = None
+
+
+def rows_to_frame(sheet_name, values):
+    """Build a typed DataFrame from raw sheet values (header row first).
+
+    Rows are padded to the header width since the API trims trailing empty
+    cells, datetime columns are parsed, and typed ``*_at`` columns are derived
+    from the free-text date columns (see :mod:`tracker.dates`).
+    """
+    header = list(values[0]) if values else list(SHEET_HEADERS.get(sheet_name, []))
+    width = len(header)
+    rows = [list(row[:width]) + [""] * (width - len(row)) for row in values[1:]]
+    frame = pd.DataFrame(rows, columns=header, dtype=object)
+    for column in DATETIME_COLUMNS:
+        if column in frame.columns:
+            frame[column] = pd.to_datetime(frame[column], errors="coerce", format="ISO8601")
+    return add_date_columns(sheet_name, frame)
+
+
+def frame_to_rows(frame, headers=None):
+    """Inverse of :func:`rows_to_frame`: DataFrame -> list of string rows."""
+    columns = list(headers) if headers is not None else list(frame.columns)
+    frame = frame.reindex(columns=columns)
+    values = []
+    for column in columns:
+        series = frame[column]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            series = series.dt.strftime("%Y-%m-%dT%H:%M:%S.%f")
+        values.append(series.astype(object).where(series.notna(), "").astype(str).tolist())
+    return [list(row) for row in zip(*values)]
+
+
+# Frames made by append_rows_to_frame remember which frame they extend, so
+# consumers can process only the appended rows:
+# id(frame) -> (weakref to frame, token, base token or None, base rows)
+_lineage = {}
+_lineage_lock = threading.Lock()
+_tokens = itertools.count(1)
+
+
+def _lineage_entry(frame, base_token=None, base_rows=0):
+    key = id(frame)
+    entry = _lineage.get(key)
+    if entry is None or entry[0]() is not frame:
+        entry = (weakref.ref(frame, lambda _, key=key: _lineage.pop(key, None)), next(_tokens), base_token, base_rows)
+        _lineage[key] = entry
+    return entry
+
+
+def frame_token(frame):
+    """A token naming ``frame`` for as long as it lives."""
+    with _lineage_lock:
+        return _lineage_entry(frame)[1]
+
+
+def extended_from(frame):
+    """``(base token, base rows)`` if ``frame`` is another frame with rows appended, else None."""
+    with _lineage_lock:
+        entry = _lineage.get(id(frame))
+        if entry is None or entry[0]() is not frame or entry[2] is None:
+            return None
+        return entry[2], entry[3]
+
+
+def append_rows_to_frame(frame, sheet_name, rows):
+    """Return ``frame`` with raw ``rows`` appended (used for not-yet-flushed writes)."""
+    if not rows:
+        return frame
+    derived = set(derived_columns(sheet_name))
+    header = [column for column in frame.columns if column not in derived]
+    extra = rows_to_frame(sheet_name, [header, *rows])
+    result = pd.concat([frame, extra], ignore_index=True)
+    with _lineage_lock:
+        _lineage_entry(result, _lineage_entry(frame)[1], len(frame))
+    return result
+
+
+def row_hash(row):
+    """Stable hash of a raw sheet row, ignoring trailing empty cells."""
+    row = [str(cell) for cell in row]
+    while row and row[-1] == "":
+        row.pop()
+    return hashlib.sha1(json.dumps(row).encode("utf-8")).hexdigest()
+
+
+class _SyncState:
+    def __init__(self, header, rows, frame):
+        self.header = list(header)
+        self.header_hash = row_hash(header)
+        self.row_count = len(rows)
+        self.last_row_hash = row_hash(rows[-1]) if rows else None
+        self.frame = frame
+
+
+class SheetSync:
+    """Loads worksheets, fetching only new rows of append-only sheets.
+
+    For each append-only sheet the number of data rows already held is
+    remembered. A sync requests the header row plus ``A{n}:H`` where row ``n``
+    is the last row we already have; if the header or that overlapping row no
+    longer matches (someone edited, inserted or deleted rows out of band) the
+    sheet is reloaded in full. Everything else goes through a full read.
+    All ranges of one sync share a single ``values:batchGet`` request.
+    """
+
+    def __init__(self, spreadsheet, append_only=APPEND_ONLY_SHEETS):
+        self.spreadsheet = spreadsheet
+        self.append_only = set(append_only)
+        self._state = {}
+        self._lock = threading.Lock()
+        self.full_reloads = 0
+        self.delta_syncs = 0
+        self.fallbacks = 0
+
+    def reset(self, sheet_name=None):
+        """Forget sync state so the next fetch is a full reload."""
+        with self._lock:
+            if sheet_name is None:
+                self._state.clear()
+            else:
+                self._state.pop(sheet_name, None)
+
+    def _delta_ranges(self, sheet_name, state):
+        quoted = quote_sheet_name(sheet_name)
+        last_column = column_letter(len(state.header))
+        # Re-read the last row we hold (sheet row = data rows + header) to detect edits
+        first_row = state.row_count + 1 if state.row_count else 2
+        return [f"{quoted}!A1:{last_column}1", f"{quoted}!A{first_row}:{last_column}"]
+
+    def fetch(self, sheet_names):
+        """Return a dict of sheet name -> DataFrame for ``sheet_names``."""
+        sheet_names = list(sheet_names)
+        if not sheet_names:
+            return {}
+        with self._lock:
+            ranges, plan = [], []
+            for name in sheet_names:
+                state = self._state.get(name) if name in self.append_only else None
+                if state is None:
+                    plan.append((name, None, len(ranges)))
+                    ranges.append(quote_sheet_name(name))
+                else:
+                    plan.append((name, state, len(ranges)))
+                    ranges.extend(self._delta_ranges(name, state))
+
+            response = call_with_backoff(self.spreadsheet.values_batch_get, ranges)
+            value_ranges = [vr.get("values", []) for vr in response.get("valueRanges", [])]
+
+            frames, reload = {}, []
+            for name, state, index in plan:
+                if state is None:
+                    frames[name] = self._full(name, value_ranges[index])
+                    continue
+                header, tail = value_ranges[index][:1], value_ranges[index + 1]
+                if not header or row_hash(header[0]) != state.header_hash:
+                    reload.append(name)
+                    continue
+                if state.row_count:
+                    if not tail or row_hash(tail[0]) != state.last_row_hash:
+                        reload.append(name)
+                        continue
+                    tail = tail[1:]
+                frames[name] = self._apply_delta(name, state, tail)
+
+            if reload:
+                self.fallbacks += len(reload)
+                response = call_with_backoff(
+                    self.spreadsheet.values_batch_get, [quote_sheet_name(name) for name in reload]
+                )
+                for name, vr in zip(reload, response.get("valueRanges", [])):
+                    frames[name] = self._full(name, vr.get("values", []))
+            return frames
+
+    def _full(self, sheet_name, values):
+        self.full_reloads += 1
+        frame = rows_to_frame(sheet_name, values)
+        if sheet_name in self.append_only:
+            header = values[0] if values else list(frame.columns)
+            self._state[sheet_name] = _SyncState(header, values[1:], frame)
+        return frame
+
+    def _apply_delta(self, sheet_name, state, new_rows):
+        self.delta_syncs += 1
+        if new_rows:
+            state.frame = append_rows_to_frame(state.frame, sheet_name, new_rows)
+            state.row_count += len(new_rows)
+            state.last_row_hash = row_hash(new_rows[-1])
+        return state.frame
+
+    def stats(self):
+        with self._lock:
+            return {
+                "full_reloads": self.full_reloads,
+                "delta_syncs": self.delta_syncs,
+                "fallbacks": self.fallbacks,
+                "rows_held": {name: state.row_count for name, state in self._state.items()},
+            }
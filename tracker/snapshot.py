@@ -0,0 +1,236 @@
+"""Process-wide snapshot of every worksheet, shared by all sessions.
+
+One :class:`SnapshotPublisher` per store polls the backend on a background
+thread and publishes an immutable :class:`Snapshot` whenever the content
+changed. Sessions render from the current snapshot without touching the API
+and rerun when its version moves on, so the number of open tabs no longer
+drives API traffic.
+
+Published frames are compacted (see :mod:`tracker.columnar`). A worksheet
+whose frame the store hands back unchanged, or with rows appended (see
+:func:`tracker.sheets.extended_from`), is not compacted and hashed again
+from scratch: only the appended rows are, so a write costs O(new rows)
+rather than O(history). With a
+``persist_dir`` each polled snapshot is also written there as Arrow IPC,
+and a restarted process serves that copy until its first poll returns.
+"""
+import hashlib
+import logging
+import threading
+import time
+from types import MappingProxyType
+
+from tracker.analytics import frame_fingerprint, remember_fingerprint
+from tracker.columnar import append_compact, compact_frame, read_snapshot, write_snapshot
+from tracker.schema import SHEET_NAMES
+from tracker.sheets import extended_from, frame_token
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot:
+    """Worksheet frames as of one poll. Treat the frames as read-only."""
+
+    __slots__ = ("version", "frames", "taken_at")
+
+    def __init__(self, version, frames, taken_at):
+        self.version = version
+        self.frames = MappingProxyType(dict(frames))
+        self.taken_at = taken_at
+
+    def frame(self, sheet_name):
+        return self.frames.get(sheet_name)
+
+
+class _Compacted:
+    __slots__ = ("token", "rows", "frame", "fingerprint", "base_token", "base_rows", "base_fingerprint")
+
+    def __init__(self, token, rows, frame, fingerprint, base_token=None, base_rows=None, base_fingerprint=None):
+        self.token = token
+        self.rows = rows
+        self.frame = frame
+        self.fingerprint = fingerprint
+        self.base_token = base_token
+        self.base_rows = base_rows
+        self.base_fingerprint = base_fingerprint
+
+
+class SnapshotPublisher:
+    """Keeps :attr:`snapshot` current by polling ``store`` every ``interval`` seconds.
+
+    A new snapshot (with a higher :attr:`version`) is only published when a
+    worksheet's content changed. Writers call :meth:`refresh` with
+    ``fetch=False`` right after a write so their change is visible at once;
+    that reads through the store's cache instead of polling the API.
+
+    Derived views kept in step with the data (rollups) register with
+    :meth:`subscribe` and are handed every snapshot as it is published.
+    """
+
+    def __init__(self, store, sheet_names=None, interval=30.0, persist_dir=None):
+        self.store = store
+        self.sheet_names = list(sheet_names or SHEET_NAMES)
+        self.interval = interval
+        self.persist_dir = persist_dir
+        self.polls = 0
+        self.last_error = None
+        # Where the current snapshot came from: "store" or "disk"
+        self.source = None
+        self._snapshot = None
+        self._fingerprints = None
+        self._persisted_version = None
+        # Held while publishing, which only reads the store's caches; polls,
+        # which may wait out network retries, hold _poll_lock instead
+        self._refresh_lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._subscribers = []
+        # sheet name -> the last frame read from the store and what it was published as
+        self._compacted = {}
+        self._wake = threading.Event()
+        self._stopped = False
+        if not self._load_persisted():
+            self.refresh(fetch=False)
+        self._thread = threading.Thread(target=self._run, name="snapshot-refresher", daemon=True)
+        self._thread.start()
+        if self.source == "disk":
+            # Replace the persisted copy with live data as soon as possible
+            self.poll_now()
+
+    def _load_persisted(self):
+        loaded = read_snapshot(self.persist_dir) if self.persist_dir else None
+        if loaded is None or not set(self.sheet_names) <= set(loaded[0]):
+            return False
+        frames, manifest = loaded
+        self._publish({name: frames[name] for name in self.sheet_names}, taken_at=manifest["written_at"])
+        self.source = "disk"
+        self._persisted_version = self.version
+        return True
+
+    def _publish(self, frames, taken_at=None, fingerprints=None):
+        """Publish ``frames`` if their content differs; returns True if it did."""
+        if fingerprints is None:
+            fingerprints = {name: frame_fingerprint(frame) for name, frame in frames.items()}
+        if fingerprints == self._fingerprints:
+            return False
+        self._fingerprints = fingerprints
+        self._snapshot = Snapshot(self.version + 1, frames, taken_at or time.time())
+        for callback in list(self._subscribers):
+            try:
+                callback(self._snapshot)
+            except Exception:
+                # A broken view must not fail the write or poll that published
+                logger.exception("Snapshot subscriber %r failed", callback)
+        return True
+
+    def subscribe(self, callback):
+        """Call ``callback(snapshot)`` now and with every snapshot published from now on."""
+        with self._refresh_lock:
+            self._subscribers.append(callback)
+            if self._snapshot is not None:
+                callback(self._snapshot)
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    @property
+    def version(self):
+        return self._snapshot.version if self._snapshot is not None else 0
+
+    def refresh(self, fetch=True):
+        """Read every worksheet and publish a snapshot if anything changed.
+
+        ``fetch=True`` asks the store for data newer than its caches;
+        otherwise cached reads are fine. Returns the current snapshot.
+
+        A poll refreshes the store's caches before taking the publish lock,
+        so a write publishing meanwhile never waits on the network.
+        """
+        if not fetch:
+            return self._publish_from_store()
+        with self._poll_lock:
+            self.store.poll_frames(self.sheet_names)
+            snapshot = self._publish_from_store()
+            # Only polls persist, keeping disk writes off the request path
+            if self.persist_dir and self._persisted_version != snapshot.version:
+                write_snapshot(self.persist_dir, snapshot.frames, snapshot.version)
+                self._persisted_version = snapshot.version
+            return snapshot
+
+    def _publish_from_store(self):
+        with self._refresh_lock:
+            # Cached reads, with rows still queued for the backend appended
+            frames = self.store.read_frames(self.sheet_names)
+            self.polls += 1
+            compacted = {name: self._compact(name, frame) for name, frame in frames.items()}
+            self._publish(
+                {name: entry.frame for name, entry in compacted.items()},
+                fingerprints={name: entry.fingerprint for name, entry in compacted.items()},
+            )
+            self.source = "store"
+            return self._snapshot
+
+    def _compact(self, name, source):
+        """The compacted frame and fingerprint of ``source``, reusing the previous refresh's work."""
+        token = frame_token(source)
+        previous = self._compacted.get(name)
+        if previous is not None and previous.token == token:
+            return previous
+        base = extended_from(source)
+        entry = None
+        if previous is not None and base is not None:
+            base_token, base_rows = base
+            if (previous.token, previous.rows) == base:
+                head, head_fingerprint = previous.frame, previous.fingerprint
+            elif (previous.base_token, previous.base_rows) == base:
+                # Both extend the same frame (e.g. more rows queued since)
+                head, head_fingerprint = previous.frame.iloc[:base_rows], previous.base_fingerprint
+            else:
+                head = None
+            if head is not None:
+                tail = source.iloc[base_rows:]
+                frame = append_compact(head, tail)
+                # Not the fingerprint a full hash would give, but just as content
+                # addressed for the same head; at worst one extra publish
+                fingerprint = hashlib.sha1(
+                    (head_fingerprint + frame_fingerprint(compact_frame(tail))).encode()
+                ).hexdigest()
+                remember_fingerprint(frame, fingerprint)
+                entry = _Compacted(token, len(source), frame, fingerprint, base_token, base_rows, head_fingerprint)
+        if entry is None:
+            frame = compact_frame(source)
+            entry = _Compacted(token, len(source), frame, frame_fingerprint(frame))
+        self._compacted[name] = entry
+        return entry
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(timeout=self.interval)
+            self._wake.clear()
+            if self._stopped:
+                break
+            try:
+                self.refresh()
+                self.last_error = None
+            except Exception as error:
+                # Keep serving the last good snapshot
+                self.last_error = str(error)
+
+    def poll_now(self):
+        """Wake the background thread to poll without waiting for the interval."""
+        self._wake.set()
+
+    def stats(self):
+        snapshot = self._snapshot
+        return {
+            "version": self.version,
+            "age_seconds": time.time() - snapshot.taken_at if snapshot is not None else None,
+            "polls": self.polls,
+            "source": self.source,
+            "last_error": self.last_error,
+        }
+
+    def close(self):
+        self._stopped = True
+        self._wake.set()
+        self._thread.join(timeout=5)
@@ -0,0 +1,670 @@
+"""Pluggable storage backends behind a common ``SheetStore`` interface.
+
+* :class:`GoogleSheetsStore` reads through the TTL cache and incremental sync
+  and writes through the write-behind queue.
+* :class:`SqliteStore` keeps every worksheet in a local SQLite database and
+  can mirror its writes to a ``GoogleSheetsStore`` in the background.
+
+Both can move closed months of a worksheet into per-month archives (see
+:mod:`tracker.archive`) with ``archive_rows``.
+
+Both support ``update_row``, a compare-and-swap on the row's Version column
+that raises :class:`tracker.versioning.WriteConflict` when the row changed
+since the caller read it.
+"""
+import logging
+import os
+import sqlite3
+import threading
+
+from tracker.archive import archive_name, archive_period, closed_prefix, group_by_period, row_periods
+from tracker.cache import SheetReadCache
+from tracker.schema import ROW_ID_COLUMN, SHEET_HEADERS, SHEET_NAMES, VERSION_COLUMN, column_letter
+from tracker.sheets import (
+    SheetSync,
+    WorksheetRegistry,
+    append_rows_to_frame,
+    call_with_backoff,
+    frame_to_rows,
+    quote_sheet_name,
+    rows_to_frame,
+)
+from tracker.versioning import WriteConflict, WriteCoordinator, parse_version
+from tracker.write_queue import WriteBehindQueue
+
+# Google Sheets API write quota per user
+SHEETS_WRITE_REQUESTS_PER_MINUTE = 60
+
+# Columns indexed in the SQLite backend wherever a worksheet has them
+INDEXED_COLUMNS = ["Date", "Project", "Developer"]
+
+
+class SheetStore:
+    """Where sprint data is read from and appended to."""
+
+    label = "storage"
+    # Write-behind queue feeding Google Sheets, if this store has one
+    write_queue = None
+    # Batched write requests per minute that bulk writers should stay under
+    # (None = no limit)
+    write_requests_per_minute = None
+
+    def read_frames(self, sheet_names):
+        """Return a dict of sheet name -> DataFrame."""
+        raise NotImplementedError
+
+    def read_frame(self, sheet_name):
+        return self.read_frames([sheet_name])[sheet_name]
+
+    def poll_frames(self, sheet_names):
+        """Like ``read_frames`` but bypassing any read cache, for change polling."""
+        return self.read_frames(sheet_names)
+
+    def append_row(self, sheet_name, row):
+        raise NotImplementedError
+
+    def append_rows(self, sheet_name, rows):
+        """Write ``rows`` now, as one batch where the backend allows it."""
+        for row in rows:
+            self.append_row(sheet_name, row)
+
+    def update_row(self, sheet_name, row_id, changes, expected_version=None):
+        """Set the ``changes`` (column -> value) on the row with ``row_id``.
+
+        With ``expected_version`` the write only happens if the row is still
+        at that version; otherwise :class:`WriteConflict` is raised. Returns
+        the row's new version.
+        """
+        raise NotImplementedError
+
+    def archived_periods(self, sheet_name):
+        """Months (``YYYY-MM``) with an archive of ``sheet_name``, oldest first."""
+        return []
+
+    def read_archive(self, sheet_name, period):
+        """The archived rows of ``sheet_name`` for ``period``, typed like ``read_frame``."""
+        raise NotImplementedError
+
+    def archive_values(self, sheet_name, period, column):
+        """The distinct non-empty values of ``column`` in one archive, sorted."""
+        return sorted(set(self.read_archive(sheet_name, period)[column].dropna()) - {""})
+
+    def archive_rows(self, sheet_name, before_period):
+        """Move rows created before ``before_period`` into per-month archives.
+
+        Returns a dict of period -> number of rows moved.
+        """
+        return {}
+
+    def refresh(self):
+        """Drop anything held in memory so the next read is authoritative."""
+
+
+class GoogleSheetsStore(SheetStore):
+    label = "Google Sheets"
+    write_requests_per_minute = SHEETS_WRITE_REQUESTS_PER_MINUTE
+
+    def __init__(self, spreadsheet, journal_path, cache=None):
+        self.spreadsheet = spreadsheet
+        self.cache = cache if cache is not None else SheetReadCache()
+        self.worksheets = WorksheetRegistry(spreadsheet)
+        self.sync = SheetSync(spreadsheet)
+        self.coordinator = WriteCoordinator()
+        self.write_queue = WriteBehindQueue(
+            self.worksheets, journal_path, on_flush=self.cache.invalidate, coordinator=self.coordinator,
+        )
+
+    def read_frames(self, sheet_names):
+        # A miss on one tab refreshes every stale tab in the same batchGet
+        wanted = list(dict.fromkeys(sheet_names))
+        frames = {name: self.cache.get(name) for name in wanted}
+        if any(frame is None for frame in frames.values()):
+            missing = [name for name in dict.fromkeys([*wanted, *SHEET_NAMES]) if name not in self.cache]
+            fetched = self.sync.fetch(missing)
+            for name, frame in fetched.items():
+                self.cache.put(name, frame)
+            frames.update({name: fetched[name] for name in wanted if name in fetched})
+        # Show rows that are still waiting in the write-behind queue
+        return {
+            name: append_rows_to_frame(frame, name, self.write_queue.pending_rows(name))
+            for name, frame in frames.items()
+        }
+
+    def poll_frames(self, sheet_names):
+        # Keeps the sync state, so append-only tabs still fetch just new rows.
+        # Cached frames are only replaced once the fetch is back, so reads in
+        # the meantime keep hitting them instead of queuing behind it
+        fetched = self.sync.fetch(list(dict.fromkeys(sheet_names)))
+        for name, frame in fetched.items():
+            self.cache.put(name, frame)
+        return {
+            name: append_rows_to_frame(frame, name, self.write_queue.pending_rows(name))
+            for name, frame in fetched.items()
+        }
+
+    def append_row(self, sheet_name, row):
+        self.write_queue.enqueue(sheet_name, row)
+
+    def append_rows(self, sheet_name, rows):
+        # Bulk writes skip the per-row journal and go out as one append_rows call
+        worksheet = self.worksheets.get(sheet_name)
+        with self.coordinator.lock(sheet_name):
+            call_with_backoff(worksheet.append_rows, [list(row) for row in rows])
+        self.cache.invalidate(sheet_name)
+
+    def _locate(self, sheet_name, row_id):
+        """Return (sheet row number, version) of ``row_id``, or (None, None)."""
+        headers = SHEET_HEADERS[sheet_name]
+        id_column = column_letter(headers.index(ROW_ID_COLUMN) + 1)
+        version_column = column_letter(headers.index(VERSION_COLUMN) + 1)
+        response = call_with_backoff(
+            self.spreadsheet.values_batch_get, [f"{quote_sheet_name(sheet_name)}!{id_column}2:{version_column}"]
+        )
+        values = response.get("valueRanges", [{}])[0].get("values", [])
+        for offset, cells in enumerate(values):
+            if cells and cells[0] == row_id:
+                return offset + 2, parse_version(cells[1] if len(cells) > 1 else None)
+        return None, None
+
+    def update_row(self, sheet_name, row_id, changes, expected_version=None):
+        headers = SHEET_HEADERS[sheet_name]
+        id_index = headers.index(ROW_ID_COLUMN)
+        # A row still in the write-behind queue has no position yet; flush it
+        # before taking the worksheet lock, which the flush also needs
+        if any(len(row) > id_index and row[id_index] == row_id for row in self.write_queue.pending_rows(sheet_name)):
+            self.write_queue.flush()
+
+        with self.coordinator.lock(sheet_name):
+            position, current = self._locate(sheet_name, row_id)
+            if position is None or (expected_version is not None and current != expected_version):
+                # Whatever the caller read is stale; make the next read fetch it again
+                self.cache.invalidate(sheet_name)
+                self.sync.reset(sheet_name)
+                raise WriteConflict(sheet_name, row_id, expected_version, current)
+            changes = dict(changes)
+            new_version = int(changes.pop(VERSION_COLUMN, current + 1))
+            changes[VERSION_COLUMN] = new_version
+            data = [
+                {"range": f"{column_letter(headers.index(column) + 1)}{position}", "values": [[str(value)]]}
+                for column, value in changes.items()
+            ]
+            worksheet = self.worksheets.get(sheet_name)
+            call_with_backoff(worksheet.batch_update, data)
+        self.cache.invalidate(sheet_name)
+        # Rows changed in place, so the append-only delta can't be trusted
+        self.sync.reset(sheet_name)
+        return new_version
+
+    def archived_periods(self, sheet_name):
+        return sorted(filter(None, (archive_period(sheet_name, title) for title in self.worksheets.titles())))
+
+    def read_archive(self, sheet_name, period):
+        response = call_with_backoff(
+            self.spreadsheet.values_batch_get, [quote_sheet_name(archive_name(sheet_name, period))]
+        )
+        return rows_to_frame(sheet_name, response.get("valueRanges", [{}])[0].get("values", []))
+
+    def archive_values(self, sheet_name, period, column):
+        # One column of the archive rather than all of it
+        letter = column_letter(SHEET_HEADERS[sheet_name].index(column) + 1)
+        response = call_with_backoff(
+            self.spreadsheet.values_batch_get, [f"{quote_sheet_name(archive_name(sheet_name, period))}!{letter}2:{letter}"]
+        )
+        values = response.get("valueRanges", [{}])[0].get("values", [])
+        return sorted({cells[0] for cells in values if cells and cells[0]})
+
+    def archive_rows(self, sheet_name, before_period):
+        """Copy the closed months at the top of the worksheet into archive tabs, then cut them.
+
+        The cut is one deleteDimension of rows 2..n+1, so rows appended
+        meanwhile (always at the bottom) are untouched. If a run stops after
+        copying, the next one skips rows whose Row ID the archive already has.
+        Only one process should archive a spreadsheet.
+        """
+        headers = SHEET_HEADERS[sheet_name]
+        created_index = headers.index("Created At")
+        id_index = headers.index(ROW_ID_COLUMN)
+        # Queued appends must be in the sheet before row positions are read
+        self.write_queue.flush()
+        with self.coordinator.lock(sheet_name):
+            response = call_with_backoff(self.spreadsheet.values_batch_get, [quote_sheet_name(sheet_name)])
+            rows = response.get("valueRanges", [{}])[0].get("values", [])[1:]
+            count = closed_prefix(rows, created_index, before_period)
+            if not count:
+                return {}
+            groups = group_by_period(rows[:count], row_periods(sheet_name, rows[:count]))
+            moved = {period: len(period_rows) for period, period_rows in groups.items()}
+
+            titles = set(self.worksheets.titles())
+            existing = [period for period in groups if archive_name(sheet_name, period) in titles]
+            if existing:
+                id_column = column_letter(id_index + 1)
+                response = call_with_backoff(self.spreadsheet.values_batch_get, [
+                    f"{quote_sheet_name(archive_name(sheet_name, period))}!{id_column}2:{id_column}"
+                    for period in existing
+                ])
+                for period, value_range in zip(existing, response.get("valueRanges", [])):
+                    archived = {cells[0] for cells in value_range.get("values", []) if cells}
+                    groups[period] = [
+                        row for row in groups[period] if len(row) <= id_index or row[id_index] not in archived
+                    ]
+            new = [period for period in groups if period not in existing]
+            if new:
+                call_with_backoff(self.spreadsheet.batch_update, {"requests": [
+                    {"addSheet": {"properties": {
+                        "title": archive_name(sheet_name, period),
+                        "gridProperties": {"rowCount": len(groups[period]) + 1, "columnCount": len(headers)},
+                    }}}
+                    for period in new
+                ]})
+                self.worksheets.reset()
+            for period, period_rows in groups.items():
+                worksheet = self.worksheets.get(archive_name(sheet_name, period))
+                if period in new:
+                    call_with_backoff(worksheet.update, range_name="A1", values=[headers, *period_rows])
+                elif period_rows:
+                    call_with_backoff(worksheet.append_rows, period_rows)
+
+            hot = self.worksheets.get(sheet_name)
+            call_with_backoff(self.spreadsheet.batch_update, {"requests": [{"deleteDimension": {"range": {
+                "sheetId": hot.id, "dimension": "ROWS", "startIndex": 1, "endIndex": 1 + count,
+            }}}]})
+        self.cache.invalidate(sheet_name)
+        # Rows moved up, so the append-only delta can't be trusted
+        self.sync.reset(sheet_name)
+        return moved
+
+    def refresh(self):
+        self.cache.clear()
+        # Also drop incremental sync state to pick up out-of-band edits
+        self.sync.reset()
+
+
+logger = logging.getLogger(__name__)
+
+
+def _quote_identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+class _MirrorUpdater:
+    """Pushes row updates to a mirror on a background thread.
+
+    Updates to the same row coalesce into one, and failed ones are logged
+    and retried every ``retry_interval`` seconds; a row the mirror doesn't
+    have yet may still be on its way through its write-behind queue.
+    """
+
+    def __init__(self, mirror, retry_interval=30.0):
+        self.mirror = mirror
+        self.retry_interval = retry_interval
+        # (sheet name, row id) -> changes, Version included
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self.pushed = 0
+        self.last_error = None
+        self._thread = threading.Thread(target=self._run, name="sqlite-mirror-updates", daemon=True)
+        self._thread.start()
+
+    def enqueue(self, sheet_name, row_id, changes):
+        key = (sheet_name, row_id)
+        with self._lock:
+            # A new dict, so flush can tell whether the row changed while it was pushed
+            self._pending[key] = {**self._pending.get(key, {}), **changes}
+        self._wake.set()
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """Push every pending update now; returns the number that landed."""
+        with self._lock:
+            items = list(self._pending.items())
+        pushed, errors = 0, []
+        for (sheet_name, row_id), changes in items:
+            try:
+                self.mirror.update_row(sheet_name, row_id, changes)
+            except Exception as error:
+                logger.warning("Mirroring the update of %s row %s failed, will retry: %s", sheet_name, row_id, error)
+                errors.append(f"{sheet_name} {row_id}: {error}")
+                continue
+            with self._lock:
+                if self._pending.get((sheet_name, row_id)) is changes:
+                    del self._pending[(sheet_name, row_id)]
+            pushed += 1
+        self.pushed += pushed
+        self.last_error = "; ".join(errors) or None
+        return pushed
+
+    def _run(self):
+        while True:
+            self._wake.wait(timeout=self.retry_interval if self.pending_count() else None)
+            self._wake.clear()
+            self.flush()
+
+
+class SqliteStore(SheetStore):
+    """Worksheets stored as SQLite tables, optionally mirrored to Google Sheets.
+
+    Each worksheet becomes a table with one TEXT column per header, indexed on
+    Date, Project and Developer. Reads never leave the machine; appends are
+    committed locally and then handed to ``mirror`` (normally a
+    :class:`GoogleSheetsStore`) whose write-behind queue pushes them out.
+    Updates go to the mirror in the background too, so a slow or failing
+    mirror never fails a local write. The mirror can be given up front or
+    attached later with :meth:`attach_mirror`, e.g. once a slow connection
+    comes up. Without a
+    mirror, appends are also queued on ``outbox`` if given: a journal-only
+    :class:`WriteBehindQueue` that a :class:`GoogleSheetsStore` opened later
+    on the same journal sends out.
+
+    Frames read are kept until a write changes their table; appends extend
+    the kept frame rather than dropping it, and commits from other
+    connections are spotted through ``PRAGMA data_version``.
+    """
+
+    label = "local SQLite"
+    # Rows queued on the mirror by the last attach_mirror because it lacked them
+    # or held an older version
+    unmirrored_rows = 0
+    # Background pusher of updates to the mirror, once one is attached
+    mirror_updates = None
+
+    def __init__(self, path, mirror=None, outbox=None):
+        self.path = path
+        self.mirror = None
+        self.outbox = outbox
+        self.write_queue = outbox
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        # Held across "commit locally, hand to the mirror" so attach_mirror
+        # sees every row either in the table or in the mirror, never neither
+        self._mirror_lock = threading.RLock()
+        # sheet name -> frame as last read; _generation moves on every invalidation
+        self._frames = {}
+        self._generation = 0
+        self._data_version = None
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            for sheet_name, headers in SHEET_HEADERS.items():
+                self._create_table(sheet_name, headers)
+                self._backfill_row_ids(sheet_name)
+        if mirror is not None:
+            self.attach_mirror(mirror)
+
+    def attach_mirror(self, mirror):
+        """Mirror writes to ``mirror`` from now on; returns False if it already was.
+
+        Empty tables are seeded from the mirror, and local rows whose Row ID
+        the mirror doesn't have (written before it was attached) are queued
+        on its write-behind queue; rows at a newer version than the mirror's
+        copy are queued as updates.
+        """
+        with self._mirror_lock:
+            if self.mirror is mirror:
+                return False
+            self._seed_from(mirror)
+            self.mirror_updates = _MirrorUpdater(mirror)
+            self.unmirrored_rows = self._push_unmirrored(mirror)
+            self.mirror = mirror
+            self.write_queue = mirror.write_queue
+            self.write_requests_per_minute = mirror.write_requests_per_minute
+            self.label = "local SQLite, mirrored to Google Sheets"
+        return True
+
+    def _push_unmirrored(self, mirror):
+        frames = mirror.read_frames(SHEET_NAMES)
+        pushed = 0
+        for name in SHEET_NAMES:
+            headers = SHEET_HEADERS[name]
+            id_index = headers.index(ROW_ID_COLUMN)
+            version_index = headers.index(VERSION_COLUMN)
+            mirrored_rows = frame_to_rows(frames[name], headers)
+            known = {row[id_index]: parse_version(row[version_index]) for row in mirrored_rows if row[id_index]}
+            # Rows the mirror holds without a Row ID got a new one locally; match those by content
+            known_content = {tuple(row[:id_index]) for row in mirrored_rows if not row[id_index]}
+            columns = ", ".join(_quote_identifier(header) for header in headers)
+            with self._lock:
+                rows = self._conn.execute(f"SELECT {columns} FROM {_quote_identifier(name)} ORDER BY rowid").fetchall()
+            missing = [
+                list(row) for row in rows
+                if row[id_index] not in known and tuple(row[:id_index]) not in known_content
+            ]
+            mirror.write_queue.enqueue_rows(name, missing)
+            pushed += len(missing)
+            for row in rows:
+                version = parse_version(row[version_index])
+                if row[id_index] in known and version > known[row[id_index]]:
+                    # Updated while the mirror was away
+                    changes = dict(zip(headers[:id_index], row[:id_index]))
+                    self.mirror_updates.enqueue(name, row[id_index], {**changes, VERSION_COLUMN: version})
+                    pushed += 1
+        return pushed
+
+    def _create_table(self, sheet_name, headers):
+        table = _quote_identifier(sheet_name)
+        columns = ", ".join(f"{_quote_identifier(header)} TEXT NOT NULL DEFAULT ''" for header in headers)
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+        # Tables created by an older version lack the newer trailing columns
+        existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+        for header in headers:
+            if header not in existing:
+                self._conn.execute(
+                    f"ALTER TABLE {table} ADD COLUMN {_quote_identifier(header)} TEXT NOT NULL DEFAULT ''"
+                )
+        for column in INDEXED_COLUMNS:
+            if column in headers:
+                index_name = "idx_" + "_".join(f"{sheet_name} {column}".lower().replace("&", "and").split())
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_quote_identifier(index_name)} "
+                    f"ON {table} ({_quote_identifier(column)})"
+                )
+
+    def _backfill_row_ids(self, sheet_name):
+        """Give rows without a Row ID a random one and Version 1."""
+        self._conn.execute(
+            f"UPDATE {_quote_identifier(sheet_name)} SET {_quote_identifier(ROW_ID_COLUMN)} = lower(hex(randomblob(16))), "
+            f"{_quote_identifier(VERSION_COLUMN)} = '1' WHERE {_quote_identifier(ROW_ID_COLUMN)} = ''"
+        )
+
+    def _seed_from(self, mirror):
+        empty = [name for name in SHEET_NAMES if self.row_count(name) == 0]
+        if empty:
+            self.seed(mirror.read_frames(empty))
+
+    def seed(self, frames):
+        """Fill the tables that are still empty from ``frames`` (sheet name -> DataFrame)."""
+        for name, frame in frames.items():
+            if name not in SHEET_HEADERS or self.row_count(name):
+                continue
+            self._insert(name, frame_to_rows(frame, SHEET_HEADERS[name]))
+            with self._lock, self._conn:
+                self._backfill_row_ids(name)
+                self._invalidate(name)
+
+    def _invalidate(self, sheet_name=None):
+        """Drop kept frames; call with ``self._lock`` held."""
+        if sheet_name is None:
+            self._frames.clear()
+        else:
+            self._frames.pop(sheet_name, None)
+        self._generation += 1
+
+    def _insert(self, sheet_name, rows):
+        headers = SHEET_HEADERS[sheet_name]
+        width = len(headers)
+        rows = [list(row[:width]) + [""] * (width - len(row)) for row in rows]
+        columns = ", ".join(_quote_identifier(header) for header in headers)
+        placeholders = ", ".join("?" * width)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT INTO {_quote_identifier(sheet_name)} ({columns}) VALUES ({placeholders})", rows
+            )
+            frame = self._frames.get(sheet_name)
+            if frame is not None:
+                self._frames[sheet_name] = append_rows_to_frame(frame, sheet_name, rows)
+            else:
+                # A read building this table's frame right now must not keep it
+                self._generation += 1
+
+    def row_count(self, sheet_name):
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {_quote_identifier(sheet_name)}").fetchone()[0]
+
+    def query(self, sql, params=()):
+        """Run a read-only query against the local tables."""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _read_table(self, table, sheet_name):
+        headers = SHEET_HEADERS[sheet_name]
+        columns = ", ".join(_quote_identifier(header) for header in headers)
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {columns} FROM {_quote_identifier(table)} ORDER BY rowid").fetchall()
+        return rows_to_frame(sheet_name, [headers, *rows])
+
+    def read_frames(self, sheet_names):
+        frames = {}
+        for name in dict.fromkeys(sheet_names):
+            with self._lock:
+                data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+                if data_version != self._data_version:
+                    # Another connection (e.g. the import CLI) committed
+                    self._invalidate()
+                    self._data_version = data_version
+                frame = self._frames.get(name)
+                generation = self._generation
+            if frame is None:
+                frame = self._read_table(name, name)
+                with self._lock:
+                    # Unless a write landed while it was read
+                    if generation == self._generation:
+                        self._frames[name] = frame
+            frames[name] = frame
+        return frames
+
+    def refresh(self):
+        with self._lock:
+            self._invalidate()
+
+    def append_row(self, sheet_name, row):
+        row = ["" if value is None else str(value) for value in row]
+        with self._mirror_lock:
+            self._insert(sheet_name, [row])
+            if self.mirror is not None:
+                self.mirror.append_row(sheet_name, row)
+            elif self.outbox is not None:
+                self.outbox.enqueue(sheet_name, row)
+
+    def append_rows(self, sheet_name, rows):
+        rows = [["" if value is None else str(value) for value in row] for row in rows]
+        with self._mirror_lock:
+            self._insert(sheet_name, rows)
+            if self.mirror is not None:
+                # Journaled before returning, so a chunk counted as stored
+                # (e.g. by a bulk import's checkpoint) also reaches the mirror
+                self.mirror.write_queue.enqueue_rows(sheet_name, rows)
+            elif self.outbox is not None:
+                self.outbox.enqueue_rows(sheet_name, rows)
+
+    def update_row(self, sheet_name, row_id, changes, expected_version=None):
+        if self.mirror is None and self.outbox is not None:
+            # The journal only carries appends, so the change would never reach Sheets
+            raise RuntimeError("Changes to existing rows can't be saved until Google Sheets is reachable again")
+        table = _quote_identifier(sheet_name)
+        id_column = _quote_identifier(ROW_ID_COLUMN)
+        version_column = _quote_identifier(VERSION_COLUMN)
+        changes = {column: value for column, value in changes.items() if column != VERSION_COLUMN}
+        assignments = [f"{_quote_identifier(column)} = ?" for column in changes]
+        assignments.append(f"{version_column} = CAST(CAST({version_column} AS INTEGER) + 1 AS TEXT)")
+        sql = f"UPDATE {table} SET {', '.join(assignments)} WHERE {id_column} = ?"
+        params = ["" if value is None else str(value) for value in changes.values()] + [row_id]
+        if expected_version is not None:
+            sql += f" AND {version_column} = ?"
+            params.append(str(expected_version))
+        # The version check and the write are one statement, so concurrent
+        # updates to the same row can't both succeed
+        with self._lock, self._conn:
+            updated = self._conn.execute(sql, params).rowcount
+            found = self._conn.execute(f"SELECT {version_column} FROM {table} WHERE {id_column} = ?", (row_id,)).fetchone()
+            if updated:
+                self._invalidate(sheet_name)
+        current = parse_version(found[0]) if found else None
+        if not updated:
+            raise WriteConflict(sheet_name, row_id, expected_version, current)
+        if self.mirror_updates is not None:
+            # The local database is authoritative; keep the mirror's version in step
+            self.mirror_updates.enqueue(sheet_name, row_id, {**changes, VERSION_COLUMN: current})
+        return current
+
+    def archived_periods(self, sheet_name):
+        tables = [row[0] for row in self.query("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        return sorted(filter(None, (archive_period(sheet_name, table) for table in tables)))
+
+    def read_archive(self, sheet_name, period):
+        return self._read_table(archive_name(sheet_name, period), sheet_name)
+
+    def archive_values(self, sheet_name, period, column):
+        column = _quote_identifier(column)
+        rows = self.query(
+            f"SELECT DISTINCT {column} FROM {_quote_identifier(archive_name(sheet_name, period))} WHERE {column} != ''"
+        )
+        return sorted(row[0] for row in rows)
+
+    def archive_rows(self, sheet_name, before_period):
+        """Move closed months into one table per month, in a single transaction."""
+        headers = SHEET_HEADERS[sheet_name]
+        table = _quote_identifier(sheet_name)
+        columns = ", ".join(_quote_identifier(header) for header in headers)
+        created = _quote_identifier("Created At")
+        period = f"substr({created}, 1, 7)"
+        closed = f"{created} GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]*' AND {period} < ?"
+        placeholders = ", ".join("?" * len(headers))
+        moved = {}
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM {table} WHERE {closed} ORDER BY rowid", (before_period,)
+            ).fetchall()
+            for name, period_rows in sorted(group_by_period(rows, row_periods(sheet_name, rows)).items()):
+                archive = archive_name(sheet_name, name)
+                self._create_table(archive, headers)
+                self._conn.executemany(
+                    f"INSERT INTO {_quote_identifier(archive)} ({columns}) VALUES ({placeholders})", period_rows
+                )
+                moved[name] = len(period_rows)
+            self._conn.execute(f"DELETE FROM {table} WHERE {closed}", (before_period,))
+            if rows:
+                self._invalidate(sheet_name)
+        if self.mirror is not None:
+            self.mirror.archive_rows(sheet_name, before_period)
+        return moved
+
+
+def open_outage_store(path, journal_path, frames=None):
+    """A throwaway :class:`SqliteStore` standing in for Google Sheets while it is unreachable.
+
+    The database at ``path`` is recreated from ``frames`` (normally the last
+    Sheets snapshot persisted on disk) plus the rows still waiting in the
+    journal, so pages show what Sheets held. Appends are only journaled: the
+    Sheets store replays the journal once it connects, and the copy is
+    thrown away. It must not share a file with a real SQLite backend.
+    """
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    outbox = WriteBehindQueue(None, journal_path)
+    store = SqliteStore(path, outbox=outbox)
+    store.seed(frames or {})
+    for name in SHEET_NAMES:
+        id_index = SHEET_HEADERS[name].index(ROW_ID_COLUMN)
+        frame = (frames or {}).get(name)
+        # The snapshot already holds the rows that were pending when it was taken
+        seen = set(frame[ROW_ID_COLUMN]) if frame is not None and ROW_ID_COLUMN in frame.columns else set()
+        pending = [row for row in outbox.pending_rows(name) if len(row) <= id_index or row[id_index] not in seen]
+        if pending:
+            store._insert(name, pending)
+    store.label = "last Google Sheets snapshot while Google Sheets is unreachable"
+    return store
@@ -0,0 +1,101 @@
+"""Synthetic sprint data for benchmarks and offline demos.
+
+:func:`generate_workbook` builds rows for every worksheet: ``projects``
+projects, a sprint goal and retrospective per project and fortnight, and
+one Daily Updates row per developer per working day over ``days`` days.
+Output is deterministic for a given ``seed``.
+"""
+import math
+import random
+from datetime import date, datetime, time, timedelta
+
+from tracker.versioning import versioned_row
+
+_WORDS = (
+    "api auth token oauth schema sheets slack bot flask deploy review tests docs refactor "
+    "pipeline dashboard webhook retry cache index migration client keys staging release"
+).split()
+_STATUSES = ["In Progress", "On Hold", "Completed", "Planned"]
+_BLOCKERS = ["Need API keys from client", "Waiting on design review", "Staging is down", "Rate limited by vendor"]
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize()
+
+
+def _short(day):
+    return f"{day:%b} {day.day}"
+
+
+def generate_workbook(projects=10, developers=8, days=365, blocker_rate=0.15, seed=0, start=None):
+    """Return sheet name -> list of data rows (no header), versioned and timestamped."""
+    rng = random.Random(seed)
+    start = start or date(2025, 1, 1)
+    names = [f"Project {chr(65 + i % 26)}{i // 26 or ''}" for i in range(projects)]
+    people = [f"Developer {i + 1}" for i in range(developers)]
+    owners = {name: rng.sample(people, min(2, len(people))) for name in names}
+
+    def created(day):
+        return datetime.combine(day, time(9)).isoformat()
+
+    overview = []
+    for name in names:
+        end = start + timedelta(days=days)
+        overview.append(versioned_row("Project Overview", [
+            name, _sentence(rng, 6), _short(start), _short(end), rng.choice(_STATUSES),
+            ", ".join(owners[name]), _sentence(rng, 8), created(start),
+        ]))
+
+    goals, retros = [], []
+    for sprint, sprint_start in enumerate(start + timedelta(days=d) for d in range(0, days, 14)):
+        sprint_end = sprint_start + timedelta(days=13)
+        sprint_name = f"Sprint {sprint + 1}"
+        status = "Completed" if sprint_end < start + timedelta(days=days) else "In Progress"
+        for name in names:
+            goals.append(versioned_row("Sprint Goals", [
+                sprint_name, f"{_short(sprint_start)}–{_short(sprint_end)}", name, _sentence(rng, 6),
+                _sentence(rng, 8), ", ".join(owners[name]), status, created(sprint_start),
+            ]))
+        retros.append(versioned_row("Results & Retrospective", [
+            sprint_name, _sentence(rng, 8), _sentence(rng, 8), _sentence(rng, 6), created(sprint_end),
+        ]))
+
+    updates = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        if day.weekday() >= 5:
+            continue
+        for person in people:
+            blocker = rng.choice(_BLOCKERS) if rng.random() < blocker_rate else "None"
+            updates.append(versioned_row("Daily Updates", [
+                day.isoformat(), rng.choice(names), person, _sentence(rng, 10), _sentence(rng, 10),
+                blocker, _sentence(rng, 5), created(day),
+            ]))
+
+    return {
+        "Project Overview": overview,
+        "Daily Updates": updates,
+        "Sprint Goals": goals,
+        "Results & Retrospective": retros,
+    }
+
+
+def workbook_for_updates(update_rows, seed=0):
+    """A workbook with about ``update_rows`` Daily Updates rows."""
+    developers = max(5, min(200, update_rows // 400))
+    projects = max(3, min(50, developers // 2))
+    # Weekdays only: five working days per seven
+    days = max(1, math.ceil(update_rows / developers * 7 / 5))
+    workbook = generate_workbook(projects=projects, developers=developers, days=days, seed=seed)
+    workbook["Daily Updates"] = workbook["Daily Updates"][:update_rows]
+    return workbook
+
+
+def populate(spreadsheet, workbook):
+    """Bootstrap ``spreadsheet`` and append the workbook rows, one call per sheet."""
+    from tracker.bootstrap import bootstrap_schema
+
+    bootstrap_schema(spreadsheet)
+    for sheet_name, rows in workbook.items():
+        if rows:
+            spreadsheet.worksheet(sheet_name).append_rows(rows)
@@ -0,0 +1,180 @@
+"""Write-behind queue that batches appends to Google Sheets.
+
+Rows are journaled to a local JSON-lines file as soon as they are queued, so
+anything not yet written survives a process restart. A background thread
+coalesces pending rows per worksheet into one ``append_rows`` call and retries
+quota (429) and server errors with exponential backoff.
+
+Delivery is at-least-once: a crash between a successful ``append_rows`` and
+the journal rewrite replays those rows on the next start.
+"""
+import json
+import os
+import threading
+import time
+
+from tracker.sheets import call_with_backoff
+
+
+class WriteBehindQueue:
+    """Queue of rows waiting to be appended, flushed by a daemon thread.
+
+    ``worksheets`` is anything with a ``get(sheet_name)`` returning a worksheet
+    (normally a :class:`tracker.sheets.WorksheetRegistry`). ``on_flush`` is
+    called with the sheet name after its rows were written. If a
+    ``coordinator`` (:class:`tracker.versioning.WriteCoordinator`) is given,
+    each ``append_rows`` call holds that worksheet's write lock.
+
+    With ``worksheets=None`` the queue only journals: rows wait on disk until
+    a queue with worksheets is opened on the same journal, e.g. once Google
+    Sheets is reachable again.
+    """
+
+    def __init__(self, worksheets, journal_path, on_flush=None, flush_delay=0.5, retry_interval=30.0,
+                 coordinator=None):
+        self._worksheets = worksheets
+        self._coordinator = coordinator
+        self.journal_path = journal_path
+        self._on_flush = on_flush
+        self.flush_delay = flush_delay
+        self.retry_interval = retry_interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self.flushed = 0
+        self.last_error = None
+        self.last_flush_at = None
+        self._load_journal()
+        self._thread = None
+        if worksheets is not None:
+            self._thread = threading.Thread(target=self._run, name="sheets-write-behind", daemon=True)
+            self._thread.start()
+            if self._pending:
+                self._wake.set()
+
+    def _load_journal(self):
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, encoding="utf-8") as journal:
+            for line in journal:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn last line from a crash mid-write; everything before it is intact
+                    continue
+                self._pending.setdefault(entry["sheet"], []).append(entry["row"])
+
+    def _rewrite_journal(self):
+        """Persist the current pending rows (caller holds ``_lock``)."""
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as journal:
+            for sheet_name, rows in self._pending.items():
+                for row in rows:
+                    journal.write(json.dumps({"sheet": sheet_name, "row": row}) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(tmp_path, self.journal_path)
+
+    def enqueue(self, sheet_name, row):
+        """Journal ``row`` and queue it for ``sheet_name``; returns immediately."""
+        self.enqueue_rows(sheet_name, [row])
+
+    def enqueue_rows(self, sheet_name, rows):
+        """Journal ``rows`` with a single fsync and queue them for ``sheet_name``."""
+        rows = [list(row) for row in rows]
+        if not rows:
+            return
+        with self._lock:
+            with open(self.journal_path, "a", encoding="utf-8") as journal:
+                for row in rows:
+                    journal.write(json.dumps({"sheet": sheet_name, "row": row}) + "\n")
+                journal.flush()
+                os.fsync(journal.fileno())
+            self._pending.setdefault(sheet_name, []).extend(rows)
+        self._wake.set()
+
+    def pending_rows(self, sheet_name):
+        with self._lock:
+            return [list(row) for row in self._pending.get(sheet_name, ())]
+
+    def pending_count(self):
+        with self._lock:
+            return sum(len(rows) for rows in self._pending.values())
+
+    def status(self):
+        with self._lock:
+            return {
+                "pending": {name: len(rows) for name, rows in self._pending.items() if rows},
+                "flushed": self.flushed,
+                "last_error": self.last_error,
+                "last_flush_at": self.last_flush_at,
+            }
+
+    def flush(self):
+        """Write all pending rows now, one ``append_rows`` call per worksheet.
+
+        Returns the number of rows written. Failures are recorded in
+        ``last_error`` and the rows stay queued for the next attempt.
+        """
+        written = 0
+        errors = []
+        if self._worksheets is None:
+            return written
+        with self._flush_lock:
+            with self._lock:
+                sheet_names = list(self._pending)
+            for sheet_name in sheet_names:
+                with self._lock:
+                    rows = [list(row) for row in self._pending.get(sheet_name, ())]
+                if not rows:
+                    continue
+                try:
+                    worksheet = self._worksheets.get(sheet_name)
+                    if self._coordinator is not None:
+                        with self._coordinator.lock(sheet_name):
+                            call_with_backoff(worksheet.append_rows, rows)
+                    else:
+                        call_with_backoff(worksheet.append_rows, rows)
+                except Exception as error:
+                    errors.append(f"{sheet_name}: {error}")
+                    continue
+                with self._lock:
+                    # Rows queued while we were writing stay behind the ones just sent
+                    remaining = self._pending[sheet_name][len(rows):]
+                    if remaining:
+                        self._pending[sheet_name] = remaining
+                    else:
+                        del self._pending[sheet_name]
+                    self._rewrite_journal()
+                    self.flushed += len(rows)
+                    self.last_flush_at = time.time()
+                written += len(rows)
+                if self._on_flush:
+                    self._on_flush(sheet_name)
+        self.last_error = "; ".join(errors) or None
+        return written
+
+    def _run(self):
+        while not self._stopped:
+            # Sleep until something is queued; while rows are stuck, retry periodically
+            self._wake.wait(timeout=self.retry_interval if self.pending_count() else None)
+            self._wake.clear()
+            if self._stopped:
+                break
+            # Give submits arriving together a moment to land in the same batch
+            time.sleep(self.flush_delay)
+            self.flush()
+
+    def close(self, flush=True):
+        """Stop the background thread, optionally flushing what is pending first."""
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if flush:
+            self.flush()